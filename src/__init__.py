@@ -1,7 +1,8 @@
 from .config import config, setup_logging, styling
-from .extract import fetch_statsbomb_event_data
-from .transform import transform_to_build_up_events, transform_to_progressive_actions, transform_to_turnovers, transform_to_shot_events, transform_to_box_entry_events, transform_to_box_entry_clusters
-from .stats import calculate_build_up_stats, calculate_shots_stats
+from .extract import fetch_statsbomb_event_data, save_event_store, iter_event_store, NormalizedEvents, normalize_events, FreezeFrames, load_three_sixty_frames, load_lineups, load_open_data_events, iter_open_data_events, load_open_data_matches, flatten_events
+from .transform import streamable, concat_results, transform_to_build_up_events, transform_to_progressive_actions, transform_to_turnovers, transform_to_shot_events, freeze_frames_from_shots, transform_to_shot_geometry, transform_to_box_entry_events, transform_to_box_entry_clusters, select_n_clusters, sweep_box_entry_clusters, transform_to_restart_chains, PassNetworks, build_pass_networks, transform_to_possession_sequences, transform_to_pressing_events, transform_to_transitions, Predicate, SequenceIndex
+from .stats import calculate_build_up_stats, calculate_shots_stats, calculate_shots_confidence_intervals, calculate_restart_chain_stats, calculate_zone_counts, XTGrid, fit_xt_grid, get_xt_grid, xt_fingerprint, calculate_xt_added, calculate_xt_rankings, calculate_frequent_sequences, calculate_pressing_stats, calculate_transition_stats, match_opponents, calculate_shots_match_metrics, calculate_opponent_adjusted_ratings, calculate_minutes_played, calculate_player_stats, calculate_match_partials, calculate_form_stats, FormTracker, combine_partials
+from .parallel import map_matches, run_sharded, reduce_sharded, SharedFrame
 from .viz import create_build_up_plots, create_progression_heatmaps, create_box_entry_plots
 
 __all__ = [
@@ -12,18 +13,70 @@ __all__ = [
 
     # Extract
     "fetch_statsbomb_event_data",
+    "save_event_store",
+    "iter_event_store",
+    "NormalizedEvents",
+    "normalize_events",
+    "FreezeFrames",
+    "load_three_sixty_frames",
+    "load_lineups",
+    "load_open_data_events",
+    "iter_open_data_events",
+    "load_open_data_matches",
+    "flatten_events",
 
     # Stats
     "calculate_build_up_stats",
     "calculate_shots_stats",
+    "calculate_shots_confidence_intervals",
+    "calculate_restart_chain_stats",
+    "calculate_zone_counts",
+    "XTGrid",
+    "fit_xt_grid",
+    "get_xt_grid",
+    "xt_fingerprint",
+    "calculate_xt_added",
+    "calculate_xt_rankings",
+    "calculate_frequent_sequences",
+    "calculate_pressing_stats",
+    "calculate_transition_stats",
+    "match_opponents",
+    "calculate_shots_match_metrics",
+    "calculate_opponent_adjusted_ratings",
+    "calculate_minutes_played",
+    "calculate_player_stats",
+    "calculate_match_partials",
+    "calculate_form_stats",
+    "FormTracker",
+    "combine_partials",
 
     # Transform
     "transform_to_build_up_events",
     "transform_to_progressive_actions",
     "transform_to_turnovers",
     "transform_to_shot_events",
+    "freeze_frames_from_shots",
+    "transform_to_shot_geometry",
     "transform_to_box_entry_events",
     "transform_to_box_entry_clusters",
+    "select_n_clusters",
+    "sweep_box_entry_clusters",
+    "transform_to_restart_chains",
+    "PassNetworks",
+    "build_pass_networks",
+    "transform_to_possession_sequences",
+    "transform_to_pressing_events",
+    "transform_to_transitions",
+    "Predicate",
+    "SequenceIndex",
+    "streamable",
+    "concat_results",
+
+    # Parallel
+    "map_matches",
+    "run_sharded",
+    "reduce_sharded",
+    "SharedFrame",
 
     # Viz
     "create_build_up_plots",
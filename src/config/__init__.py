@@ -1,11 +1,12 @@
 """Module for configuring the project."""
 
 from .config import config
-from .logging_config import setup_logging
+from .logging_config import setup_logging, LazyMetric
 from .styling import styling
 
 __all__ = [
     "config",
     "setup_logging",
+    "LazyMetric",
     "styling",
 ]
\ No newline at end of file
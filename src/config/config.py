@@ -1,9 +1,13 @@
 """Module for configuring the project."""
 
+from pathlib import Path
+
 class LoggingConfig:
     level = "INFO"
     file = "analysis.log"
     format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    json_format = False # write JSON lines instead of formatted text
+    use_queue = True # write log records from a background thread
 
 class StatsbombConfig:
     competition_id = 55
@@ -14,13 +18,115 @@ class StatsbombConfig:
     gender = "male"
     spain_id = 772
 
+class LocalDataConfig:
+    # Local checkout of the StatsBomb open-data layout (competitions.json, matches/, events/, lineups/, three-sixty/)
+    data_dir = Path(__file__).parent.parent.parent / "data"
+    competitions_file = "competitions.json"
+    matches_dir = "matches"
+    events_dir = "events"
+    three_sixty_dir = "three-sixty"
+    lineups_dir = "lineups"
+    # Per-match event frames written by save_event_store
+    event_store_dir = "event-store"
+
 class ClassificationConfig:
     set_piece_allowed_time = 10 # seconds
     set_piece_allowed_actions = 5 # actions
+    set_piece_play_patterns = ["From Corner", "From Free Kick", "From Throw In"]
+    set_piece_action_types = ["Pass", "Carry", "Dribble"] # possessing actions counted for the action cutoff
+
+class ZoneConfig:
+    # Custom zones used by the heatmaps (yards, statsbomb coordinates)
+    x_bins = [0, 18, 40, 60, 80, 102, 120]
+    y_bins = [0, 18, 30, 50, 62, 80]
+
+class ServiceConfig:
+    host = "127.0.0.1"
+    port = 8000
+    cache_size = 1024 # responses
+
+class RestartConfig:
+    # Play pattern of the possession -> pass type of the restart pass
+    play_patterns = {
+        "From Goal Kick": "Goal Kick",
+        "From Throw In": "Throw-in",
+        "From Free Kick": "Free Kick",
+        "From Corner": "Corner",
+    }
+    chain_depth = 2 # passes
+    pass_length_bins = [0, 32.8084, float("inf")] # yards (30 metres = 32.8084 yards)
+    pass_length_labels = ["short", "long"]
+
+class BootstrapConfig:
+    n_resamples = 10000
+    confidence_level = 0.95
+    random_state = 42
+
+class ClusteringConfig:
+    n_clusters = 5 # or "auto" to select k per team and action type
+    random_state = 42
+    k_range = range(2, 9) # k's tried by the automatic selection
+    seeds = range(5) # random states per k, used for the stability score
+    min_stability = 0.8 # mean pairwise adjusted Rand index between seeds
+
+class XTConfig:
+    n_x = 16 # zones along the length of the pitch
+    n_y = 12 # zones along the width of the pitch
+    max_iterations = 100
+    tolerance = 1e-6 # largest change in xT between iterations
+    cache_file = LocalDataConfig.data_dir / "xt_grid.npz"
+
+class SequenceConfig:
+    action_types = ["Pass", "Carry", "Dribble", "Shot"] # actions that become tokens
+    min_count = 5 # occurrences per team for a sequence to be frequent
+    max_length = 5 # actions
+
+class PressingConfig:
+    window_minutes = 15
+    ppda_max_x = 72 # opponent passes in their first 60% of the pitch
+    high_regain_min_x = 80 # regains in the final third (yards from own goal)
+    defensive_action_types = ["Duel", "Interception", "Foul Committed"]
+
+class TransitionConfig:
+    window_seconds = 10 # seconds after a turnover / regain
+    open_play_patterns = ["Regular Play", "From Counter", "From Keeper"] # possessions won in open play (not restarts)
+
+class OpponentAdjustmentConfig:
+    alpha = 1.0 # ridge penalty on the team ratings
+
+class PlayerConfig:
+    min_minutes = 90 # minutes played over all matches
+
+class FormConfig:
+    window = 3 # matches in the rolling window
+
+class ShotGeometryConfig:
+    goal_x = 120
+    goal_y = (36, 44) # posts
+    player_radius = 0.5 # yards, half the width an opponent blocks
+
+class ParallelConfig:
+    max_workers = None # None uses all cores
+    shared_memory = False # share the data with the workers through shared memory instead of sending every match
 
 class Config:
     logging = LoggingConfig()
     statsbomb = StatsbombConfig()
+    local_data = LocalDataConfig()
     classification = ClassificationConfig()
+    zones = ZoneConfig()
+    service = ServiceConfig()
+    restarts = RestartConfig()
+    bootstrap = BootstrapConfig()
+    clustering = ClusteringConfig()
+    xt = XTConfig()
+    sequences = SequenceConfig()
+    pressing = PressingConfig()
+    transitions = TransitionConfig()
+    opponent_adjustment = OpponentAdjustmentConfig()
+    players = PlayerConfig()
+    form = FormConfig()
+    shot_geometry = ShotGeometryConfig()
+    parallel = ParallelConfig()
 
 config = Config()
\ No newline at end of file
@@ -1,17 +1,86 @@
 """Logging configuration setup."""
 
+import atexit
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional
 
 from .config import config
 
+# Listener of the active queue logging setup (stopped when logging is set up again)
+_listener: Optional[QueueListener] = None
+
+class LazyMetric:
+    """
+    Log value that is only computed when the record is emitted.
+
+    Pass it as a logging argument (``logger.info("Shots: %s", LazyMetric(lambda: ...))``) or
+    in ``extra={"metrics": {...}}``. If the level is disabled the function is never called.
+    The value is computed at most once.
+    """
+
+    _unset = object()
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+        self._value = self._unset
+
+    @property
+    def value(self) -> Any:
+        if self._value is self._unset:
+            self._value = self.func()
+        return self._value
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.value, format_spec)
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line, including the metrics passed in ``extra``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        metrics = getattr(record, "metrics", None)
+        if metrics:
+            payload["metrics"] = metrics
+
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, default=_json_default)
+
+class MetricsQueueHandler(QueueHandler):
+    """Queue handler that resolves lazy metrics in the logging thread before queueing the record."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+
+        metrics = getattr(record, "metrics", None)
+        if metrics:
+            record.metrics = {name: _resolve(value) for name, value in metrics.items()}
+
+        return record
+
 def setup_logging(
     level: str = None,
     log_file: str = None,
-    log_format: str = None
+    log_format: str = None,
+    json_format: bool = None,
+    use_queue: bool = None,
 ) -> logging.Logger:
     """
     Set up logging configuration.
-    
+
     Parameters
     ----------
     level : str, optional
@@ -20,29 +89,79 @@ def setup_logging(
         Path to log file, by default None
     log_format : str, optional
         Log message format, by default None
-        
+    json_format : bool, optional
+        Write JSON lines instead of formatted text, by default None
+    use_queue : bool, optional
+        Hand records to a background thread that writes them to the file and stream, by default None
+
     Returns
     -------
     logging.Logger
         Configured logger instance
-        
+
     Notes
     -----
     If parameters are not provided, uses values from global config.
+    With the queue enabled, the calling thread only formats the message (evaluating lazy
+    metrics) and the file and stream writes happen in a ``QueueListener`` thread.
     """
+    global _listener
+
     # Use config defaults if not provided
     level = level or config.logging.level
     log_file = log_file or config.logging.file
     log_format = log_format or config.logging.format
-    
+    json_format = config.logging.json_format if json_format is None else json_format
+    use_queue = config.logging.use_queue if use_queue is None else use_queue
+
+    # Output handlers
+    formatter = JsonFormatter() if json_format else logging.Formatter(log_format)
+    handlers = [
+        logging.FileHandler(log_file),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Stop the listener of a previous setup
+    _stop_listener()
+
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        queue_handler = MetricsQueueHandler(log_queue)
+        # Only merge the message arguments here, the listener's handlers apply the output format
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers = [queue_handler]
+
     # Configure logging
     logging.basicConfig(
         level=level,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        handlers=handlers,
+        force=True,
     )
-    
-    return logging.getLogger(__name__)
\ No newline at end of file
+
+    return logging.getLogger(__name__)
+
+@atexit.register
+def _stop_listener() -> None:
+    """Flush and stop the queue listener, if any."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _resolve(value: Any) -> Any:
+    """Get the value of a lazy metric."""
+    return value.value if isinstance(value, LazyMetric) else value
+
+def _json_default(value: Any) -> Any:
+    """Convert values that json can't serialize (lazy metrics, numpy scalars)."""
+    value = _resolve(value)
+
+    if hasattr(value, "item"):
+        return value.item()
+
+    return str(value)
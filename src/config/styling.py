@@ -86,4 +86,19 @@ class StylingConfig:
         'headlength': 5,
     }
 
+    # Level of detail for dense arrow plots
+    arrows_lod = {
+        'max_arrows': 2000,     # above this count arrows are aggregated
+        'mode': 'flow',         # 'flow' (mean vector per start zone) or 'lines' (one line collection)
+        'bins': (12, 8),        # start zones along pitch length and width for flow arrows
+        'flow_min_alpha': 0.5,  # aggregated arrows are drawn at least this opaque
+        'linewidth': 0.5,
+    }
+
+    # Smooth density heatmaps (alternative to the custom zone counts)
+    density = {
+        'resolution': 1.0,      # grid cell size in yards
+        'bandwidth': 4.0,       # standard deviation of the Gaussian kernel in yards
+    }
+
 styling = StylingConfig()
\ No newline at end of file
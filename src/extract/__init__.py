@@ -1,7 +1,23 @@
 """Module for extracting data from StatsBomb."""
 
 from .statsbomb_data import fetch_statsbomb_event_data
+from .event_store import save_event_store, iter_event_store
+from .normalized_events import NormalizedEvents, normalize_events
+from .three_sixty import FreezeFrames, load_three_sixty_frames
+from .lineups import load_lineups
+from .open_data import load_open_data_events, iter_open_data_events, load_open_data_matches, flatten_events
 
 __all__ = [
-    "fetch_statsbomb_event_data"
-]
\ No newline at end of file
+    "fetch_statsbomb_event_data",
+    "save_event_store",
+    "iter_event_store",
+    "NormalizedEvents",
+    "normalize_events",
+    "FreezeFrames",
+    "load_three_sixty_frames",
+    "load_lineups",
+    "load_open_data_events",
+    "iter_open_data_events",
+    "load_open_data_matches",
+    "flatten_events",
+]
@@ -0,0 +1,83 @@
+import pandas as pd
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from src.config import config
+
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def save_event_store(
+    events_df: pd.DataFrame,
+    store_dir: Optional[Union[str, Path]] = None,
+) -> Path:
+    """
+    Save event data to a local store with one file per match.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The event data to store.
+    store_dir: Optional[Union[str, Path]]
+        The directory of the store, by default the event store directory from the config.
+
+    Returns:
+    --------
+    Path
+        The directory of the store.
+    """
+
+    store_dir = _resolve_store_dir(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Saving {len(events_df)} events to event store {store_dir}")
+
+    for match_id, match_df in events_df.groupby("match_id", sort=True):
+        match_df.to_pickle(store_dir / f"{match_id}.pkl")
+
+    logger.info(f"Saved {events_df['match_id'].nunique()} matches to event store.")
+
+    return store_dir
+
+def iter_event_store(
+    store_dir: Optional[Union[str, Path]] = None,
+    match_ids: Optional[Iterable[int]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over the event data in the local store, one match at a time.
+
+    Only one match is loaded in memory at a time, so the generator can be passed
+    to the transform functions to process data that doesn't fit in memory.
+
+    Parameters:
+    ----------
+    store_dir: Optional[Union[str, Path]]
+        The directory of the store, by default the event store directory from the config.
+    match_ids: Optional[Iterable[int]]
+        The matches to load, by default all matches in the store.
+
+    Yields:
+    -------
+    pd.DataFrame
+        The event data of one match.
+    """
+
+    store_dir = _resolve_store_dir(store_dir)
+
+    if match_ids is None:
+        paths = sorted(store_dir.glob("*.pkl"), key=lambda path: int(path.stem))
+    else:
+        paths = [store_dir / f"{match_id}.pkl" for match_id in match_ids]
+
+    logger.info(f"Streaming {len(paths)} matches from event store {store_dir}")
+
+    for path in paths:
+        yield pd.read_pickle(path)
+
+def _resolve_store_dir(store_dir: Optional[Union[str, Path]]) -> Path:
+    """Use the event store directory from the config if no directory is given."""
+    if store_dir is not None:
+        return Path(store_dir)
+    return Path(config.local_data.data_dir) / config.local_data.event_store_dir
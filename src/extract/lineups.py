@@ -0,0 +1,72 @@
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def load_lineups(
+    match_ids: Optional[Iterable[int]] = None,
+    data_dir: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """
+    Load the lineups of matches from a local open-data directory.
+
+    Parameters:
+    ----------
+    match_ids: Optional[Iterable[int]]
+        The matches to load, by default all matches in the lineups directory.
+    data_dir: Optional[Union[str, Path]]
+        The local open-data directory, by default the directory from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per player in the squad of every match with the match_id, team, player_id,
+        player, jersey_number, the position they started in (if any) and whether they started.
+    """
+
+    lineups_dir = Path(data_dir or config.local_data.data_dir) / config.local_data.lineups_dir
+
+    if match_ids is None:
+        paths = sorted(lineups_dir.glob("*.json"))
+    else:
+        paths = [lineups_dir / f"{match_id}.json" for match_id in match_ids]
+
+    logger.info(f"Loading lineups for {len(paths)} matches from {lineups_dir}")
+
+    rows = []
+
+    for path in paths:
+        if not path.exists():
+            logger.warning(f"No lineups found for match {path.stem}")
+            continue
+
+        with open(path, "rb") as f:
+            teams = json.load(f)
+
+        for team in teams:
+            for player in team["lineup"]:
+                positions = player.get("positions") or []
+                starter = any(p.get("start_reason") == "Starting XI" for p in positions)
+
+                rows.append({
+                    "match_id": int(path.stem),
+                    "team": team["team_name"],
+                    "player_id": player["player_id"],
+                    "player": player["player_name"],
+                    "jersey_number": player.get("jersey_number"),
+                    "position": positions[0]["position"] if positions else None,
+                    "starter": starter,
+                })
+
+    lineups_df = pd.DataFrame(rows, columns=["match_id", "team", "player_id", "player", "jersey_number", "position", "starter"])
+
+    logger.info(f"Loaded {len(lineups_df)} players from {lineups_df['match_id'].nunique()} lineups.")
+
+    return lineups_df
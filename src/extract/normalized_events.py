@@ -0,0 +1,272 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+# Columns of the narrow core table (id is the index, location is split into x and y)
+CORE_COLUMNS = [
+    "index", "match_id", "period", "timestamp", "minute", "second", "type",
+    "possession", "possession_team", "play_pattern", "team", "player", "position",
+    "duration", "under_pressure", "counterpress",
+]
+
+# Side table name -> (event type, column prefix)
+EVENT_TABLES = {
+    "pass": ("Pass", "pass_"),
+    "carry": ("Carry", "carry_"),
+    "shot": ("Shot", "shot_"),
+    "duel": ("Duel", "duel_"),
+    "dribble": ("Dribble", "dribble_"),
+    "50_50": ("50/50", "50_50"),
+    "ball_receipt": ("Ball Receipt*", "ball_receipt_"),
+    "ball_recovery": ("Ball Recovery", "ball_recovery_"),
+    "interception": ("Interception", "interception_"),
+    "clearance": ("Clearance", "clearance_"),
+    "block": ("Block", "block_"),
+    "goalkeeper": ("Goal Keeper", "goalkeeper_"),
+    "foul_committed": ("Foul Committed", "foul_committed_"),
+    "foul_won": ("Foul Won", "foul_won_"),
+    "miscontrol": ("Miscontrol", "miscontrol_"),
+    "substitution": ("Substitution", "substitution_"),
+    "bad_behaviour": ("Bad Behaviour", "bad_behaviour_"),
+    "injury_stoppage": ("Injury Stoppage", "injury_stoppage_"),
+}
+
+# End location columns that are stored as end_x, end_y (, end_z) in their side table
+END_LOCATION_COLUMNS = {
+    "pass": "pass_end_location",
+    "carry": "carry_end_location",
+    "shot": "shot_end_location",
+    "goalkeeper": "goalkeeper_end_location",
+}
+
+@dataclass
+class NormalizedEvents:
+    """
+    Event data split into a narrow core table and per-type side tables.
+
+    All tables are indexed by event id. The core table has one row per event; a side table
+    only has rows for events of its type and only the columns with its prefix (e.g. the pass
+    table has the pass_* columns of passes). Columns that don't belong to a type are kept
+    in the sparse 'other' table.
+
+    Attributes:
+    ----------
+    core: pd.DataFrame
+        The core events table.
+    tables: Dict[str, pd.DataFrame]
+        The side tables by name (see ``EVENT_TABLES``) plus 'other'.
+    """
+
+    core: pd.DataFrame
+    tables: Dict[str, pd.DataFrame]
+
+    def __len__(self) -> int:
+        return len(self.core)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by all tables (including Python objects)."""
+        return int(
+            self.core.memory_usage(deep=True).sum() +
+            sum(table.memory_usage(deep=True).sum() for table in self.tables.values())
+        )
+
+    def table(self, name: str) -> pd.DataFrame:
+        """
+        Get a side table joined to the core columns of its events.
+
+        Parameters:
+        ----------
+        name: str
+            The name of the side table, e.g. "pass".
+
+        Returns:
+        --------
+        pd.DataFrame
+            The core and side table columns of the events of that type.
+        """
+        side_df = self.tables[name]
+        return self.core.loc[side_df.index].join(side_df)
+
+    def to_frame(
+        self,
+        types: Optional[Iterable[str]] = None,
+        tables: Iterable[str] = (),
+    ) -> pd.DataFrame:
+        """
+        Build a wide events frame in the raw (statsbombpy) schema, so existing transforms can run on it.
+
+        Only the requested event types and side tables are touched. Location columns are rebuilt
+        as lists and categorical columns are converted back to objects.
+
+        Parameters:
+        ----------
+        types: Optional[Iterable[str]]
+            The event types to include (e.g. ["Pass", "Carry"]), by default all events.
+        tables: Iterable[str]
+            The side tables to join (e.g. ["pass", "carry"]).
+
+        Returns:
+        --------
+        pd.DataFrame
+            The events in the raw wide schema.
+        """
+        df = self.core
+        if types is not None:
+            df = df[df["type"].isin(list(types))]
+
+        df = df.copy()
+
+        for name in tables:
+            side_df = self.tables[name]
+            end_location = END_LOCATION_COLUMNS.get(name)
+
+            if end_location is not None:
+                end_cols = [col for col in ("end_x", "end_y", "end_z") if col in side_df]
+                side_df = side_df.drop(columns=end_cols).assign(
+                    **{end_location: _join_locations(side_df[end_cols])}
+                )
+
+            df = df.join(side_df, how="left")
+
+        # Raw schema
+        df["location"] = _join_locations(df[["x", "y"]])
+        df = df.drop(columns=["x", "y"])
+
+        for col in df.columns[df.dtypes == "category"]:
+            df[col] = df[col].astype(object)
+
+        return df.rename_axis("id").reset_index()
+
+def normalize_events(events_df: pd.DataFrame) -> NormalizedEvents:
+    """
+    Normalize the wide raw events frame into a core table and per-type side tables.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The events data (e.g. from ``fetch_statsbomb_event_data``).
+
+    Returns:
+    --------
+    NormalizedEvents
+        The normalized events.
+    """
+
+    logger.info(f"Normalizing {len(events_df)} events with {events_df.shape[1]} columns.")
+
+    events_df = events_df.set_index("id", drop=False).rename_axis(None)
+
+    # Core table
+    core = events_df[[col for col in CORE_COLUMNS if col in events_df]].copy()
+    xy = _split_locations(events_df["location"], 2)
+    core["x"] = xy[:, 0]
+    core["y"] = xy[:, 1]
+
+    for col in ("under_pressure", "counterpress"):
+        if col in core:
+            core[col] = core[col].astype("boolean")
+
+    core = _compact(core)
+
+    # Side tables
+    used_columns = set(CORE_COLUMNS) | {"id", "location"}
+    tables = {}
+
+    for name, (event_type, prefix) in EVENT_TABLES.items():
+        cols = [col for col in events_df.columns if col.startswith(prefix)]
+        used_columns.update(cols)
+        side_df = events_df.loc[events_df["type"] == event_type, cols]
+
+        end_location = END_LOCATION_COLUMNS.get(name)
+        if end_location in side_df:
+            end_xyz = _split_locations(side_df[end_location], 3)
+            side_df = side_df.drop(columns=end_location).assign(end_x=end_xyz[:, 0], end_y=end_xyz[:, 1])
+            if np.isfinite(end_xyz[:, 2]).any():
+                side_df["end_z"] = end_xyz[:, 2]
+
+        tables[name] = _compact(side_df)
+
+    # Remaining columns, only for events that have a value
+    other_cols = [col for col in events_df.columns if col not in used_columns]
+    tables["other"] = events_df[other_cols].dropna(how="all")
+
+    normalized = NormalizedEvents(core=core, tables=tables)
+
+    logger.info(
+        f"Normalized events into a core table with {core.shape[1]} columns and {len(tables)} side tables "
+        f"({events_df.memory_usage(deep=True).sum() / 1e6:.1f} MB -> {normalized.nbytes / 1e6:.1f} MB)."
+    )
+
+    return normalized
+
+def as_events_frame(
+    df: Union[pd.DataFrame, NormalizedEvents],
+    types: Optional[Iterable[str]] = None,
+    tables: Iterable[str] = (),
+) -> pd.DataFrame:
+    """
+    Get a wide events frame from raw or normalized events.
+
+    Parameters:
+    ----------
+    df: Union[pd.DataFrame, NormalizedEvents]
+        The raw events frame (returned as is) or normalized events.
+    types: Optional[Iterable[str]]
+        The event types a transform needs, by default all events.
+    tables: Iterable[str]
+        The side tables a transform needs.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The events in the raw wide schema.
+    """
+    if isinstance(df, NormalizedEvents):
+        return df.to_frame(types=types, tables=tables)
+
+    return df
+
+def _split_locations(locations: pd.Series, n: int) -> np.ndarray:
+    """Split a column of location lists into an (n_rows, n) float32 array (NaN where missing)."""
+    result = np.full((len(locations), n), np.nan, dtype=np.float32)
+    valid = locations.map(lambda location: isinstance(location, (list, tuple, np.ndarray))).to_numpy(dtype=bool)
+
+    if valid.any():
+        values = pd.DataFrame(locations[valid].tolist()).to_numpy(dtype=np.float32)
+        result[valid, :min(n, values.shape[1])] = values[:, :n]
+
+    return result
+
+def _join_locations(coordinates: pd.DataFrame) -> pd.Series:
+    """Join coordinate columns back into a column of location lists (NaN where missing)."""
+    values = coordinates.to_numpy(dtype=float)
+    valid = ~np.isnan(values[:, :2]).any(axis=1)
+    locations = [
+        [c for c in row if not np.isnan(c)] if is_valid else np.nan
+        for row, is_valid in zip(values.tolist(), valid)
+    ]
+    return pd.Series(locations, index=coordinates.index, dtype=object)
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality string columns as categoricals."""
+    df = df.copy()
+
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == object or pd.api.types.is_string_dtype(values):
+            non_null = values.dropna()
+            if (
+                len(non_null) and
+                non_null.map(type).eq(str).all() and
+                non_null.nunique() <= len(non_null) // 2
+            ):
+                df[col] = values.astype("category")
+
+    return df
@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from src.config import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+# Flattened attributes that also get an _id column (as in statsbombpy)
+ID_COLUMNS = {
+    "possession_team", "player", "team", "pass_recipient", "substitution_outcome", "substitution_replacement",
+}
+
+def load_open_data_events(
+    country: str = config.statsbomb.country,
+    division: str = config.statsbomb.division,
+    season: str = config.statsbomb.season,
+    gender: str = config.statsbomb.gender,
+    match_ids: Optional[Iterable[int]] = None,
+    data_dir: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Load StatsBomb event data for a competition and season from a local open-data directory.
+
+    Offline replacement for ``fetch_statsbomb_event_data``: the match files are parsed (with
+    orjson if installed) and flattened in parallel into the columns ``sb.competition_events``
+    returns.
+
+    Parameters:
+    ----------
+    country: str
+        The country of the competition.
+    division: str
+        The division of the competition.
+    season: str
+        The season of the competition.
+    gender: str
+        The gender of the players in the competition.
+    match_ids: Optional[Iterable[int]]
+        The matches to load, by default all matches of the competition and season.
+    data_dir: Optional[Union[str, Path]]
+        The local open-data directory, by default the directory from the config.
+    max_workers: Optional[int]
+        The number of worker processes, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The event data of the competition and season.
+    """
+
+    paths = _event_paths(country, division, season, gender, match_ids, data_dir)
+    max_workers = max_workers or config.parallel.max_workers or os.cpu_count() or 1
+
+    logger.info(f"Loading StatsBomb event data for {country} - {division} - {season} - {gender} from {len(paths)} local match files")
+
+    # Parsing is CPU bound; with one worker the process pool would only add the cost of sending the frames back
+    if max_workers == 1 or len(paths) <= 1:
+        frames = [_load_match_events(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_load_match_events, paths))
+
+    events = pd.concat(frames, axis=0, ignore_index=True, sort=True) if frames else pd.DataFrame()
+
+    logger.info(f"Found {len(events)} events!")
+
+    return events
+
+def iter_open_data_events(
+    country: str = config.statsbomb.country,
+    division: str = config.statsbomb.division,
+    season: str = config.statsbomb.season,
+    gender: str = config.statsbomb.gender,
+    match_ids: Optional[Iterable[int]] = None,
+    data_dir: Optional[Union[str, Path]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over the event data of a competition and season in a local open-data directory, one match at a time.
+
+    Parameters:
+    ----------
+    country: str
+        The country of the competition.
+    division: str
+        The division of the competition.
+    season: str
+        The season of the competition.
+    gender: str
+        The gender of the players in the competition.
+    match_ids: Optional[Iterable[int]]
+        The matches to load, by default all matches of the competition and season.
+    data_dir: Optional[Union[str, Path]]
+        The local open-data directory, by default the directory from the config.
+
+    Yields:
+    -------
+    pd.DataFrame
+        The event data of one match.
+    """
+
+    for path in _event_paths(country, division, season, gender, match_ids, data_dir):
+        yield _load_match_events(path)
+
+def load_open_data_matches(
+    country: str = config.statsbomb.country,
+    division: str = config.statsbomb.division,
+    season: str = config.statsbomb.season,
+    gender: str = config.statsbomb.gender,
+    data_dir: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """
+    Load the matches of a competition and season from a local open-data directory.
+
+    Parameters:
+    ----------
+    country: str
+        The country of the competition.
+    division: str
+        The division of the competition.
+    season: str
+        The season of the competition.
+    gender: str
+        The gender of the players in the competition.
+    data_dir: Optional[Union[str, Path]]
+        The local open-data directory, by default the directory from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per match with the match_id, match_date, home_team, away_team, home_score and away_score.
+    """
+
+    data_dir = Path(data_dir or config.local_data.data_dir)
+    competition = _find_competition(data_dir, country, division, season, gender)
+    matches = _read_json(data_dir / config.local_data.matches_dir / str(competition["competition_id"]) / f"{competition['season_id']}.json")
+
+    matches_df = pd.DataFrame({
+        "match_id": [match["match_id"] for match in matches],
+        "match_date": [match.get("match_date") for match in matches],
+        "home_team": [match["home_team"]["home_team_name"] for match in matches],
+        "away_team": [match["away_team"]["away_team_name"] for match in matches],
+        "home_score": [match.get("home_score") for match in matches],
+        "away_score": [match.get("away_score") for match in matches],
+    })
+
+    return matches_df.sort_values("match_id").reset_index(drop=True)
+
+def flatten_events(events: List[dict], match_id: int) -> pd.DataFrame:
+    """
+    Flatten the raw events of a match into the statsbombpy dataframe schema.
+
+    The attributes of the event type (e.g. ``pass``) become prefixed columns (``pass_length``),
+    named objects become their name and the team, player and recipient ids are kept in
+    ``_id`` columns. Columns are sorted by name, as in ``sb.competition_events``.
+
+    Parameters:
+    ----------
+    events: List[dict]
+        The raw events of the match.
+    match_id: int
+        The id of the match.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The flattened events.
+    """
+
+    rows = []
+    attribute_keys = {}
+
+    for event in events:
+        row = {"match_id": match_id}
+        type_name = event["type"]["name"]
+
+        if type_name not in attribute_keys:
+            attribute_keys[type_name] = "goalkeeper" if type_name == "Goal Keeper" else type_name.lower().replace(" ", "_").replace("*", "")
+        attributes = attribute_keys[type_name]
+
+        for key, value in event.items():
+            if type(value) is dict and key == attributes:
+                # Attributes of the event type become prefixed columns
+                for attribute, attribute_value in value.items():
+                    column = f"{key}_{attribute}"
+                    if type(attribute_value) is dict and "name" in attribute_value:
+                        row[column] = attribute_value["name"]
+                        if column in ID_COLUMNS:
+                            row[f"{column}_id"] = attribute_value["id"]
+                    else:
+                        row[column] = attribute_value
+            elif type(value) is dict and "name" in value:
+                row[key] = value["name"]
+                if key in ID_COLUMNS:
+                    row[f"{key}_id"] = value["id"]
+            else:
+                row[key] = value
+
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+
+    return df[sorted(df.columns)]
+
+def _load_match_events(path: Path) -> pd.DataFrame:
+    """Read and flatten the events of one match file."""
+    return flatten_events(_read_json(path), int(path.stem))
+
+def _read_json(path: Path):
+    """Parse a JSON file, with orjson if it's installed."""
+    with open(path, "rb") as f:
+        content = f.read()
+
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def _find_competition(data_dir: Path, country: str, division: str, season: str, gender: str) -> dict:
+    """Find the competition and season in competitions.json."""
+    for competition in _read_json(data_dir / config.local_data.competitions_file):
+        if (
+            competition["country_name"] == country and
+            competition["competition_name"] == division and
+            competition["season_name"] == season and
+            competition["competition_gender"] == gender
+        ):
+            return competition
+
+    raise ValueError(f"Competition {country} - {division} - {season} - {gender} not found in {data_dir}")
+
+def _event_paths(
+    country: str,
+    division: str,
+    season: str,
+    gender: str,
+    match_ids: Optional[Iterable[int]],
+    data_dir: Optional[Union[str, Path]],
+) -> List[Path]:
+    """Get the event files of the matches to load."""
+    data_dir = Path(data_dir or config.local_data.data_dir)
+
+    if match_ids is None:
+        match_ids = load_open_data_matches(country, division, season, gender, data_dir)["match_id"]
+
+    paths = [data_dir / config.local_data.events_dir / f"{match_id}.json" for match_id in match_ids]
+
+    for path in paths:
+        if not path.exists():
+            logger.warning(f"No events found for match {path.stem}")
+
+    return [path for path in paths if path.exists()]
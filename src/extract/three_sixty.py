@@ -0,0 +1,357 @@
+import json
+import logging
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FreezeFrames:
+    """
+    Columnar storage of StatsBomb 360 freeze frames.
+
+    Player positions of all frames are stored in flat arrays. The players of the
+    i-th event are found at ``offsets[i]:offsets[i + 1]``, the visible area polygon
+    (flattened x, y pairs) at ``visible_offsets[i]:visible_offsets[i + 1]``.
+
+    Attributes:
+    ----------
+    event_ids: np.ndarray
+        The event id (uuid) of every frame.
+    match_ids: np.ndarray
+        The match id of every frame.
+    offsets: np.ndarray
+        Offsets of the players of every frame in the player arrays (length n_events + 1).
+    x: np.ndarray
+        The x coordinate of every player.
+    y: np.ndarray
+        The y coordinate of every player.
+    teammate: np.ndarray
+        Whether the player is a teammate of the actor.
+    actor: np.ndarray
+        Whether the player is the actor of the event.
+    keeper: np.ndarray
+        Whether the player is a goalkeeper.
+    visible_offsets: np.ndarray
+        Offsets of the visible area of every frame in the visible area array (length n_events + 1).
+    visible_area: np.ndarray
+        The flattened visible area polygons.
+    """
+
+    event_ids: np.ndarray
+    match_ids: np.ndarray
+    offsets: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    teammate: np.ndarray
+    actor: np.ndarray
+    keeper: np.ndarray
+    visible_offsets: np.ndarray
+    visible_area: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    @property
+    def n_players(self) -> int:
+        """Total number of player positions over all frames."""
+        return len(self.x)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of players in every frame."""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays."""
+        return sum(getattr(self, field.name).nbytes for field in fields(self))
+
+    @property
+    def frame_index(self) -> np.ndarray:
+        """Position of the frame every player belongs to."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths)
+
+    @property
+    def opponent(self) -> np.ndarray:
+        """Whether the player is an opponent of the actor."""
+        return ~self.teammate
+
+    def select(self, event_ids: Iterable[str]) -> "FreezeFrames":
+        """
+        Select the frames of the given event ids.
+
+        Event ids without a freeze frame are ignored. The frames are returned in the order of the event ids.
+
+        Parameters:
+        ----------
+        event_ids: Iterable[str]
+            The event ids to select.
+
+        Returns:
+        --------
+        FreezeFrames
+            The selected freeze frames.
+        """
+        return self._take(self._positions(event_ids))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert the freeze frames to a long dataframe with one row per player.
+
+        Returns:
+        --------
+        pd.DataFrame
+            The player positions joined to their event and match id.
+        """
+        frame_index = self.frame_index
+
+        return pd.DataFrame({
+            "id": pd.Categorical.from_codes(frame_index, categories=self.event_ids) if len(self) else pd.Categorical([]),
+            "match_id": self.match_ids[frame_index],
+            "x": self.x,
+            "y": self.y,
+            "teammate": self.teammate,
+            "actor": self.actor,
+            "keeper": self.keeper,
+        })
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the freeze frames as a directory of .npy files.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The directory to save the freeze frames to.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for field in fields(self):
+            np.save(path / f"{field.name}.npy", getattr(self, field.name))
+
+        logger.info(f"Saved {len(self)} freeze frames to {path}.")
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        event_ids: Optional[Iterable[str]] = None,
+    ) -> "FreezeFrames":
+        """
+        Load freeze frames saved with ``FreezeFrames.save``.
+
+        The arrays are memory-mapped, so selecting event ids only reads the selected frames from disk.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The directory the freeze frames were saved to.
+        event_ids: Optional[Iterable[str]]
+            The event ids to load, by default all frames are loaded.
+
+        Returns:
+        --------
+        FreezeFrames
+            The loaded freeze frames.
+        """
+        path = Path(path)
+        frames = cls(**{
+            field.name: np.load(path / f"{field.name}.npy", mmap_mode="r")
+            for field in fields(cls)
+        })
+
+        if event_ids is None:
+            return frames._take(np.arange(len(frames)))
+
+        return frames.select(event_ids)
+
+    @classmethod
+    def concat(cls, frames: Iterable["FreezeFrames"]) -> "FreezeFrames":
+        """
+        Concatenate freeze frames.
+
+        Parameters:
+        ----------
+        frames: Iterable[FreezeFrames]
+            The freeze frames to concatenate.
+
+        Returns:
+        --------
+        FreezeFrames
+            The concatenated freeze frames.
+        """
+        frames = list(frames)
+
+        if len(frames) == 0:
+            return cls.empty()
+
+        return cls(
+            event_ids=np.concatenate([f.event_ids for f in frames]),
+            match_ids=np.concatenate([f.match_ids for f in frames]),
+            offsets=_concat_offsets([f.offsets for f in frames]),
+            x=np.concatenate([f.x for f in frames]),
+            y=np.concatenate([f.y for f in frames]),
+            teammate=np.concatenate([f.teammate for f in frames]),
+            actor=np.concatenate([f.actor for f in frames]),
+            keeper=np.concatenate([f.keeper for f in frames]),
+            visible_offsets=_concat_offsets([f.visible_offsets for f in frames]),
+            visible_area=np.concatenate([f.visible_area for f in frames]),
+        )
+
+    @classmethod
+    def empty(cls) -> "FreezeFrames":
+        """Create empty freeze frames."""
+        return cls(
+            event_ids=np.array([], dtype="U36"),
+            match_ids=np.array([], dtype=np.int64),
+            offsets=np.zeros(1, dtype=np.int64),
+            x=np.array([], dtype=np.float32),
+            y=np.array([], dtype=np.float32),
+            teammate=np.array([], dtype=bool),
+            actor=np.array([], dtype=bool),
+            keeper=np.array([], dtype=bool),
+            visible_offsets=np.zeros(1, dtype=np.int64),
+            visible_area=np.array([], dtype=np.float32),
+        )
+
+    def _positions(self, event_ids: Iterable[str]) -> np.ndarray:
+        """Find the positions of the given event ids (missing ids are dropped)."""
+        event_ids = np.asarray(list(event_ids), dtype=self.event_ids.dtype)
+        order = np.argsort(self.event_ids, kind="stable")
+        sorted_ids = self.event_ids[order]
+
+        found = np.searchsorted(sorted_ids, event_ids)
+        found = np.minimum(found, max(len(sorted_ids) - 1, 0))
+        mask = (sorted_ids[found] == event_ids) if len(sorted_ids) else np.zeros(len(event_ids), dtype=bool)
+
+        return order[found[mask]]
+
+    def _take(self, positions: np.ndarray) -> "FreezeFrames":
+        """Gather the frames at the given positions into new in-memory arrays."""
+        player_index, offsets = _ragged_index(np.asarray(self.offsets), positions)
+        visible_index, visible_offsets = _ragged_index(np.asarray(self.visible_offsets), positions)
+
+        return FreezeFrames(
+            event_ids=np.asarray(self.event_ids[positions]),
+            match_ids=np.asarray(self.match_ids[positions]),
+            offsets=offsets,
+            x=np.asarray(self.x[player_index]),
+            y=np.asarray(self.y[player_index]),
+            teammate=np.asarray(self.teammate[player_index]),
+            actor=np.asarray(self.actor[player_index]),
+            keeper=np.asarray(self.keeper[player_index]),
+            visible_offsets=visible_offsets,
+            visible_area=np.asarray(self.visible_area[visible_index]),
+        )
+
+
+def load_three_sixty_frames(
+    match_ids: Optional[Iterable[int]] = None,
+    event_ids: Optional[Iterable[str]] = None,
+    data_dir: Optional[Union[str, Path]] = None,
+) -> FreezeFrames:
+    """
+    Load StatsBomb 360 freeze frames from a local open-data directory.
+
+    Every match file is parsed and flattened on its own, so only one match is held as
+    Python objects at a time.
+
+    Parameters:
+    ----------
+    match_ids: Optional[Iterable[int]]
+        The matches to load, by default all matches in the three-sixty directory.
+    event_ids: Optional[Iterable[str]]
+        Only keep the frames of these events, by default all frames are kept.
+    data_dir: Optional[Union[str, Path]]
+        The local open-data directory, by default the directory from the config.
+
+    Returns:
+    --------
+    FreezeFrames
+        The freeze frames of the given matches.
+    """
+
+    three_sixty_dir = Path(data_dir or config.local_data.data_dir) / config.local_data.three_sixty_dir
+
+    if match_ids is None:
+        paths = sorted(three_sixty_dir.glob("*.json"))
+    else:
+        paths = [three_sixty_dir / f"{match_id}.json" for match_id in match_ids]
+
+    selected_ids = set(event_ids) if event_ids is not None else None
+
+    logger.info(f"Loading 360 freeze frames for {len(paths)} matches from {three_sixty_dir}")
+
+    frames = []
+
+    for path in paths:
+        if not path.exists():
+            logger.warning(f"No 360 data found for match {path.stem}")
+            continue
+
+        frames.append(_parse_match_frames(path, selected_ids))
+
+    frames = FreezeFrames.concat(frames)
+
+    logger.info(f"Loaded {len(frames)} freeze frames with {frames.n_players} player positions ({frames.nbytes / 1e6:.1f} MB).")
+
+    return frames
+
+
+def _parse_match_frames(path: Path, selected_ids: Optional[set] = None) -> FreezeFrames:
+    """Parse one three-sixty match file into columnar freeze frames."""
+    with open(path, "rb") as f:
+        records = json.load(f)
+
+    if selected_ids is not None:
+        records = [r for r in records if r["event_uuid"] in selected_ids]
+
+    players = [p for r in records for p in r["freeze_frame"]]
+    visible_area = [r.get("visible_area") or [] for r in records]
+    locations = np.array([p["location"] for p in players], dtype=np.float32).reshape(-1, 2)
+
+    return FreezeFrames(
+        event_ids=np.array([r["event_uuid"] for r in records], dtype="U36"),
+        match_ids=np.full(len(records), int(path.stem), dtype=np.int64),
+        offsets=_lengths_to_offsets([len(r["freeze_frame"]) for r in records]),
+        x=locations[:, 0],
+        y=locations[:, 1],
+        teammate=np.array([p["teammate"] for p in players], dtype=bool),
+        actor=np.array([p["actor"] for p in players], dtype=bool),
+        keeper=np.array([p["keeper"] for p in players], dtype=bool),
+        visible_offsets=_lengths_to_offsets([len(v) for v in visible_area]),
+        visible_area=np.array([c for v in visible_area for c in v], dtype=np.float32),
+    )
+
+
+def _lengths_to_offsets(lengths) -> np.ndarray:
+    """Convert ragged lengths to offsets."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _concat_offsets(offsets_list) -> np.ndarray:
+    """Concatenate offset arrays, shifting every array by the end of the previous one."""
+    return _lengths_to_offsets(np.concatenate([np.diff(offsets) for offsets in offsets_list]))
+
+
+def _ragged_index(offsets: np.ndarray, positions: np.ndarray):
+    """Build the flat element index and new offsets for a selection of ragged rows."""
+    starts = offsets[positions]
+    lengths = offsets[positions + 1] - starts
+    new_offsets = _lengths_to_offsets(lengths)
+
+    # Element index: start of its row + rank within the row
+    index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1], dtype=np.int64)
+
+    return index, new_offsets
@@ -0,0 +1,11 @@
+"""Module for running transforms and stats in parallel."""
+
+from .executor import map_matches, run_sharded, reduce_sharded
+from .shared_frames import SharedFrame
+
+__all__ = [
+    "map_matches",
+    "run_sharded",
+    "reduce_sharded",
+    "SharedFrame",
+]
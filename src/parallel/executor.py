@@ -0,0 +1,228 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config import config
+from src.parallel.shared_frames import SharedFrame
+from src.stats.partials import combine_partials
+from src.transform.streaming import concat_results
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+Frames = Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+
+# Columns (and dtypes) already warned about falling back to pickle
+_pickle_fallbacks = set()
+
+def map_matches(
+    func: Callable,
+    df: Frames,
+    *args,
+    max_workers: Optional[int] = None,
+    shared_memory: Optional[bool] = None,
+    **kwargs,
+) -> List[Any]:
+    """
+    Run a function on every match in parallel.
+
+    The data is sharded by ``match_id`` and every shard is sent to a worker process as an
+    Arrow IPC buffer, which avoids pickling object columns row by row. Shards that can't be
+    converted to Arrow (or if pyarrow isn't installed) are pickled instead.
+
+    With ``shared_memory``, the data is copied once into shared memory (see ``SharedFrame``)
+    and the workers only get a small handle and the match id; they read their match from
+    zero-copy views, so the cost per worker doesn't grow with the size of the data. The
+    columns keep the dtypes of the original frame.
+
+    Parameters:
+    ----------
+    func: Callable
+        The function to run. Its first argument is the shard; it must be importable by the workers.
+    df: Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+        The data to shard. A tuple of dataframes is sharded together and passed to ``func`` as
+        separate arguments (e.g. first events and chain events).
+    *args, **kwargs:
+        Extra arguments passed to ``func``.
+    max_workers: Optional[int]
+        The number of worker processes, by default the value from the config.
+    shared_memory: Optional[bool]
+        Whether to share the data through shared memory, by default the value from the config.
+
+    Returns:
+    --------
+    List[Any]
+        The result of every match, ordered by match_id.
+    """
+
+    frames = df if isinstance(df, tuple) else (df,)
+    match_ids = np.unique(np.concatenate([frame["match_id"].to_numpy() for frame in frames]))
+    max_workers = max_workers or config.parallel.max_workers
+    shared_memory = shared_memory if shared_memory is not None else config.parallel.shared_memory
+
+    logger.info(f"Running {func.__name__} on {len(match_ids)} matches in parallel.")
+
+    if shared_memory:
+        return _map_shared(func, frames, match_ids, args, kwargs, max_workers)
+
+    # Row positions of every match per frame
+    indices = [frame.groupby("match_id", sort=True).indices for frame in frames]
+    empty = np.array([], dtype=np.int64)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _run_shard,
+                func,
+                [_serialize(frame.take(index.get(match_id, empty))) for frame, index in zip(frames, indices)],
+                args,
+                kwargs,
+            )
+            for match_id in match_ids
+        ]
+        results = [future.result() for future in futures]
+
+    logger.info(f"Finished {func.__name__} on {len(results)} matches.")
+
+    return results
+
+def run_sharded(
+    transform: Callable,
+    df: Frames,
+    *args,
+    max_workers: Optional[int] = None,
+    **kwargs,
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]:
+    """
+    Run a transform function per match in parallel and concatenate the results.
+
+    Results are concatenated in match_id order, so the output is deterministic regardless of
+    the number of workers.
+
+    Parameters:
+    ----------
+    transform: Callable
+        The transform function, e.g. ``transform_to_shot_events``.
+    df: Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+        The events data to transform.
+    *args, **kwargs:
+        Extra arguments passed to the transform.
+    max_workers: Optional[int]
+        The number of worker processes, by default the value from the config.
+
+    Returns:
+    --------
+    Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+        The transformed data of all matches.
+    """
+
+    return concat_results(map_matches(transform, df, *args, max_workers=max_workers, **kwargs))
+
+def reduce_sharded(
+    partials_func: Callable,
+    df: Frames,
+    *args,
+    max_workers: Optional[int] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Calculate stats partials per match in parallel and combine them.
+
+    Parameters:
+    ----------
+    partials_func: Callable
+        The partials function, e.g. ``calculate_shots_partials``.
+    df: Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+        The transformed data to aggregate.
+    *args, **kwargs:
+        Extra arguments passed to the partials function.
+    max_workers: Optional[int]
+        The number of worker processes, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The combined partials, indexed by team.
+    """
+
+    return combine_partials(map_matches(partials_func, df, *args, max_workers=max_workers, **kwargs))
+
+def _map_shared(
+    func: Callable,
+    frames: Tuple[pd.DataFrame, ...],
+    match_ids: np.ndarray,
+    args: tuple,
+    kwargs: dict,
+    max_workers: Optional[int],
+) -> List[Any]:
+    """Share the frames once and run the function on every match from the shared frames."""
+    shared = [SharedFrame.create(frame, by="match_id") for frame in frames]
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_run_shared_shard, func, shared, match_id, args, kwargs)
+                for match_id in match_ids
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        for frame in shared:
+            frame.unlink()
+
+    logger.info(f"Finished {func.__name__} on {len(results)} matches.")
+
+    return results
+
+def _run_shared_shard(func: Callable, shared: List[SharedFrame], match_id: Any, args: tuple, kwargs: dict) -> Any:
+    """Read one match from the shared frames and run the function on it."""
+    return func(*[frame.segment(match_id) for frame in shared], *args, **kwargs)
+
+def _run_shard(func: Callable, shards: list, args: tuple, kwargs: dict) -> Any:
+    """Deserialize the shards of one match and run the function on them."""
+    return func(*[_deserialize(shard) for shard in shards], *args, **kwargs)
+
+def _serialize(df: pd.DataFrame) -> Any:
+    """Serialize a shard to an Arrow IPC buffer, falling back to the dataframe itself (pickled)."""
+    if pa is None:
+        return df
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        column, dtype = _failing_column(df)
+        if (column, dtype) not in _pickle_fallbacks:
+            _pickle_fallbacks.add((column, dtype))
+            logger.warning(f"Column {column!r} ({dtype}) can't be converted to Arrow, shards with it are pickled: {e}")
+        return df
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue()
+
+def _failing_column(df: pd.DataFrame) -> Tuple[Any, str]:
+    """Find the first column (or the index) that can't be converted to Arrow."""
+    for column in [*df.columns, df.index.name or "index"]:
+        values = df[column] if column in df.columns else df.index
+        try:
+            pa.array(values, from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError):
+            return column, str(values.dtype)
+
+    return None, ""
+
+def _deserialize(shard: Any) -> pd.DataFrame:
+    """Read a shard serialized with ``_serialize``."""
+    if isinstance(shard, pd.DataFrame):
+        return shard
+
+    return pa.ipc.open_stream(shard).read_all().to_pandas()
@@ -0,0 +1,287 @@
+import logging
+import pickle
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+# Alignment of the column buffers in the shared memory block
+_ALIGNMENT = 64
+
+# Name of the column that holds the index of the shared frame
+_INDEX_COLUMN = "__index__"
+
+# Shared memory blocks (and decoded categories) attached by this process, by block name
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, Dict[str, pd.CategoricalDtype]]] = {}
+
+@dataclass
+class SharedColumn:
+    """
+    Layout of one column in the shared memory block.
+
+    Attributes:
+    ----------
+    name: Hashable
+        The column name.
+    kind: str
+        "array" (values stored as is), "category" (codes stored as is, categories pickled once)
+        or "pickle" (values pickled per segment).
+    dtype: str
+        The dtype of the stored array (the codes for categories).
+    offset: int
+        The byte offset of the array (or of the pickled segments).
+    nbytes: int
+        The size of the array in bytes.
+    categories: Optional[Tuple[int, int]]
+        The byte offset and size of the pickled categories.
+    segment_offsets: Optional[np.ndarray]
+        The byte offsets of the pickled segments (relative to ``offset``).
+    source_dtype: Optional[Any]
+        The dtype of the original column, if it differs from the decoded column (e.g. strings
+        stored as category codes or nullable integers pickled as objects).
+    """
+
+    name: Hashable
+    kind: str
+    dtype: str
+    offset: int
+    nbytes: int
+    categories: Optional[Tuple[int, int]] = None
+    segment_offsets: Optional[np.ndarray] = None
+    source_dtype: Optional[Any] = None
+
+@dataclass
+class SharedFrame:
+    """
+    A dataframe stored once in shared memory, split in contiguous segments (e.g. matches).
+
+    Numeric and boolean columns and the codes of string columns are stored as raw arrays, so
+    ``segment`` and ``to_frame`` return views on the shared block without copying. Categories
+    are decoded once per process. Other object columns (e.g. locations and freeze frames) are
+    pickled per segment, so a process only decodes the segments it reads. Columns read back
+    get the dtype of the original column; strings stored as codes are decoded per read segment.
+
+    The handle is small and cheap to send to worker processes; the process that created the
+    frame must ``unlink`` it (or use it as a context manager) when the workers are done.
+
+    Attributes:
+    ----------
+    name: str
+        The name of the shared memory block.
+    n_rows: int
+        The number of rows.
+    columns: List[SharedColumn]
+        The layout of every column.
+    segment_keys: np.ndarray
+        The key of every segment (e.g. the match ids).
+    segment_offsets: np.ndarray
+        The row offsets of the segments (length n_segments + 1).
+    size: int
+        The size of the shared memory block in bytes.
+    index_name: Optional[Hashable]
+        The name of the index of the shared dataframe.
+    """
+
+    name: str
+    n_rows: int
+    columns: List[SharedColumn]
+    segment_keys: np.ndarray
+    segment_offsets: np.ndarray
+    size: int
+    index_name: Optional[Hashable] = None
+    _owner: Optional[shared_memory.SharedMemory] = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
+
+    def __getstate__(self) -> dict:
+        # Workers get the layout, not the owner's handle
+        return {**self.__dict__, "_owner": None}
+
+    @classmethod
+    def create(cls, df: pd.DataFrame, by: str = "match_id") -> "SharedFrame":
+        """
+        Copy a dataframe into a new shared memory block.
+
+        Parameters:
+        ----------
+        df: pd.DataFrame
+            The dataframe to share.
+        by: str
+            The column that defines the segments; the rows are stably sorted by it.
+
+        Returns:
+        --------
+        SharedFrame
+            The handle of the shared frame.
+        """
+        df = df.iloc[np.argsort(df[by].to_numpy(), kind="stable")]
+        segment_keys, starts = np.unique(df[by].to_numpy(), return_index=True)
+        segment_offsets = np.append(starts, len(df)).astype(np.int64)
+
+        data = df.reset_index(drop=True)
+        data[_INDEX_COLUMN] = df.index
+
+        # Encode the columns and lay them out in one block
+        encoded, size = [], 0
+        for col in data.columns:
+            kind, values, categories = _encode(data[col])
+            size = _align(size)
+
+            if kind == "pickle":
+                parts = [
+                    pickle.dumps(values[start:end], protocol=pickle.HIGHEST_PROTOCOL)
+                    for start, end in zip(segment_offsets[:-1], segment_offsets[1:])
+                ]
+                column = SharedColumn(col, kind, "bytes", size, sum(len(part) for part in parts))
+                column.segment_offsets = np.concatenate([[0], np.cumsum([len(part) for part in parts])]).astype(np.int64)
+                values = b"".join(parts)
+            else:
+                column = SharedColumn(col, kind, values.dtype.str, size, values.nbytes)
+
+            # Restore the original dtype on read where the stored encoding changes it
+            dtype = data[col].dtype
+            if (kind == "category" and not isinstance(dtype, pd.CategoricalDtype)) or (kind == "pickle" and dtype != object):
+                column.source_dtype = dtype
+            size += column.nbytes
+
+            if categories is not None:
+                categories = pickle.dumps(categories, protocol=pickle.HIGHEST_PROTOCOL)
+                column.categories = (size, len(categories))
+                size += len(categories)
+
+            encoded.append((column, values, categories))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        for column, values, categories in encoded:
+            if column.kind == "pickle":
+                shm.buf[column.offset:column.offset + column.nbytes] = values
+            else:
+                np.ndarray(len(values), dtype=values.dtype, buffer=shm.buf, offset=column.offset)[:] = values
+            if categories is not None:
+                offset, nbytes = column.categories
+                shm.buf[offset:offset + nbytes] = categories
+
+        logger.info(f"Shared {len(df)} rows in {len(segment_keys)} segments ({size / 1e6:.1f} MB) as {shm.name}.")
+
+        return cls(
+            name=shm.name,
+            n_rows=len(df),
+            columns=[column for column, _, _ in encoded],
+            segment_keys=segment_keys,
+            segment_offsets=segment_offsets,
+            size=size,
+            index_name=df.index.name,
+            _owner=shm,
+        )
+
+    def segment(self, key: Any) -> pd.DataFrame:
+        """
+        Get the rows of one segment (e.g. one match).
+
+        Parameters:
+        ----------
+        key: Any
+            The segment key.
+
+        Returns:
+        --------
+        pd.DataFrame
+            The rows of the segment, with their original index.
+        """
+        position = np.searchsorted(self.segment_keys, key)
+        if position == len(self.segment_keys) or self.segment_keys[position] != key:
+            return self._frame(0, 0, [0, 0])
+
+        return self._frame(position, position + 1, self.segment_offsets[position:position + 2])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get all rows of the shared frame."""
+        return self._frame(0, len(self.segment_keys), self.segment_offsets[[0, -1]])
+
+    def unlink(self) -> None:
+        """Release the shared memory block (only in the process that created it)."""
+        if self._owner is None:
+            return
+
+        _attached.pop(self.name, None)
+        try:
+            self._owner.close()
+        except BufferError:
+            # Frames of this process still point into the block, it is released when they are gone
+            pass
+        self._owner.unlink()
+        self._owner = None
+
+    def _frame(self, first_segment: int, last_segment: int, rows) -> pd.DataFrame:
+        """Build a dataframe of the rows in [rows[0], rows[1]) from views on the shared block."""
+        shm, categories = self._attach()
+        start, end = int(rows[0]), int(rows[1])
+
+        data = {}
+        for column in self.columns:
+            if column.kind == "pickle":
+                offsets = column.segment_offsets
+                parts = [
+                    pickle.loads(shm.buf[column.offset + offsets[i]:column.offset + offsets[i + 1]])
+                    for i in range(first_segment, last_segment)
+                ]
+                series = pd.Series(np.concatenate(parts) if parts else np.array([], dtype=object))
+            else:
+                values = np.ndarray(self.n_rows, dtype=np.dtype(column.dtype), buffer=shm.buf, offset=column.offset)[start:end]
+                values.flags.writeable = False
+
+                if column.kind == "category":
+                    values = pd.Categorical.from_codes(values, dtype=categories[column.name])
+                series = pd.Series(values, copy=False)
+
+            data[column.name] = series.astype(column.source_dtype) if column.source_dtype is not None else series
+
+        df = pd.DataFrame(data, copy=False)
+        return df.set_index(_INDEX_COLUMN).rename_axis(self.index_name)
+
+    def _attach(self) -> Tuple[shared_memory.SharedMemory, Dict[str, pd.CategoricalDtype]]:
+        """Attach to the shared block once per process and decode the categories."""
+        if self.name not in _attached:
+            shm = self._owner or shared_memory.SharedMemory(name=self.name)
+            categories = {
+                column.name: pd.CategoricalDtype(pickle.loads(shm.buf[column.categories[0]:column.categories[0] + column.categories[1]]))
+                for column in self.columns if column.kind == "category"
+            }
+            _attached[self.name] = (shm, categories)
+
+        return _attached[self.name]
+
+def _encode(values: pd.Series) -> Tuple[str, Any, Optional[pd.Index]]:
+    """Encode a column as raw values, category codes (with categories) or an object array to pickle."""
+    dtype = values.dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category", values.cat.codes.to_numpy(), dtype.categories
+
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return "array", values.to_numpy(), None
+
+    # Low-cardinality strings (as in normalize_events) are stored as category codes
+    if dtype == object or pd.api.types.is_string_dtype(values):
+        non_null = values.dropna()
+        if len(non_null) and non_null.map(type).eq(str).all() and non_null.nunique() <= len(non_null) // 2:
+            categorical = values.astype("category")
+            return "category", categorical.cat.codes.to_numpy(), categorical.cat.categories
+
+    return "pickle", values.to_numpy(dtype=object), None
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
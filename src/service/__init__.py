@@ -0,0 +1,9 @@
+"""Module for serving stats from a local HTTP/JSON service."""
+
+from .server import StatsService, QueryError, create_server
+
+__all__ = [
+    "StatsService",
+    "QueryError",
+    "create_server",
+]
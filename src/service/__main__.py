@@ -0,0 +1,28 @@
+"""Run the stats service on the local event store: python -m src.service"""
+
+import argparse
+
+import pandas as pd
+
+from src.config import config, setup_logging
+from src.extract import iter_event_store
+from src.service import StatsService, create_server
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve team stats from the local event store.")
+    parser.add_argument("--store", default=None, help="Event store directory (default from config)")
+    parser.add_argument("--competition", default=f"{config.statsbomb.division} {config.statsbomb.season}", help="Name of the competition in the store")
+    parser.add_argument("--host", default=config.service.host)
+    parser.add_argument("--port", type=int, default=config.service.port)
+    args = parser.parse_args()
+
+    logger = setup_logging()
+
+    events_df = pd.concat(iter_event_store(args.store), ignore_index=True)
+    logger.info(f"Loaded {len(events_df)} events for {args.competition}.")
+
+    server = create_server(StatsService({args.competition: events_df}), host=args.host, port=args.port)
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import inspect
+import json
+import logging
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from src.config import config
+from src.stats import calculate_build_up_stats, calculate_shots_stats
+from src.stats.zones import calculate_zone_counts
+from src.transform import (
+    transform_to_box_entry_events,
+    transform_to_build_up_events,
+    transform_to_progressive_actions,
+    transform_to_shot_events,
+    transform_to_turnovers,
+)
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+class QueryError(Exception):
+    """Raised for invalid queries, reported to the client with the given HTTP status."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class StatsService:
+    """
+    In-memory query layer over the transforms and stats.
+
+    Transform outputs are computed once per competition (on first use) and kept in memory.
+    Responses are cached in an LRU cache keyed by endpoint and parameters.
+
+    Parameters:
+    ----------
+    events: Dict[str, pd.DataFrame]
+        The events data per competition name.
+    cache_size: Optional[int]
+        The maximum number of cached responses, by default the value from the config.
+    """
+
+    zone_kinds = ("progressive_actions", "turnovers", "box_entries")
+
+    def __init__(
+        self,
+        events: Dict[str, pd.DataFrame],
+        cache_size: Optional[int] = None,
+    ):
+        self._events = events
+        self._outputs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Callable] = {
+            "/competitions": self._competitions,
+            "/teams": self._teams,
+            "/build-up": self._build_up,
+            "/shots": self._shots,
+            "/zones": self._zones,
+        }
+        self.respond = lru_cache(maxsize=cache_size or config.service.cache_size)(self._respond)
+
+    def query(self, path: str, params: Dict[str, str]) -> bytes:
+        """
+        Answer a query with a JSON response (cached).
+
+        Parameters:
+        ----------
+        path: str
+            The endpoint, e.g. "/shots".
+        params: Dict[str, str]
+            The query parameters, e.g. {"team": "Spain"}.
+
+        Returns:
+        --------
+        bytes
+            The JSON response.
+        """
+        return self.respond(path, tuple(sorted(params.items())))
+
+    def _respond(self, path: str, params: Tuple[Tuple[str, str], ...]) -> bytes:
+        """Compute the JSON response of a query."""
+        if path not in self._endpoints:
+            raise QueryError(f"Unknown endpoint {path}", status=404)
+
+        endpoint = self._endpoints[path]
+        allowed = list(inspect.signature(endpoint).parameters)
+        unknown = [key for key, _ in params if key not in allowed]
+        if unknown:
+            raise QueryError(
+                f"Unknown parameters {', '.join(unknown)} for {path}, expected "
+                f"{', '.join(allowed) if allowed else 'no parameters'}"
+            )
+
+        result = endpoint(**dict(params))
+
+        if isinstance(result, pd.DataFrame):
+            return result.to_json(orient="records").encode()
+
+        return json.dumps(result).encode()
+
+    def _outputs_for(self, competition: Optional[str]) -> dict:
+        """Get the teams and transform outputs of a competition, computing them on first use."""
+        competition = competition or _default_competition()
+
+        if competition not in self._events:
+            raise QueryError(f"Unknown competition {competition}", status=404)
+
+        with self._lock:
+            if competition not in self._outputs:
+                logger.info(f"Computing transform outputs for {competition}.")
+                events_df = self._events[competition]
+                first_events_df, chain_events_df = transform_to_build_up_events(events_df)
+                shots_df = transform_to_shot_events(events_df)
+
+                self._outputs[competition] = {
+                    "teams": sorted(events_df["team"].dropna().unique()),
+                    "build_up_stats": calculate_build_up_stats(first_events_df, chain_events_df),
+                    "shots_stats": calculate_shots_stats(shots_df),
+                    "progressive_actions": transform_to_progressive_actions(events_df),
+                    "turnovers": transform_to_turnovers(events_df),
+                    "box_entries": transform_to_box_entry_events(events_df),
+                }
+
+        return self._outputs[competition]
+
+    def _competitions(self) -> list:
+        return list(self._events)
+
+    def _teams(self, competition: Optional[str] = None) -> list:
+        return self._outputs_for(competition)["teams"]
+
+    def _build_up(self, team: Optional[str] = None, competition: Optional[str] = None) -> pd.DataFrame:
+        outputs = self._outputs_for(competition)
+        return _filter_team(outputs["build_up_stats"], team, outputs["teams"])
+
+    def _shots(self, team: Optional[str] = None, competition: Optional[str] = None) -> pd.DataFrame:
+        outputs = self._outputs_for(competition)
+        return _filter_team(outputs["shots_stats"], team, outputs["teams"])
+
+    def _zones(
+        self,
+        kind: str = "progressive_actions",
+        team: Optional[str] = None,
+        competition: Optional[str] = None,
+    ) -> pd.DataFrame:
+        if kind not in self.zone_kinds:
+            raise QueryError(f"Unknown zone kind {kind}, expected one of {', '.join(self.zone_kinds)}")
+
+        outputs = self._outputs_for(competition)
+        return calculate_zone_counts(_filter_team(outputs[kind], team, outputs["teams"]))
+
+def create_server(
+    service: StatsService,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+) -> ThreadingHTTPServer:
+    """
+    Create a local HTTP server for a stats service. Every request is handled in its own thread.
+
+    Parameters:
+    ----------
+    service: StatsService
+        The service to answer the queries.
+    host: Optional[str]
+        The host to bind to, by default the value from the config (localhost).
+    port: Optional[int]
+        The port to bind to, by default the value from the config.
+
+    Returns:
+    --------
+    ThreadingHTTPServer
+        The server, call ``serve_forever()`` to start it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            try:
+                status, body = 200, service.query(url.path, params)
+            except QueryError as e:
+                status, body = e.status, json.dumps({"error": str(e)}).encode()
+            except Exception:
+                logger.exception(f"Failed to answer {self.path}")
+                status, body = 500, json.dumps({"error": "Internal server error"}).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    host = host or config.service.host
+    port = port if port is not None else config.service.port
+
+    logger.info(f"Serving stats on http://{host}:{port}")
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+def _default_competition() -> str:
+    """Name of the competition from the config."""
+    return f"{config.statsbomb.division} {config.statsbomb.season}"
+
+def _filter_team(df: pd.DataFrame, team: Optional[str], teams: list) -> pd.DataFrame:
+    """Filter a dataframe for a team (no rows if the team has none), or return all teams if no team is given."""
+    if team is None:
+        return df
+
+    if team not in teams:
+        raise QueryError(f"Unknown team {team}", status=404)
+
+    return df[df["team"] == team]
@@ -1,7 +1,42 @@
-from .build_up import calculate_build_up_stats
-from .shots import calculate_shots_stats
+from .build_up import calculate_build_up_stats, calculate_build_up_partials, finalize_build_up_stats
+from .shots import calculate_shots_stats, calculate_shots_partials, finalize_shots_stats, calculate_shots_confidence_intervals
+from .restarts import calculate_restart_chain_stats
+from .zones import calculate_zone_counts
+from .xt import XTGrid, fit_xt_grid, get_xt_grid, xt_fingerprint, calculate_xt_added, calculate_xt_rankings
+from .sequence_patterns import calculate_frequent_sequences
+from .pressing import calculate_pressing_stats
+from .transitions import calculate_transition_stats
+from .opponent_adjustment import match_opponents, calculate_shots_match_metrics, calculate_opponent_adjusted_ratings
+from .players import calculate_minutes_played, calculate_player_stats
+from .form import calculate_match_partials, calculate_form_stats, FormTracker
+from .partials import combine_partials
 
 __all__ = [
     "calculate_build_up_stats",
+    "calculate_build_up_partials",
+    "finalize_build_up_stats",
     "calculate_shots_stats",
+    "calculate_shots_partials",
+    "finalize_shots_stats",
+    "calculate_shots_confidence_intervals",
+    "calculate_restart_chain_stats",
+    "calculate_zone_counts",
+    "XTGrid",
+    "fit_xt_grid",
+    "get_xt_grid",
+    "xt_fingerprint",
+    "calculate_xt_added",
+    "calculate_xt_rankings",
+    "calculate_frequent_sequences",
+    "calculate_pressing_stats",
+    "calculate_transition_stats",
+    "match_opponents",
+    "calculate_shots_match_metrics",
+    "calculate_opponent_adjusted_ratings",
+    "calculate_minutes_played",
+    "calculate_player_stats",
+    "calculate_match_partials",
+    "calculate_form_stats",
+    "FormTracker",
+    "combine_partials",
 ]
\ No newline at end of file
@@ -1,16 +1,60 @@
 import pandas as pd
 import logging
+from typing import Iterable, Optional, Tuple, Union
+
+from src.stats.partials import combine_partials
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
+BUILD_UP_PARTIALS = [
+    "first_completed_short", "first_completed_long", "first_incomplete_short", "first_incomplete_long",
+    "second_completed_short", "second_completed_long", "second_incomplete_short", "second_incomplete_long",
+]
+
 
 def calculate_build_up_stats(
+    first_events_df: Union[pd.DataFrame, Iterable[Tuple[pd.DataFrame, pd.DataFrame]]],
+    chain_events_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Calculate the statistics for the build up.
+
+    Parameters:
+    ----------
+    first_events_df: Union[pd.DataFrame, Iterable[Tuple[pd.DataFrame, pd.DataFrame]]]
+        The first events dataframe, or an iterator of per-match (first events, chain events)
+        tuples (e.g. from a streamed ``transform_to_build_up_events``).
+    chain_events_df: Optional[pd.DataFrame]
+        The chain events dataframe. Not used when an iterator is passed.
+
+    Returns:
+    --------
+    pd.DataFrame: The statistics for the build up.
+    """
+
+    logger.info(f"Calculating statistics for build up.")
+
+    if isinstance(first_events_df, pd.DataFrame):
+        partials = calculate_build_up_partials(first_events_df, chain_events_df)
+    else:
+        partials = combine_partials(
+            (
+                calculate_build_up_partials(match_first_events_df, match_chain_events_df)
+                for match_first_events_df, match_chain_events_df in first_events_df
+            ),
+            columns=BUILD_UP_PARTIALS,
+        )
+
+    return finalize_build_up_stats(partials)
+
+
+def calculate_build_up_partials(
     first_events_df: pd.DataFrame,
     chain_events_df: pd.DataFrame,
 ) -> pd.DataFrame:
     """
-    Calculate the statistics for the build up.
+    Calculate the additive pass counts per team and build up phase.
 
     Parameters:
     ----------
@@ -21,11 +65,9 @@ def calculate_build_up_stats(
 
     Returns:
     --------
-    pd.DataFrame: The statistics for the build up.
+    pd.DataFrame: The completed and incomplete short and long passes per phase, indexed by team.
     """
 
-    logger.info(f"Calculating statistics for build up.")
-
     # Get all teams first
     all_teams = first_events_df["team"].unique()
     
@@ -50,17 +92,6 @@ def calculate_build_up_stats(
         (first_events_df["pass_category"] == "long")
     ].groupby("team").size().reindex(all_teams, fill_value=0)
 
-    first_phase_total_short = first_phase_completed_short + first_phase_incomplete_short
-    first_phase_total_long = first_phase_completed_long + first_phase_incomplete_long
-    first_phase_total = first_phase_total_short + first_phase_total_long
-
-    first_phase_short_percentage = (first_phase_total_short / first_phase_total).fillna(0) * 100
-    first_phase_long_percentage = (first_phase_total_long / first_phase_total).fillna(0) * 100
-    first_phase_completed_short_percentage = (first_phase_completed_short / first_phase_total_short).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
-    first_phase_completed_long_percentage = (first_phase_completed_long / first_phase_total_long).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
-    first_phase_incomplete_short_percentage = (first_phase_incomplete_short / first_phase_total_short).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
-    first_phase_incomplete_long_percentage = (first_phase_incomplete_long / first_phase_total_long).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
-
     # Second phase
     second_phase_completed_short = chain_events_df[
         (chain_events_df["pass_outcome"].isna()) &
@@ -86,6 +117,57 @@ def calculate_build_up_stats(
         (chain_events_df["phase"] == 2)
     ].groupby("team").size().reindex(all_teams, fill_value=0)
 
+    return pd.DataFrame({
+        "first_completed_short": first_phase_completed_short,
+        "first_completed_long": first_phase_completed_long,
+        "first_incomplete_short": first_phase_incomplete_short,
+        "first_incomplete_long": first_phase_incomplete_long,
+        "second_completed_short": second_phase_completed_short,
+        "second_completed_long": second_phase_completed_long,
+        "second_incomplete_short": second_phase_incomplete_short,
+        "second_incomplete_long": second_phase_incomplete_long,
+    }, index=pd.Index(all_teams, name="team"))
+
+
+def finalize_build_up_stats(partials: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the build up statistics from (combined) build up partials.
+
+    Parameters:
+    ----------
+    partials: pd.DataFrame
+        The build up partials, indexed by team.
+
+    Returns:
+    --------
+    pd.DataFrame: The statistics for the build up.
+    """
+
+    all_teams = partials.index
+
+    # First phase
+    first_phase_completed_short = partials["first_completed_short"]
+    first_phase_completed_long = partials["first_completed_long"]
+    first_phase_incomplete_short = partials["first_incomplete_short"]
+    first_phase_incomplete_long = partials["first_incomplete_long"]
+
+    first_phase_total_short = first_phase_completed_short + first_phase_incomplete_short
+    first_phase_total_long = first_phase_completed_long + first_phase_incomplete_long
+    first_phase_total = first_phase_total_short + first_phase_total_long
+
+    first_phase_short_percentage = (first_phase_total_short / first_phase_total).fillna(0) * 100
+    first_phase_long_percentage = (first_phase_total_long / first_phase_total).fillna(0) * 100
+    first_phase_completed_short_percentage = (first_phase_completed_short / first_phase_total_short).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
+    first_phase_completed_long_percentage = (first_phase_completed_long / first_phase_total_long).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
+    first_phase_incomplete_short_percentage = (first_phase_incomplete_short / first_phase_total_short).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
+    first_phase_incomplete_long_percentage = (first_phase_incomplete_long / first_phase_total_long).replace([float('inf'), -float('inf')], 0).fillna(0) * 100
+
+    # Second phase
+    second_phase_completed_short = partials["second_completed_short"]
+    second_phase_completed_long = partials["second_completed_long"]
+    second_phase_incomplete_short = partials["second_incomplete_short"]
+    second_phase_incomplete_long = partials["second_incomplete_long"]
+
     second_phase_total_short = second_phase_completed_short + second_phase_incomplete_short
     second_phase_total_long = second_phase_completed_long + second_phase_incomplete_long
     second_phase_total = second_phase_total_short + second_phase_total_long
@@ -0,0 +1,298 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.config import config
+from src.stats.build_up import BUILD_UP_PARTIALS, finalize_build_up_stats
+from src.stats.shots import SHOTS_PARTIALS, finalize_shots_stats
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+PROGRESSION_PARTIALS = ["progressive_passes", "progressive_carries"]
+
+def calculate_match_partials(
+    matches_df: pd.DataFrame,
+    build_up: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None,
+    shots_df: Optional[pd.DataFrame] = None,
+    progressive_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Calculate the additive partials of every team in every match.
+
+    The partials have the same columns as ``calculate_build_up_partials`` and
+    ``calculate_shots_partials`` (plus progressive passes and carries), but they are grouped by
+    team and match in one pass per source instead of by team. Every team gets a row for every
+    match it played (from ``matches_df``), with zero partials if it has no events in a source,
+    so the rolling windows of ``calculate_form_stats`` always span the last matches played.
+
+    Parameters:
+    ----------
+    matches_df: pd.DataFrame
+        The matches with match_id, match_date, home_team and away_team (e.g. from
+        ``load_open_data_matches``), in the order of their date.
+    build_up: Optional[Tuple[pd.DataFrame, pd.DataFrame]]
+        The first events and chain events (from ``transform_to_build_up_events``).
+    shots_df: Optional[pd.DataFrame]
+        The shots (from ``transform_to_shot_events``).
+    progressive_df: Optional[pd.DataFrame]
+        The progressive actions (from ``transform_to_progressive_actions``).
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per team and match with the match number of the team and the partials, in match order.
+    """
+
+    keys = ["team", "match_id"]
+    parts = []
+
+    if build_up is not None:
+        first_events_df, chain_events_df = build_up
+        chain_events_df = chain_events_df[chain_events_df["phase"] == 2]
+        for phase, df in (("first", first_events_df), ("second", chain_events_df)):
+            label = (
+                phase + "_" +
+                np.where(df["pass_outcome"].isna(), "completed", "incomplete") + "_" +
+                df["pass_category"].astype(str).to_numpy()
+            )
+            parts.append(
+                df[keys].assign(label=label).groupby(keys + ["label"]).size().unstack("label", fill_value=0)
+            )
+
+    if shots_df is not None:
+        from_set_piece = shots_df["shot_from_set_piece"].to_numpy(dtype=bool)
+        xg = shots_df["shot_statsbomb_xg"].fillna(0).to_numpy(dtype=float)
+        parts.append(shots_df[keys].assign(
+            shots_from_set_piece=from_set_piece.astype(int),
+            shots_from_open_play=(~from_set_piece).astype(int),
+            xg_from_set_piece=np.where(from_set_piece, xg, 0.0),
+            xg_from_open_play=np.where(from_set_piece, 0.0, xg),
+        ).groupby(keys).sum())
+
+    if progressive_df is not None:
+        parts.append(progressive_df[keys].assign(
+            progressive_passes=(progressive_df["type"] == "Pass").to_numpy(dtype=int),
+            progressive_carries=(progressive_df["type"] == "Carry").to_numpy(dtype=int),
+        ).groupby(keys).sum())
+
+    partials = pd.concat(parts, axis=1).groupby(level=[0, 1]).sum() if parts else pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=keys))
+
+    # Every partial of every source, also the ones without events
+    columns = (
+        (BUILD_UP_PARTIALS if build_up is not None else []) +
+        (SHOTS_PARTIALS if shots_df is not None else []) +
+        (PROGRESSION_PARTIALS if progressive_df is not None else [])
+    )
+    # Every team in every match it played, in match order
+    played = pd.concat([
+        matches_df[["home_team", "match_id", "match_date"]].rename(columns={"home_team": "team"}),
+        matches_df[["away_team", "match_id", "match_date"]].rename(columns={"away_team": "team"}),
+    ]).sort_values(["team", "match_date", "match_id"], kind="stable")
+    team_matches = pd.MultiIndex.from_frame(played[keys])
+
+    missing = partials.index.difference(team_matches)
+    if len(missing):
+        logger.warning("Dropping partials of %d team matches that are not in the matches.", len(missing))
+
+    partials = partials.reindex(index=team_matches, columns=columns).fillna(0).reset_index()
+    partials = partials.astype({col: int for col in columns if not col.startswith("xg_")})
+
+    partials.insert(2, "match_number", partials.groupby("team").cumcount() + 1)
+
+    logger.info(f"Calculated partials for {len(partials)} team matches.")
+
+    return partials.reset_index(drop=True)
+
+def calculate_form_stats(
+    match_partials: pd.DataFrame,
+    window: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Calculate the stats of every team over its last matches, after every match.
+
+    The window totals are the difference of the cumulative partials at the current match and
+    ``window`` matches before (one cumulative sum and one shift per team for all windows), and
+    the stats are finalized from the window totals with the same functions as the tournament
+    stats. ``window=1`` gives the stats of every single match.
+
+    Parameters:
+    ----------
+    match_partials: pd.DataFrame
+        The partials of every team in every match (from ``calculate_match_partials``).
+    window: Optional[int]
+        The number of matches in the rolling window, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per team and match with the number of matches in the window and the stats over the window.
+    """
+
+    window = window or config.form.window
+
+    logger.info(f"Calculating form stats over the last {window} matches for {len(match_partials)} team matches.")
+
+    columns = [col for col in match_partials.columns if col not in ("team", "match_id", "match_number")]
+    teams = match_partials["team"]
+
+    # Rolling totals by cumulative sum differencing
+    cumulative = match_partials[columns].groupby(teams.to_numpy()).cumsum()
+    lagged = cumulative.groupby(teams.to_numpy()).shift(window, fill_value=0)
+    totals = cumulative - lagged
+    totals.index = pd.Index(teams.to_numpy(), name="team")
+
+    form_df = match_partials[["team", "match_id", "match_number"]].reset_index(drop=True)
+    form_df["matches"] = np.minimum(form_df["match_number"], window)
+
+    return pd.concat([form_df, finalize_form_stats(totals, form_df["matches"].to_numpy())], axis=1)
+
+def finalize_form_stats(totals: pd.DataFrame, matches: np.ndarray) -> pd.DataFrame:
+    """
+    Calculate the stats from window totals of partials.
+
+    Parameters:
+    ----------
+    totals: pd.DataFrame
+        The summed partials of every window, indexed by team.
+    matches: np.ndarray
+        The number of matches in every window.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The build up, shot and progression stats of every window (without the team column).
+    """
+
+    stats = []
+
+    if set(BUILD_UP_PARTIALS) <= set(totals.columns):
+        stats.append(finalize_build_up_stats(totals[BUILD_UP_PARTIALS]).drop(columns="team"))
+
+    if set(SHOTS_PARTIALS) <= set(totals.columns):
+        stats.append(finalize_shots_stats(totals[SHOTS_PARTIALS]).drop(columns="team"))
+
+    if set(PROGRESSION_PARTIALS) <= set(totals.columns):
+        progression = totals[PROGRESSION_PARTIALS].reset_index(drop=True)
+        for col in PROGRESSION_PARTIALS:
+            progression[f"{col}_per_match"] = (progression[col] / matches).round(2)
+        stats.append(progression)
+
+    return pd.concat(stats, axis=1) if stats else pd.DataFrame(index=range(len(totals)))
+
+class FormTracker:
+    """
+    Incremental rolling form of every team.
+
+    Keeps the cumulative partials of every team after every match, so adding a match is one
+    vector addition and the totals over any window are one subtraction, independent of the
+    number of matches played.
+
+    Parameters:
+    ----------
+    columns: Iterable[str]
+        The partial columns to track.
+    window: Optional[int]
+        The default number of matches in the window, by default the value from the config.
+    """
+
+    def __init__(self, columns: Iterable[str], window: Optional[int] = None):
+        self.columns = list(columns)
+        self.window = window or config.form.window
+        self._cumulative: Dict[str, List[np.ndarray]] = {}
+        self._match_ids: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_partials(cls, match_partials: pd.DataFrame, window: Optional[int] = None) -> "FormTracker":
+        """
+        Create a tracker from the partials of every team in every match (in match order).
+
+        Parameters:
+        ----------
+        match_partials: pd.DataFrame
+            The partials (from ``calculate_match_partials``).
+        window: Optional[int]
+            The default number of matches in the window, by default the value from the config.
+
+        Returns:
+        --------
+        FormTracker
+            The tracker with all matches added.
+        """
+        columns = [col for col in match_partials.columns if col not in ("team", "match_id", "match_number")]
+        tracker = cls(columns, window=window)
+
+        for team, team_df in match_partials.groupby("team", sort=False):
+            cumulative = np.cumsum(team_df[columns].to_numpy(dtype=float), axis=0)
+            tracker._cumulative[team] = [np.zeros(len(columns))] + list(cumulative)
+            tracker._match_ids[team] = list(team_df["match_id"])
+
+        return tracker
+
+    def add_match(self, team: str, match_id: int, partials: Mapping[str, float]) -> None:
+        """
+        Add the partials of a team in a new match.
+
+        Parameters:
+        ----------
+        team: str
+            The team.
+        match_id: int
+            The match.
+        partials: Mapping[str, float]
+            The partials of the team in the match (missing columns count as 0).
+        """
+        cumulative = self._cumulative.setdefault(team, [np.zeros(len(self.columns))])
+        self._match_ids.setdefault(team, []).append(match_id)
+        cumulative.append(cumulative[-1] + np.array([partials.get(col, 0) for col in self.columns], dtype=float))
+
+    def totals(self, team: str, window: Optional[int] = None) -> pd.Series:
+        """
+        Get the partials of a team summed over its last matches.
+
+        Parameters:
+        ----------
+        team: str
+            The team.
+        window: Optional[int]
+            The number of matches, by default the window of the tracker.
+
+        Returns:
+        --------
+        pd.Series
+            The summed partials.
+        """
+        window = window or self.window
+        cumulative = self._cumulative[team]
+        start = max(len(cumulative) - 1 - window, 0)
+
+        return pd.Series(cumulative[-1] - cumulative[start], index=self.columns, name=team)
+
+    def form(self, window: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the current stats of every team over its last matches.
+
+        Parameters:
+        ----------
+        window: Optional[int]
+            The number of matches, by default the window of the tracker.
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per team with its last match, the number of matches in the window and the stats.
+        """
+        window = window or self.window
+        teams = list(self._cumulative)
+        totals = pd.DataFrame([self.totals(team, window) for team in teams], index=pd.Index(teams, name="team"))
+        matches = np.array([min(len(self._match_ids[team]), window) for team in teams])
+
+        form_df = pd.DataFrame({
+            "team": teams,
+            "match_id": [self._match_ids[team][-1] for team in teams],
+            "match_number": [len(self._match_ids[team]) for team in teams],
+            "matches": matches,
+        })
+
+        return pd.concat([form_df, finalize_form_stats(totals, matches)], axis=1)
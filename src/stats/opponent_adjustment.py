@@ -0,0 +1,147 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Iterable, Optional
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def match_opponents(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the opponent of every team in every match.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The events data (or any frame with match_id and team columns that has both teams of every match).
+
+    Returns:
+    --------
+    pd.DataFrame
+        The match_id, team and opponent of every team in every match.
+    """
+    teams_df = events_df[["match_id", "team"]].dropna().drop_duplicates()
+    opponents_df = teams_df.merge(teams_df, on="match_id", suffixes=("", "_opponent"))
+    opponents_df = opponents_df[opponents_df["team"] != opponents_df["team_opponent"]]
+
+    return opponents_df.rename(columns={"team_opponent": "opponent"}).sort_values(["match_id", "team"]).reset_index(drop=True)
+
+def calculate_shots_match_metrics(
+    shots_df: pd.DataFrame,
+    opponents_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Calculate shot metrics of every team in every match (matches without shots count as 0).
+
+    Parameters:
+    ----------
+    shots_df: pd.DataFrame
+        The shot events (from ``transform_to_shot_events``).
+    opponents_df: pd.DataFrame
+        The opponent of every team in every match (from ``match_opponents``).
+
+    Returns:
+    --------
+    pd.DataFrame
+        The match_id, team, opponent, shots, xg, shots_from_set_piece and xg_from_set_piece.
+    """
+    shots_df = shots_df.assign(
+        shot=1,
+        shot_from_set_piece_count=shots_df["shot_from_set_piece"].astype(int),
+        xg_from_set_piece=shots_df["shot_statsbomb_xg"].where(shots_df["shot_from_set_piece"], 0),
+    )
+
+    metrics_df = shots_df.groupby(["match_id", "team"]).agg(
+        shots=("shot", "sum"),
+        xg=("shot_statsbomb_xg", "sum"),
+        shots_from_set_piece=("shot_from_set_piece_count", "sum"),
+        xg_from_set_piece=("xg_from_set_piece", "sum"),
+    )
+
+    return opponents_df.join(metrics_df, on=["match_id", "team"]).fillna({
+        "shots": 0, "xg": 0.0, "shots_from_set_piece": 0, "xg_from_set_piece": 0.0,
+    })
+
+def calculate_opponent_adjusted_ratings(
+    match_metrics_df: pd.DataFrame,
+    metrics: Optional[Iterable[str]] = None,
+    alpha: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Adjust per-match team metrics for the strength of the opponents.
+
+    Every (team, match) value is modelled as ``mean + offense[team] + defense[opponent]``.
+    The offensive and defensive ratings of all teams are fitted with one ridge regression on a
+    sparse team/opponent design matrix; the normal equations are factorized once (sparse LU)
+    and solved for all metrics at once.
+
+    Parameters:
+    ----------
+    match_metrics_df: pd.DataFrame
+        One row per team and match with match_id, team, opponent and metric columns
+        (e.g. from ``calculate_shots_match_metrics``).
+    metrics: Optional[Iterable[str]]
+        The metric columns to adjust, by default all numeric columns except match_id.
+    alpha: Optional[float]
+        The ridge penalty, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Per team and metric: the number of matches, the raw average for and against, and the
+        adjusted for (against an average defense) and against (against an average offense).
+    """
+
+    alpha = alpha if alpha is not None else config.opponent_adjustment.alpha
+
+    if metrics is None:
+        metrics = [
+            col for col in match_metrics_df.select_dtypes("number").columns
+            if col != "match_id"
+        ]
+    metrics = list(metrics)
+
+    teams = np.union1d(match_metrics_df["team"].unique(), match_metrics_df["opponent"].unique())
+    n_teams, n_rows = len(teams), len(match_metrics_df)
+    team_index = np.searchsorted(teams, match_metrics_df["team"].to_numpy())
+    opponent_index = np.searchsorted(teams, match_metrics_df["opponent"].to_numpy())
+
+    logger.info(f"Fitting opponent-adjusted ratings of {len(metrics)} metrics for {n_teams} teams from {n_rows} team matches.")
+
+    # Design matrix: offense of the team, defense of the opponent
+    rows = np.arange(n_rows)
+    design = sparse.csr_matrix(
+        (np.ones(2 * n_rows), (np.concatenate([rows, rows]), np.concatenate([team_index, n_teams + opponent_index]))),
+        shape=(n_rows, 2 * n_teams),
+    )
+
+    # Ridge regression on the centered metrics, all metrics as columns of one right-hand side
+    values = match_metrics_df[metrics].to_numpy(dtype=float)
+    means = values.mean(axis=0)
+    normal_matrix = (design.T @ design + alpha * sparse.identity(2 * n_teams, format="csr")).tocsc()
+    coefficients = splu(normal_matrix).solve(np.asarray(design.T @ (values - means)))
+
+    offense, defense = coefficients[:n_teams], coefficients[n_teams:]
+
+    # Raw averages for and against
+    raw_for = match_metrics_df.groupby("team")[metrics].mean().reindex(teams)
+    raw_against = match_metrics_df.groupby("opponent")[metrics].mean().reindex(teams)
+    matches = match_metrics_df.groupby("team").size().reindex(teams, fill_value=0)
+
+    ratings = []
+    for i, metric in enumerate(metrics):
+        ratings.append(pd.DataFrame({
+            "team": teams,
+            "metric": metric,
+            "matches": matches.to_numpy(),
+            "raw_for": raw_for[metric].to_numpy(),
+            "raw_against": raw_against[metric].to_numpy(),
+            "adjusted_for": means[i] + offense[:, i],
+            "adjusted_against": means[i] + defense[:, i],
+        }))
+
+    return pd.concat(ratings, ignore_index=True)
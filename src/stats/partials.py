@@ -0,0 +1,46 @@
+import pandas as pd
+import logging
+from typing import Iterable, Optional
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+
+def combine_partials(partials: Iterable[pd.DataFrame], columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Reduce partial aggregates (e.g. one per match) into one aggregate.
+
+    Partials are additive count and sum tables indexed by team. They are reduced
+    incrementally, so only the running total and the current partial are held in memory.
+    Teams keep the order in which they first appear.
+
+    Parameters:
+    ----------
+    partials: Iterable[pd.DataFrame]
+        The partial aggregates, indexed by team.
+    columns: Optional[Iterable[str]]
+        The partial columns, used for the (empty) aggregate when there are no partials.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The combined aggregate, indexed by team.
+        Without partials, an empty aggregate with the partial columns.
+    """
+
+    total = None
+    n_partials = 0
+
+    for partial in partials:
+        n_partials += 1
+        if total is None:
+            total = partial
+        else:
+            total = pd.concat([total, partial]).groupby(level=0, sort=False).sum()
+
+    logger.info(f"Combined {n_partials} partial aggregates.")
+
+    if total is None:
+        return pd.DataFrame(columns=list(columns or []), index=pd.Index([], name="team"), dtype=float)
+
+    return total
@@ -0,0 +1,199 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Iterable, Optional
+
+from src.config import config
+from src.extract.normalized_events import as_events_frame
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def calculate_minutes_played(
+    events_df: pd.DataFrame,
+    lineups_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Calculate the minutes played by every player in every match.
+
+    The periods of every match are put back to back on one match clock (so stoppage time
+    counts), players come on at 0 (starters) or at their substitution and go off at their
+    substitution, red card or the end of the match. All players are handled with grouped
+    min/max operations, there is no loop over players or matches.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The events data (with the Substitution, card and Starting XI events).
+    lineups_df: Optional[pd.DataFrame]
+        The lineups (from ``load_lineups``) to get the starters from. By default the starters
+        are taken from the Starting XI events or, without those, every player with events who
+        didn't come on as a substitute.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The match_id, team, player, whether they started and the minutes they played.
+    """
+
+    df = as_events_frame(events_df, tables=["substitution", "bad_behaviour", "foul_committed", "other"])
+
+    # No penalty shootouts
+    df = df[df["period"] <= 4]
+
+    logger.info(f"Calculating minutes played from {len(df)} events.")
+
+    # Match clock: periods back to back, starting at the first event of every period
+    seconds = df["minute"] * 60 + df["second"]
+    periods = seconds.groupby([df["match_id"], df["period"]]).agg(["min", "max"])
+    periods["length"] = periods["max"] - periods["min"]
+    periods["offset"] = periods.groupby(level="match_id")["length"].cumsum() - periods["length"]
+    period_index = pd.MultiIndex.from_arrays([df["match_id"], df["period"]])
+    clock = seconds.to_numpy() - periods["min"].reindex(period_index).to_numpy() + periods["offset"].reindex(period_index).to_numpy()
+    df = df.assign(clock=clock)
+    match_end = periods.groupby(level="match_id")["length"].sum()
+
+    keys = ["match_id", "team", "player"]
+
+    # Players coming on
+    substitutions = df[df["type"] == "Substitution"]
+    replacements = pd.DataFrame({
+        "match_id": substitutions["match_id"],
+        "team": substitutions["team"],
+        "player": _column(substitutions, "substitution_replacement"),
+        "clock": substitutions["clock"],
+    })
+    starters = _starters(df, replacements, lineups_df).assign(clock=0.0)
+    on_df = pd.concat([starters, replacements], ignore_index=True).groupby(keys)["clock"].min().rename("on")
+
+    # Players going off
+    red_card = (
+        _column(df, "bad_behaviour_card").isin(["Red Card", "Second Yellow"]) |
+        _column(df, "foul_committed_card").isin(["Red Card", "Second Yellow"])
+    )
+    off_df = df[(df["type"] == "Substitution") | red_card].groupby(keys)["clock"].min().rename("off")
+
+    minutes_df = on_df.to_frame().join(off_df).reset_index()
+    minutes_df["off"] = minutes_df["off"].fillna(minutes_df["match_id"].map(match_end))
+    minutes_df["started"] = minutes_df["on"] == 0
+    minutes_df["minutes"] = ((minutes_df["off"] - minutes_df["on"]).clip(lower=0) / 60).round(1)
+
+    logger.info(f"Calculated minutes played for {len(minutes_df)} player matches.")
+
+    return minutes_df[keys + ["started", "minutes"]]
+
+def calculate_player_stats(
+    minutes_df: pd.DataFrame,
+    progressive_df: Optional[pd.DataFrame] = None,
+    turnovers_df: Optional[pd.DataFrame] = None,
+    box_entries_df: Optional[pd.DataFrame] = None,
+    shots_df: Optional[pd.DataFrame] = None,
+    min_minutes: Optional[float] = None,
+    by: Iterable[str] = ("team", "player"),
+) -> pd.DataFrame:
+    """
+    Calculate per-90 statistics for every player.
+
+    The transformed events are stacked into one table of counts and summed with a single
+    groupby, so all players (of any number of teams, competitions or seasons in ``by``) are
+    aggregated at once.
+
+    Parameters:
+    ----------
+    minutes_df: pd.DataFrame
+        The minutes played per player and match (from ``calculate_minutes_played``).
+    progressive_df: Optional[pd.DataFrame]
+        The progressive actions (from ``transform_to_progressive_actions``).
+    turnovers_df: Optional[pd.DataFrame]
+        The turnovers (from ``transform_to_turnovers``).
+    box_entries_df: Optional[pd.DataFrame]
+        The box entries (from ``transform_to_box_entry_events``).
+    shots_df: Optional[pd.DataFrame]
+        The shots (from ``transform_to_shot_events``).
+    min_minutes: Optional[float]
+        The minimum minutes played to keep a player, by default the value from the config.
+    by: Iterable[str]
+        The columns that identify a player.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The matches, starts, minutes, totals and per-90 values of every player.
+    """
+
+    min_minutes = min_minutes if min_minutes is not None else config.players.min_minutes
+    by = list(by)
+
+    # One row per event with the counts it adds
+    counts = []
+    if progressive_df is not None:
+        counts.append(progressive_df[by].assign(
+            progressive_passes=(progressive_df["type"] == "Pass").to_numpy(dtype=int),
+            progressive_carries=(progressive_df["type"] == "Carry").to_numpy(dtype=int),
+        ))
+    if turnovers_df is not None:
+        counts.append(turnovers_df[by].assign(turnovers=1))
+    if box_entries_df is not None:
+        counts.append(box_entries_df[by].assign(box_entries=1))
+    if shots_df is not None:
+        counts.append(shots_df[by].assign(shots=1, xg=shots_df["shot_statsbomb_xg"].fillna(0).to_numpy(dtype=float)))
+
+    metrics = [col for part in counts for col in part.columns if col not in by]
+
+    logger.info(f"Calculating player stats for {len(minutes_df)} player matches.")
+
+    playing_time = minutes_df.groupby(by).agg(
+        matches=("match_id", "nunique"),
+        starts=("started", "sum"),
+        minutes=("minutes", "sum"),
+    )
+
+    if counts:
+        totals = pd.concat(counts, ignore_index=True).groupby(by)[metrics].sum()
+        stats_df = playing_time.join(totals).fillna({metric: 0 for metric in metrics})
+        stats_df = stats_df.astype({metric: int for metric in metrics if metric != "xg"})
+    else:
+        stats_df = playing_time
+
+    stats_df = stats_df[stats_df["minutes"] >= min_minutes].copy()
+
+    # Per 90 minutes
+    for metric in metrics:
+        stats_df[f"{metric}_p90"] = (stats_df[metric] / stats_df["minutes"] * 90).round(2)
+
+    logger.info(f"Calculated stats for {len(stats_df)} players with at least {min_minutes} minutes.")
+
+    return stats_df.reset_index()
+
+def _starters(
+    df: pd.DataFrame,
+    replacements: pd.DataFrame,
+    lineups_df: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """Get the starters of every match from the lineups, the Starting XI events or the players with events."""
+    keys = ["match_id", "team", "player"]
+
+    if lineups_df is not None:
+        return lineups_df.loc[lineups_df["starter"], keys]
+
+    starting_xi = df[df["type"] == "Starting XI"]
+    if len(starting_xi) and "tactics" in starting_xi:
+        return pd.DataFrame(
+            [
+                (match_id, team, player["player"]["name"])
+                for match_id, team, tactics in zip(starting_xi["match_id"], starting_xi["team"], starting_xi["tactics"])
+                if isinstance(tactics, dict)
+                for player in tactics.get("lineup", [])
+            ],
+            columns=keys,
+        )
+
+    # Without lineup information: everyone who played and didn't come on as a substitute
+    players = df.loc[df["player"].notna(), keys].drop_duplicates()
+    is_replacement = pd.MultiIndex.from_frame(players).isin(pd.MultiIndex.from_frame(replacements[keys]))
+
+    return players[~is_replacement]
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Get a column, or an empty column if the data doesn't have it."""
+    return df[col] if col in df else pd.Series(np.nan, index=df.index, dtype=object)
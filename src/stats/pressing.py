@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Optional
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def calculate_pressing_stats(
+    pressing_df: pd.DataFrame,
+    by: Optional[str] = "match",
+    ppda_max_x: Optional[float] = None,
+    high_regain_min_x: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Calculate pressing metrics per team (and match or match window).
+
+    - PPDA: opponent passes in their first ``ppda_max_x`` yards divided by the team's defensive
+      actions in the same area (the team's last ``120 - ppda_max_x`` yards, from its own perspective).
+    - High regains: ball regains at least ``high_regain_min_x`` yards up the pitch.
+    - Counterpress rate: share of pressures applied within 5 seconds of losing the ball.
+    - Opponent passes under pressure: share of all opponent passes made under pressure.
+
+    All counts are one grouped sum over the pressing events, so thresholds can be tuned without
+    transforming the events again.
+
+    Parameters:
+    ----------
+    pressing_df: pd.DataFrame
+        The pressing events (from ``transform_to_pressing_events``).
+    by: Optional[str]
+        "match" for one row per team and match, "window" for one row per team, match and
+        match window (of ``config.pressing.window_minutes`` minutes) or None for one row per team.
+    ppda_max_x: Optional[float]
+        The length of the opponent's build-up area used for PPDA, by default the value from the config.
+    high_regain_min_x: Optional[float]
+        The minimum x of a high regain, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The pressing metrics.
+    """
+
+    ppda_max_x = ppda_max_x if ppda_max_x is not None else config.pressing.ppda_max_x
+    high_regain_min_x = high_regain_min_x if high_regain_min_x is not None else config.pressing.high_regain_min_x
+
+    keys = {None: ["team"], "match": ["team", "match_id"], "window": ["team", "match_id", "window"]}[by]
+
+    logger.info(f"Calculating pressing stats for {len(pressing_df)} events by {by or 'team'}.")
+
+    x = pressing_df["x"].to_numpy(dtype=float)
+    is_pass = pressing_df["is_pass"].to_numpy(dtype=bool)
+    is_pressure = pressing_df["is_pressure"].to_numpy(dtype=bool)
+
+    # Passes count for the pressing team: their opponent
+    counts_df = pd.DataFrame({
+        "team": np.where(is_pass, pressing_df["opponent"].to_numpy(dtype=object), pressing_df["team"].to_numpy(dtype=object)),
+        "match_id": pressing_df["match_id"].to_numpy(),
+        "window": pressing_df["window"].to_numpy(),
+        "opponent_passes": is_pass & (x <= ppda_max_x),
+        "defensive_actions": pressing_df["is_defensive_action"].to_numpy(dtype=bool) & (x >= 120 - ppda_max_x),
+        "high_regains": pressing_df["is_regain"].to_numpy(dtype=bool) & (x >= high_regain_min_x),
+        "pressures": is_pressure,
+        "counterpresses": is_pressure & pressing_df["counterpress"].to_numpy(dtype=bool),
+        "opponent_passes_total": is_pass,
+        "opponent_passes_under_pressure": is_pass & pressing_df["under_pressure"].to_numpy(dtype=bool),
+    })
+    counts_df = counts_df[counts_df["team"].notna()]
+
+    stats_df = counts_df.groupby(keys)[[
+        "opponent_passes", "defensive_actions", "high_regains", "pressures", "counterpresses",
+        "opponent_passes_total", "opponent_passes_under_pressure",
+    ]].sum().astype(int).reset_index()
+
+    # Ratios (NaN without defensive actions or pressures)
+    stats_df["ppda"] = (stats_df["opponent_passes"] / stats_df["defensive_actions"].replace(0, np.nan)).round(2)
+    stats_df["counterpress_pct"] = (stats_df["counterpresses"] / stats_df["pressures"].replace(0, np.nan) * 100).round(0)
+    stats_df["opponent_passes_under_pressure_pct"] = (
+        stats_df["opponent_passes_under_pressure"] / stats_df["opponent_passes_total"].replace(0, np.nan) * 100
+    ).round(0)
+
+    if by == "window":
+        stats_df["window_start"] = stats_df["window"] * config.pressing.window_minutes
+
+    return stats_df
@@ -0,0 +1,70 @@
+import pandas as pd
+import logging
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+
+def calculate_restart_chain_stats(chains_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the statistics for restart chains per team, restart type and phase.
+
+    For every pass length category the totals, completed and incomplete passes are counted,
+    like the phases of ``calculate_build_up_stats``.
+
+    Parameters:
+    ----------
+    chains_df: pd.DataFrame
+        The restart chain passes from ``transform_to_restart_chains``.
+
+    Returns:
+    --------
+    pd.DataFrame: The statistics per team, restart type and phase.
+    """
+
+    logger.info(f"Calculating statistics for {len(chains_df)} restart chain passes.")
+
+    categories = list(chains_df["pass_category"].cat.categories)
+    phases = sorted(chains_df["phase"].unique())
+
+    # Every team and restart type with at least one restart gets a row for every phase
+    restarts = chains_df.loc[chains_df["phase"] == 1, ["team", "restart_type"]].drop_duplicates()
+    index = pd.MultiIndex.from_frame(
+        restarts.merge(pd.DataFrame({"phase": phases}), how="cross")
+    )
+
+    # Count passes per team, restart type, phase, pass category and outcome in one pass
+    counts = chains_df.assign(
+        completed=chains_df["pass_outcome"].isna().map({True: "completed", False: "incomplete"})
+    ).groupby(
+        ["team", "restart_type", "phase", "pass_category", "completed"], observed=True
+    ).size().unstack(["completed", "pass_category"], fill_value=0)
+
+    counts = counts.reindex(
+        index=index,
+        columns=pd.MultiIndex.from_product([["completed", "incomplete"], categories]),
+        fill_value=0,
+    )
+
+    completed = counts["completed"]
+    incomplete = counts["incomplete"]
+    category_total = completed + incomplete
+    total = category_total.sum(axis=1)
+
+    # Create DataFrame
+    result_df = pd.DataFrame({"total": total}, index=index)
+
+    for category in categories:
+        result_df[category] = category_total[category]
+        result_df[f"{category}_pct"] = (category_total[category] / total).fillna(0).mul(100).round(0)
+
+    for category in categories:
+        result_df[f"completed_{category}"] = completed[category]
+        result_df[f"incomplete_{category}"] = incomplete[category]
+        result_df[f"completed_{category}_pct"] = (completed[category] / category_total[category]).fillna(0).mul(100).round(0)
+        result_df[f"incomplete_{category}_pct"] = (incomplete[category] / category_total[category]).fillna(0).mul(100).round(0)
+
+    # Convert all count and percentage columns to int
+    result_df = result_df.astype(int)
+
+    return result_df.reset_index()
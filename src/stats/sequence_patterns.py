@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Optional
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def calculate_frequent_sequences(
+    sequences_df: pd.DataFrame,
+    min_count: Optional[int] = None,
+    max_length: Optional[int] = None,
+    min_length: int = 2,
+) -> pd.DataFrame:
+    """
+    Count the frequent token n-grams (consecutive actions within a possession) per team.
+
+    N-grams are grown level by level: an n-gram is only extended if it occurs at least
+    ``min_count`` times for its team, so infrequent prefixes are pruned with all their
+    extensions and memory stays bounded by the frequent patterns. Every n-gram is encoded as
+    one integer (base = vocabulary size), so counting a level is a single ``np.unique``.
+
+    Parameters:
+    ----------
+    sequences_df: pd.DataFrame
+        The possession sequences (from ``transform_to_possession_sequences``).
+    min_count: Optional[int]
+        The minimum number of occurrences per team, by default the value from the config.
+    max_length: Optional[int]
+        The longest n-gram to count, by default the value from the config.
+    min_length: int
+        The shortest n-gram to return.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The team, length, pattern, count and the number of occurrences that end in a shot or
+        a box entry of every frequent n-gram, most frequent first.
+    """
+
+    min_count = min_count or config.sequences.min_count
+    max_length = max_length or config.sequences.max_length
+
+    df = sequences_df.sort_values(["match_id", "possession", "step"], kind="stable")
+
+    logger.info(f"Mining frequent sequences of up to {max_length} actions in {len(df)} actions.")
+
+    tokens = df["token"].to_numpy(dtype=np.int64)
+    vocabulary_size = int(tokens.max()) + 1 if len(tokens) else 1
+    team_codes, teams = pd.factorize(df["team"])
+    is_shot = df["is_shot"].to_numpy(dtype=bool)
+    is_box_entry = df["is_box_entry"].to_numpy(dtype=bool)
+
+    # Position of the last action of the possession of every action
+    match = df["match_id"].to_numpy()
+    possession = df["possession"].to_numpy()
+    new_possession = np.ones(len(df), dtype=bool)
+    new_possession[1:] = (match[1:] != match[:-1]) | (possession[1:] != possession[:-1])
+    possession_end = np.append(np.flatnonzero(new_possession)[1:] - 1, len(df) - 1)[np.cumsum(new_possession) - 1]
+
+    # Longest n-gram whose code fits in int64
+    max_length = min(max_length, int(np.log(np.iinfo(np.int64).max) // np.log(max(vocabulary_size, 2))))
+
+    # Level 1: every action starts a 1-gram
+    starts = np.arange(len(df))
+    codes = tokens.copy()
+    labels = df["label"].to_numpy()
+    patterns = []
+
+    for length in range(1, max_length + 1):
+        if length > 1:
+            # Extend the surviving n-grams that don't end at the end of their possession
+            extendable = starts + length - 1 <= possession_end[starts]
+            starts = starts[extendable]
+            codes = codes[extendable] * vocabulary_size + tokens[starts + length - 1]
+
+        if len(starts) == 0:
+            break
+
+        # Count every (team, n-gram) at once
+        keys = np.stack([team_codes[starts], codes], axis=1)
+        unique_keys, first, inverse, counts = np.unique(keys, axis=0, return_index=True, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+
+        # Prune infrequent n-grams (and so all their extensions)
+        frequent = counts >= min_count
+        keep = frequent[inverse]
+
+        if length >= min_length and frequent.any():
+            ends = starts + length - 1
+            frequent_index = np.flatnonzero(frequent)
+            occurrences = starts[first[frequent_index]]
+
+            patterns.append(pd.DataFrame({
+                "team": teams[unique_keys[frequent_index, 0]],
+                "length": length,
+                "pattern": [" > ".join(labels[start:start + length]) for start in occurrences],
+                "count": counts[frequent_index],
+                "ends_in_shot": np.bincount(inverse, weights=is_shot[ends], minlength=len(counts))[frequent_index].astype(int),
+                "ends_in_box_entry": np.bincount(inverse, weights=is_box_entry[ends], minlength=len(counts))[frequent_index].astype(int),
+            }))
+
+        starts = starts[keep]
+        codes = codes[keep]
+
+    cols = ["team", "length", "pattern", "count", "ends_in_shot", "ends_in_box_entry"]
+
+    if not patterns:
+        return pd.DataFrame(columns=cols)
+
+    patterns_df = pd.concat(patterns, ignore_index=True)
+
+    logger.info(f"Found {len(patterns_df)} frequent sequences.")
+
+    return patterns_df.sort_values(["team", "count", "length"], ascending=[True, False, False]).reset_index(drop=True)[cols]
@@ -1,17 +1,27 @@
 import pandas as pd
+import numpy as np
 import logging
+import warnings
+from typing import Iterable, Optional, Union
+
+from src.config import config
+from src.extract.normalized_events import NormalizedEvents
+from src.stats.partials import combine_partials
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
-def calculate_shots_stats(df: pd.DataFrame) -> pd.DataFrame:
+SHOTS_PARTIALS = ["shots_from_set_piece", "shots_from_open_play", "xg_from_set_piece", "xg_from_open_play"]
+
+def calculate_shots_stats(df: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> pd.DataFrame:
     """
     Calculate the statistics for the shots.
 
     Parameters:
     ----------
-    df: pd.DataFrame
-        The shots dataframe.
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        The shots dataframe, or an iterator of per-match shots dataframes (e.g. from a
+        streamed ``transform_to_shot_events``).
 
     Returns:
     --------
@@ -21,24 +31,74 @@ def calculate_shots_stats(df: pd.DataFrame) -> pd.DataFrame:
 
     logger.info(f"Calculating statistics for shots.")
 
+    if isinstance(df, pd.DataFrame):
+        partials = calculate_shots_partials(df)
+    else:
+        partials = combine_partials((calculate_shots_partials(match_df) for match_df in df), columns=SHOTS_PARTIALS)
+
+    return finalize_shots_stats(partials)
+
+def calculate_shots_partials(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the additive shot counts and xG sums per team.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The shots dataframe.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The shot counts and xG sums from set piece and open play, indexed by team.
+    """
+
     # Get all teams first
     all_teams = df["team"].unique()
 
     # Shots from set piece or open play
     shots_from_set_piece = df[df["shot_from_set_piece"]].groupby("team").size().reindex(all_teams, fill_value=0)
     shots_from_open_play = df[~df["shot_from_set_piece"]].groupby("team").size().reindex(all_teams, fill_value=0)
-    shots_from_set_piece_percentage = (shots_from_set_piece / (shots_from_set_piece + shots_from_open_play)).fillna(0) * 100
-    shots_from_open_play_percentage = (shots_from_open_play / (shots_from_set_piece + shots_from_open_play)).fillna(0) * 100
 
     # xG from set piece or open play
     xg_from_set_piece = df[df["shot_from_set_piece"]].groupby("team")["shot_statsbomb_xg"].sum().reindex(all_teams, fill_value=0)
     xg_from_open_play = df[~df["shot_from_set_piece"]].groupby("team")["shot_statsbomb_xg"].sum().reindex(all_teams, fill_value=0)
+
+    return pd.DataFrame({
+        "shots_from_set_piece": shots_from_set_piece,
+        "shots_from_open_play": shots_from_open_play,
+        "xg_from_set_piece": xg_from_set_piece,
+        "xg_from_open_play": xg_from_open_play,
+    }, index=pd.Index(all_teams, name="team"))
+
+def finalize_shots_stats(partials: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the shot statistics from (combined) shot partials.
+
+    Parameters:
+    ----------
+    partials: pd.DataFrame
+        The shot partials, indexed by team.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The statistics for the shots.
+    """
+
+    shots_from_set_piece = partials["shots_from_set_piece"]
+    shots_from_open_play = partials["shots_from_open_play"]
+    shots_from_set_piece_percentage = (shots_from_set_piece / (shots_from_set_piece + shots_from_open_play)).fillna(0) * 100
+    shots_from_open_play_percentage = (shots_from_open_play / (shots_from_set_piece + shots_from_open_play)).fillna(0) * 100
+
+    xg_from_set_piece = partials["xg_from_set_piece"]
+    xg_from_open_play = partials["xg_from_open_play"]
     xg_from_set_piece_percentage = (xg_from_set_piece / (xg_from_set_piece + xg_from_open_play)).fillna(0) * 100
     xg_from_open_play_percentage = (xg_from_open_play / (xg_from_set_piece + xg_from_open_play)).fillna(0) * 100
 
     # Create DataFrame
     result_df = pd.DataFrame({
-        "team": all_teams,
+        "team": partials.index,
         "shots_from_set_piece": shots_from_set_piece,
         "shots_from_open_play": shots_from_open_play,
         "shots_from_set_piece_percentage": shots_from_set_piece_percentage,
@@ -49,4 +109,107 @@ def calculate_shots_stats(df: pd.DataFrame) -> pd.DataFrame:
         "xg_from_open_play_percentage": xg_from_open_play_percentage
     })
 
-    return result_df.reset_index(drop=True)
\ No newline at end of file
+    return result_df.reset_index(drop=True)
+
+def calculate_shots_confidence_intervals(
+    df: pd.DataFrame,
+    events_df: Union[pd.DataFrame, NormalizedEvents],
+    n_resamples: Optional[int] = None,
+    confidence_level: Optional[float] = None,
+    random_state: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Calculate bootstrap confidence intervals for the set piece and open play shot and xG shares.
+
+    Matches are resampled with replacement per team, from all matches the team played (also
+    the ones without shots). All teams and resamples are drawn and aggregated in one batched
+    NumPy operation. Resamples without shots (or xG) have no share and are left out of the
+    intervals.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The shots dataframe.
+    events_df: Union[pd.DataFrame, NormalizedEvents]
+        The events data (or any frame with the team and match_id of every team in every match
+        it played), to find the matches of every team.
+    n_resamples: Optional[int]
+        The number of bootstrap resamples, by default the value from the config.
+    confidence_level: Optional[float]
+        The confidence level of the intervals, by default the value from the config.
+    random_state: Optional[int]
+        The seed of the random generator, by default the value from the config.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The lower and upper bounds of the shot and xG percentages per team.
+    """
+
+    n_resamples = n_resamples or config.bootstrap.n_resamples
+    confidence_level = confidence_level or config.bootstrap.confidence_level
+    random_state = random_state if random_state is not None else config.bootstrap.random_state
+
+    logger.info(f"Calculating {confidence_level:.0%} confidence intervals for shots with {n_resamples} resamples.")
+
+    # Totals per team and match
+    set_piece = df["shot_from_set_piece"].to_numpy(dtype=bool)
+    xg = df["shot_statsbomb_xg"].fillna(0).to_numpy(dtype=float)
+    match_totals = pd.DataFrame({
+        "team": df["team"].to_numpy(),
+        "match_id": df["match_id"].to_numpy(),
+        "shots_from_set_piece": set_piece.astype(float),
+        "shots_from_open_play": (~set_piece).astype(float),
+        "xg_from_set_piece": np.where(set_piece, xg, 0),
+        "xg_from_open_play": np.where(set_piece, 0, xg),
+    }).groupby(["team", "match_id"], sort=False).sum()
+
+    # Every match of every team, with zero totals for matches without shots
+    events_df = events_df.core if isinstance(events_df, NormalizedEvents) else events_df
+    team_matches = pd.MultiIndex.from_frame(events_df[["team", "match_id"]].dropna().drop_duplicates())
+    match_totals = match_totals.reindex(team_matches.union(match_totals.index, sort=False), fill_value=0)
+
+    # Dense (team, match slot, metric) array, padded for teams with fewer matches
+    team_codes, all_teams = pd.factorize(match_totals.index.get_level_values("team"))
+    match_slots = match_totals.groupby(level="team", sort=False).cumcount().to_numpy()
+    n_matches = np.bincount(team_codes)
+    max_matches = n_matches.max()
+
+    values = np.zeros((len(all_teams), max_matches, match_totals.shape[1]))
+    values[team_codes, match_slots] = match_totals.to_numpy()
+
+    # Draw n_matches matches with replacement for every team and resample: (team, resample, slot)
+    rng = np.random.default_rng(random_state)
+    draws = (rng.random((len(all_teams), n_resamples, max_matches)) * n_matches[:, None, None]).astype(np.int64)
+    valid = np.arange(max_matches)[None, None, :] < n_matches[:, None, None]
+    flat_draws = np.arange(len(all_teams))[:, None, None] * max_matches + draws
+
+    # Resampled totals: (team, resample, metric)
+    totals = np.einsum(
+        "tbsm,tbs->tbm",
+        values.reshape(-1, values.shape[2])[flat_draws],
+        valid.astype(float),
+    )
+
+    # Shares per resample (NaN if a team has no shots or xG in a resample)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shots_total = totals[..., 0] + totals[..., 1]
+        xg_total = totals[..., 2] + totals[..., 3]
+        shares = {
+            "shots_from_set_piece_percentage": totals[..., 0] / shots_total * 100,
+            "shots_from_open_play_percentage": totals[..., 1] / shots_total * 100,
+            "xg_from_set_piece_percentage": totals[..., 2] / xg_total * 100,
+            "xg_from_open_play_percentage": totals[..., 3] / xg_total * 100,
+        }
+
+    # Percentile intervals over the resamples with a share (NaN for teams without shots)
+    alpha = (1 - confidence_level) / 2
+    result_df = pd.DataFrame({"team": all_teams})
+    for name, share in shares.items():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            lower, upper = np.nanpercentile(share, [alpha * 100, (1 - alpha) * 100], axis=1)
+        result_df[f"{name}_lower"] = lower
+        result_df[f"{name}_upper"] = upper
+
+    return result_df
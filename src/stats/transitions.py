@@ -0,0 +1,75 @@
+import pandas as pd
+import numpy as np
+import logging
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def calculate_transition_stats(
+    transitions_df: pd.DataFrame,
+    open_play_only: bool = True,
+) -> pd.DataFrame:
+    """
+    Calculate what teams do after winning the ball and what they concede after losing it.
+
+    Parameters:
+    ----------
+    transitions_df: pd.DataFrame
+        The transitions (from ``transform_to_transitions``).
+    open_play_only: bool
+        Only count transitions where the ball is won in open play, not possessions that start
+        from a restart (goal kick, throw-in, kick off, ...).
+
+    Returns:
+    --------
+    pd.DataFrame
+        Per team, after regains: the share of transitions with a shot, a box entry or kept
+        possession, the xG and the median time to shot. After turnovers (as the opponent): the
+        share with a shot or box entry against and the xG conceded.
+    """
+
+    logger.info(f"Calculating transition stats for {len(transitions_df)} transitions.")
+
+    if open_play_only:
+        transitions_df = transitions_df[transitions_df["open_play"]]
+
+    df = transitions_df.assign(
+        with_shot=transitions_df["team_shots"] > 0,
+        with_box_entry=transitions_df["team_box_entries"] > 0,
+    )
+
+    # After regains (team won the ball)
+    regains_df = df.groupby("team").agg(
+        regains=("possession", "size"),
+        regains_with_shot=("with_shot", "sum"),
+        regains_with_box_entry=("with_box_entry", "sum"),
+        regains_kept_possession=("kept_possession", "sum"),
+        xg_after_regains=("team_xg", "sum"),
+        median_time_to_shot=("time_to_shot", "median"),
+    )
+
+    # After turnovers (team lost the ball, the other team's outcomes count against it)
+    turnovers_df = df.groupby("opponent").agg(
+        turnovers=("possession", "size"),
+        turnovers_with_shot_against=("with_shot", "sum"),
+        turnovers_with_box_entry_against=("with_box_entry", "sum"),
+        xg_against_after_turnovers=("team_xg", "sum"),
+    ).rename_axis("team")
+
+    all_teams = np.union1d(regains_df.index, turnovers_df.index)
+    stats_df = regains_df.reindex(all_teams).join(turnovers_df.reindex(all_teams))
+
+    count_cols = [col for col in stats_df.columns if col not in ("xg_after_regains", "xg_against_after_turnovers", "median_time_to_shot")]
+    stats_df[count_cols] = stats_df[count_cols].fillna(0).astype(int)
+    stats_df[["xg_after_regains", "xg_against_after_turnovers"]] = stats_df[["xg_after_regains", "xg_against_after_turnovers"]].fillna(0)
+
+    # Percentages
+    regains = stats_df["regains"].replace(0, np.nan)
+    turnovers = stats_df["turnovers"].replace(0, np.nan)
+    stats_df["regains_with_shot_pct"] = (stats_df["regains_with_shot"] / regains * 100).round(0)
+    stats_df["regains_with_box_entry_pct"] = (stats_df["regains_with_box_entry"] / regains * 100).round(0)
+    stats_df["regains_kept_possession_pct"] = (stats_df["regains_kept_possession"] / regains * 100).round(0)
+    stats_df["turnovers_with_shot_against_pct"] = (stats_df["turnovers_with_shot_against"] / turnovers * 100).round(0)
+    stats_df["turnovers_with_box_entry_against_pct"] = (stats_df["turnovers_with_box_entry_against"] / turnovers * 100).round(0)
+
+    return stats_df.rename_axis("team").reset_index()
@@ -0,0 +1,371 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config import config
+from src.extract.normalized_events import NormalizedEvents, as_events_frame
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class XTGrid:
+    """
+    Expected threat (xT) value of every pitch zone.
+
+    Attributes:
+    ----------
+    values: np.ndarray
+        The xT of every zone (n_x, n_y), zone (i, j) covers x in [i, i + 1] * 120 / n_x and y in [j, j + 1] * 80 / n_y.
+    shot_probability: np.ndarray
+        The probability of a shot from every zone.
+    move_probability: np.ndarray
+        The probability of a move (pass or carry) from every zone.
+    goal_probability: np.ndarray
+        The probability that a shot from every zone is scored.
+    transition_matrix: np.ndarray
+        The probability that a move from zone a ends successfully in zone b (n_x * n_y, n_x * n_y).
+    n_iterations: int
+        The number of value iterations until convergence.
+    fingerprint: str
+        The fingerprint of the events the grid was fitted on (see ``xt_fingerprint``).
+    """
+
+    values: np.ndarray
+    shot_probability: np.ndarray
+    move_probability: np.ndarray
+    goal_probability: np.ndarray
+    transition_matrix: np.ndarray
+    n_iterations: int
+    fingerprint: str = ""
+
+    @property
+    def shape(self):
+        """Number of zones along the length and width of the pitch."""
+        return self.values.shape
+
+    def value(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Look up the xT of locations.
+
+        Parameters:
+        ----------
+        x: np.ndarray
+            The x coordinates (0-120).
+        y: np.ndarray
+            The y coordinates (0-80).
+
+        Returns:
+        --------
+        np.ndarray
+            The xT of the zone of every location (NaN for missing locations).
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = np.isfinite(x) & np.isfinite(y)
+
+        result = np.full(len(x), np.nan)
+        result[valid] = self.values.ravel()[_zone_index(x[valid], y[valid], self.shape)]
+        return result
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the grid to an .npz file.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The file to save the grid to.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        np.savez(
+            path,
+            values=self.values,
+            shot_probability=self.shot_probability,
+            move_probability=self.move_probability,
+            goal_probability=self.goal_probability,
+            transition_matrix=self.transition_matrix,
+            n_iterations=self.n_iterations,
+            fingerprint=self.fingerprint,
+        )
+
+        logger.info(f"Saved xT grid to {path}.")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "XTGrid":
+        """
+        Load a grid saved with ``XTGrid.save``.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The file the grid was saved to.
+
+        Returns:
+        --------
+        XTGrid
+            The loaded grid.
+        """
+        with np.load(path) as data:
+            return cls(
+                values=data["values"],
+                shot_probability=data["shot_probability"],
+                move_probability=data["move_probability"],
+                goal_probability=data["goal_probability"],
+                transition_matrix=data["transition_matrix"],
+                n_iterations=int(data["n_iterations"]),
+                fingerprint=str(data["fingerprint"]) if "fingerprint" in data else "",
+            )
+
+def fit_xt_grid(
+    events_df: pd.DataFrame,
+    n_x: Optional[int] = None,
+    n_y: Optional[int] = None,
+) -> XTGrid:
+    """
+    Fit the expected threat grid on passes, carries and shots.
+
+    Per zone, the shot, move and goal probabilities and the transition matrix of successful
+    moves are counted at once. The values are then found by value iteration
+    ``xT = P(shot) * P(goal) + P(move) * T @ xT`` until the largest change is below the
+    tolerance from the config.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The events data.
+    n_x: Optional[int]
+        The number of zones along the length of the pitch, by default the value from the config.
+    n_y: Optional[int]
+        The number of zones along the width of the pitch, by default the value from the config.
+
+    Returns:
+    --------
+    XTGrid
+        The fitted grid.
+    """
+    shape = (n_x or config.xt.n_x, n_y or config.xt.n_y)
+    n_zones = shape[0] * shape[1]
+
+    # Fingerprint of the input as given, before the event types are selected
+    fingerprint = xt_fingerprint(events_df)
+    events_df = as_events_frame(events_df, types=["Pass", "Carry", "Shot"], tables=["pass", "carry", "shot"])
+
+    logger.info(f"Fitting {shape[0]}x{shape[1]} xT grid on {len(events_df)} events.")
+
+    # Shots (without penalties) and moves
+    shots_df = events_df[(events_df["type"] == "Shot") & (events_df["shot_type"] != "Penalty")]
+    moves_df = _moves(events_df)
+
+    shot_zone = _zone_index(*_split(shots_df["location"]), shape)
+    goals = (shots_df["shot_outcome"] == "Goal").to_numpy()
+    move_zone = _zone_index(moves_df["x"].to_numpy(), moves_df["y"].to_numpy(), shape)
+
+    # Counts per zone
+    shot_count = np.bincount(shot_zone, minlength=n_zones)
+    goal_count = np.bincount(shot_zone[goals], minlength=n_zones)
+    move_count = np.bincount(move_zone, minlength=n_zones)
+    action_count = shot_count + move_count
+
+    shot_probability = np.divide(shot_count, action_count, out=np.zeros(n_zones), where=action_count > 0)
+    move_probability = np.divide(move_count, action_count, out=np.zeros(n_zones), where=action_count > 0)
+    goal_probability = np.divide(goal_count, shot_count, out=np.zeros(n_zones), where=shot_count > 0)
+
+    # Transition matrix of successful moves (start zone -> end zone)
+    successful = moves_df["successful"].to_numpy()
+    end_zone = _zone_index(moves_df["end_x"].to_numpy()[successful], moves_df["end_y"].to_numpy()[successful], shape)
+    transitions = np.bincount(move_zone[successful] * n_zones + end_zone, minlength=n_zones * n_zones).reshape(n_zones, n_zones)
+    transition_matrix = np.divide(transitions, move_count[:, None], out=np.zeros((n_zones, n_zones)), where=move_count[:, None] > 0)
+
+    # Value iteration
+    scoring = shot_probability * goal_probability
+    values = np.zeros(n_zones)
+
+    for n_iterations in range(1, config.xt.max_iterations + 1):
+        new_values = scoring + move_probability * (transition_matrix @ values)
+        converged = np.max(np.abs(new_values - values)) < config.xt.tolerance
+        values = new_values
+        if converged:
+            break
+
+    logger.info(f"Fitted xT grid in {n_iterations} iterations (max xT {values.max():.3f}).")
+
+    return XTGrid(
+        values=values.reshape(shape),
+        shot_probability=shot_probability.reshape(shape),
+        move_probability=move_probability.reshape(shape),
+        goal_probability=goal_probability.reshape(shape),
+        transition_matrix=transition_matrix,
+        n_iterations=n_iterations,
+        fingerprint=fingerprint,
+    )
+
+def get_xt_grid(
+    events_df: Optional[pd.DataFrame] = None,
+    path: Optional[Union[str, Path]] = None,
+    refit: bool = False,
+    n_x: Optional[int] = None,
+    n_y: Optional[int] = None,
+) -> XTGrid:
+    """
+    Get the cached xT grid, fitting and caching it if it doesn't exist yet.
+
+    The cached grid is only used if it has the requested shape and, when events data is
+    given, was fitted on the same events (same fingerprint); otherwise it is refitted.
+
+    Parameters:
+    ----------
+    events_df: Optional[pd.DataFrame]
+        The events data the grid is (or should be) fitted on.
+    path: Optional[Union[str, Path]]
+        The cache file, by default the file from the config.
+    refit: bool
+        Refit the grid even if it is cached.
+    n_x: Optional[int]
+        The number of zones along the length of the pitch, by default the value from the config.
+    n_y: Optional[int]
+        The number of zones along the width of the pitch, by default the value from the config.
+
+    Returns:
+    --------
+    XTGrid
+        The xT grid.
+    """
+    path = Path(path or config.xt.cache_file)
+    shape = (n_x or config.xt.n_x, n_y or config.xt.n_y)
+
+    if path.exists() and not refit:
+        grid = XTGrid.load(path)
+
+        if grid.shape != shape:
+            logger.info(f"Cached xT grid at {path} has shape {grid.shape}, not {shape}.")
+        elif events_df is not None and grid.fingerprint != xt_fingerprint(events_df):
+            logger.info(f"Cached xT grid at {path} was fitted on other events data.")
+        else:
+            return grid
+
+    if events_df is None:
+        raise ValueError(f"No {shape[0]}x{shape[1]} xT grid cached at {path}, events data is needed to fit it.")
+
+    grid = fit_xt_grid(events_df, n_x=shape[0], n_y=shape[1])
+    grid.save(path)
+
+    return grid
+
+def xt_fingerprint(events_df: Union[pd.DataFrame, NormalizedEvents]) -> str:
+    """
+    Fingerprint of the events data an xT grid is fitted on: a hash of the match ids and the number of events.
+
+    Parameters:
+    ----------
+    events_df: Union[pd.DataFrame, NormalizedEvents]
+        The events data.
+
+    Returns:
+    --------
+    str
+        The fingerprint.
+    """
+    # Normalized events only need their core table
+    events_df = events_df.core if isinstance(events_df, NormalizedEvents) else events_df
+    match_ids = np.unique(events_df["match_id"].to_numpy(dtype=np.int64))
+
+    digest = hashlib.sha1(match_ids.tobytes())
+    digest.update(str(len(events_df)).encode())
+
+    return digest.hexdigest()
+
+def calculate_xt_added(
+    df: pd.DataFrame,
+    grid: XTGrid,
+) -> pd.DataFrame:
+    """
+    Score the xT added by every move: the xT of the end zone minus the xT of the start zone.
+
+    Only successful moves add (or lose) threat; moves with a ``pass_outcome`` get 0.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The moves to score, with x, y, end_x and end_y columns (e.g. progressive actions).
+    grid: XTGrid
+        The xT grid.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The moves with xt_start, xt_end and xt_added columns.
+    """
+    df = df.copy()
+
+    df["xt_start"] = grid.value(df["x"].to_numpy(), df["y"].to_numpy())
+    df["xt_end"] = grid.value(df["end_x"].to_numpy(), df["end_y"].to_numpy())
+    df["xt_added"] = df["xt_end"] - df["xt_start"]
+
+    if "pass_outcome" in df:
+        df.loc[df["pass_outcome"].notna(), "xt_added"] = 0.0
+
+    return df
+
+def calculate_xt_rankings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rank players by the total xT added by their moves.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The moves scored with ``calculate_xt_added``.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The number of moves, total and average xT added of every player, highest total first.
+    """
+    rankings_df = df.groupby(["team", "player"]).agg(
+        actions=("xt_added", "size"),
+        xt_added=("xt_added", "sum"),
+    ).reset_index()
+
+    rankings_df["xt_added_per_action"] = rankings_df["xt_added"] / rankings_df["actions"]
+
+    return rankings_df.sort_values("xt_added", ascending=False).reset_index(drop=True)
+
+def _moves(events_df: pd.DataFrame) -> pd.DataFrame:
+    """Passes and carries with their start and end locations and whether they were successful."""
+    moves_df = events_df[events_df["type"].isin(["Pass", "Carry"])]
+    is_carry = (moves_df["type"] == "Carry").to_numpy()
+
+    x, y = _split(moves_df["location"])
+    end_x, end_y = _split(moves_df["carry_end_location"].where(is_carry, moves_df["pass_end_location"]))
+
+    return pd.DataFrame({
+        "x": x,
+        "y": y,
+        "end_x": end_x,
+        "end_y": end_y,
+        "successful": (is_carry | moves_df["pass_outcome"].isna().to_numpy()) & np.isfinite(end_x),
+    })
+
+def _split(locations: pd.Series):
+    """Split a column of location lists into x and y arrays (NaN where missing)."""
+    xy = np.full((len(locations), 2), np.nan)
+    valid = locations.map(lambda location: isinstance(location, (list, tuple, np.ndarray))).to_numpy(dtype=bool)
+
+    if valid.any():
+        xy[valid] = np.array([location[:2] for location in locations[valid]], dtype=float)
+
+    return xy[:, 0], xy[:, 1]
+
+def _zone_index(x: np.ndarray, y: np.ndarray, shape) -> np.ndarray:
+    """Flat zone index of locations on a (n_x, n_y) grid."""
+    n_x, n_y = shape
+    x_zone = np.clip((np.nan_to_num(x) / 120 * n_x).astype(np.int64), 0, n_x - 1)
+    y_zone = np.clip((np.nan_to_num(y) / 80 * n_y).astype(np.int64), 0, n_y - 1)
+    return x_zone * n_y + y_zone
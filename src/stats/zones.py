@@ -0,0 +1,67 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Optional, Sequence
+
+from src.config import config
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+
+def calculate_zone_counts(
+    df: pd.DataFrame,
+    x_bins: Optional[Sequence[float]] = None,
+    y_bins: Optional[Sequence[float]] = None,
+) -> pd.DataFrame:
+    """
+    Count events per team and pitch zone.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events to count, with x and y columns (e.g. progressive actions or turnovers).
+    x_bins: Optional[Sequence[float]]
+        The zone edges along the pitch length, by default the custom zones from the config.
+    y_bins: Optional[Sequence[float]]
+        The zone edges along the pitch width, by default the custom zones from the config.
+
+    Returns:
+    --------
+    pd.DataFrame: The number of events per team and zone (every zone is included for every team).
+    """
+
+    x_bins = np.asarray(x_bins if x_bins is not None else config.zones.x_bins, dtype=float)
+    y_bins = np.asarray(y_bins if y_bins is not None else config.zones.y_bins, dtype=float)
+
+    logger.info(f"Counting {len(df)} events in {(len(x_bins) - 1) * (len(y_bins) - 1)} zones.")
+
+    x = df["x"].to_numpy(dtype=float)
+    y = df["y"].to_numpy(dtype=float)
+
+    # Zone of every event (events on the last edge belong to the last zone)
+    x_zone = np.clip(np.searchsorted(x_bins, x, side="right") - 1, 0, len(x_bins) - 2)
+    y_zone = np.clip(np.searchsorted(y_bins, y, side="right") - 1, 0, len(y_bins) - 2)
+    on_pitch = (x >= x_bins[0]) & (x <= x_bins[-1]) & (y >= y_bins[0]) & (y <= y_bins[-1])
+
+    # Count per team and zone
+    all_teams = df["team"].unique()
+    counts = pd.DataFrame({
+        "team": df["team"].to_numpy()[on_pitch],
+        "x_zone": x_zone[on_pitch],
+        "y_zone": y_zone[on_pitch],
+    }).groupby(["team", "x_zone", "y_zone"]).size()
+
+    index = pd.MultiIndex.from_product(
+        [all_teams, range(len(x_bins) - 1), range(len(y_bins) - 1)],
+        names=["team", "x_zone", "y_zone"],
+    )
+    result_df = counts.reindex(index, fill_value=0).rename("count").reset_index()
+
+    # Zone edges
+    result_df["x_start"] = x_bins[result_df["x_zone"]]
+    result_df["x_end"] = x_bins[result_df["x_zone"] + 1]
+    result_df["y_start"] = y_bins[result_df["y_zone"]]
+    result_df["y_end"] = y_bins[result_df["y_zone"] + 1]
+
+    return result_df[["team", "x_zone", "y_zone", "x_start", "x_end", "y_start", "y_end", "count"]]
@@ -1,8 +1,17 @@
 from .build_up_events import transform_to_build_up_events
 from .progression_events import transform_to_progressive_actions, transform_to_turnovers
 from .shot_events import transform_to_shot_events
+from .shot_geometry import freeze_frames_from_shots, transform_to_shot_geometry
 from .box_entry_events import transform_to_box_entry_events
-from .box_entry_clusters import transform_to_box_entry_clusters
+from .box_entry_clusters import transform_to_box_entry_clusters, select_n_clusters, sweep_box_entry_clusters
+from .restart_chains import transform_to_restart_chains
+from .pass_networks import PassNetworks, build_pass_networks
+from .possession_sequences import transform_to_possession_sequences
+from .pressing_events import transform_to_pressing_events
+from .transitions import transform_to_transitions
+from .predicates import Predicate
+from .sequence_index import SequenceIndex
+from .streaming import streamable, concat_results
 
 __all__ = [
     # Build up events
@@ -14,8 +23,38 @@ __all__ = [
 
     # Shot events
     "transform_to_shot_events",
+    "freeze_frames_from_shots",
+    "transform_to_shot_geometry",
 
     # Box entry events
     "transform_to_box_entry_events",
     "transform_to_box_entry_clusters",
+    "select_n_clusters",
+    "sweep_box_entry_clusters",
+
+    # Restart chains
+    "transform_to_restart_chains",
+
+    # Pass networks
+    "PassNetworks",
+    "build_pass_networks",
+
+    # Possession sequences
+    "transform_to_possession_sequences",
+
+    # Pressing events
+    "transform_to_pressing_events",
+
+    # Transitions
+    "transform_to_transitions",
+
+    # Predicates
+    "Predicate",
+
+    # Sequence index
+    "SequenceIndex",
+
+    # Streaming
+    "streamable",
+    "concat_results",
 ]
\ No newline at end of file
@@ -1,12 +1,25 @@
 import pandas as pd
 import numpy as np
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Tuple, Union
 from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+from src.config import config
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
-def transform_to_box_entry_clusters(df: pd.DataFrame) -> pd.DataFrame:
+# Sweep diagnostics by (points hash, k range, seeds), shared by the transform and the sweep
+_sweep_cache: Dict[Tuple, pd.DataFrame] = {}
+
+def transform_to_box_entry_clusters(
+    df: pd.DataFrame,
+    n_clusters: Optional[Union[int, str]] = None,
+) -> pd.DataFrame:
     """
     Transform box entry events to box entry clusters.
 
@@ -14,6 +27,8 @@ def transform_to_box_entry_clusters(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df: pd.DataFrame
         The box entry events data to transform.
+    n_clusters: Optional[Union[int, str]]
+        The number of clusters, or "auto" to select it with ``select_n_clusters``, by default the value from the config.
 
     Returns:
     --------
@@ -22,11 +37,15 @@ def transform_to_box_entry_clusters(df: pd.DataFrame) -> pd.DataFrame:
     """
 
     df = df.copy()
+    n_clusters = n_clusters or config.clustering.n_clusters
 
-    logger.info(f"Transforming {len(df)} records from box entry events data to box entry clusters.")
+    if n_clusters == "auto":
+        n_clusters, _ = select_n_clusters(df)
 
-    # Calculate clusters (would take )
-    kmeans = KMeans(n_clusters=5, random_state=42)
+    logger.info("Transforming %d records from box entry events data to %d box entry clusters.", len(df), n_clusters)
+
+    # Calculate clusters
+    kmeans = KMeans(n_clusters=n_clusters, random_state=config.clustering.random_state)
     df["cluster"] = kmeans.fit_predict(df[["x", "y"]])
 
     # Create clusters dataframe
@@ -38,6 +57,181 @@ def transform_to_box_entry_clusters(df: pd.DataFrame) -> pd.DataFrame:
         "id": "count",
     }).reset_index()
 
-    logger.info(f"Transformed box entries into {len(clusters_df)} clusters.")
-    
-    return clusters_df
\ No newline at end of file
+    logger.info("Transformed box entries into %d clusters.", len(clusters_df))
+
+    return clusters_df
+
+def select_n_clusters(
+    df: pd.DataFrame,
+    k_range: Optional[Iterable[int]] = None,
+    seeds: Optional[Iterable[int]] = None,
+) -> Tuple[int, pd.DataFrame]:
+    """
+    Select the number of clusters for box entry events.
+
+    Every k is fitted once per seed. The selected k has the highest mean silhouette score among
+    the stable k's (mean pairwise adjusted Rand index between seeds of at least the configured
+    minimum stability), or among all k's if none is stable. The inertia elbow is reported as a
+    diagnostic. The sweep is cached on the event locations.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The box entry events data.
+    k_range: Optional[Iterable[int]]
+        The numbers of clusters to try, by default the range from the config.
+    seeds: Optional[Iterable[int]]
+        The random states to fit every k with, by default the seeds from the config.
+
+    Returns:
+    --------
+    n_clusters: int
+        The selected number of clusters.
+    diagnostics_df: pd.DataFrame
+        The silhouette, inertia and stability of every k and the selected and elbow k.
+    """
+    k_range = tuple(k_range or config.clustering.k_range)
+    seeds = tuple(seeds or config.clustering.seeds)
+    points = df[["x", "y"]].to_numpy(dtype=float)
+
+    key = _cache_key(points, k_range, seeds)
+    if key not in _sweep_cache:
+        _sweep_cache[key] = _sweep_points(points, k_range, seeds)
+
+    diagnostics_df = _sweep_cache[key]
+
+    if len(diagnostics_df) == 0:
+        n_clusters = min(config.clustering.n_clusters, len(points))
+        logger.warning("Too few box entries (%d) to select the number of clusters, using %d.", len(points), n_clusters)
+        return n_clusters, diagnostics_df
+
+    return int(diagnostics_df.loc[diagnostics_df["selected"], "n_clusters"].iloc[0]), diagnostics_df
+
+def sweep_box_entry_clusters(
+    box_entries_df: pd.DataFrame,
+    k_range: Optional[Iterable[int]] = None,
+    seeds: Optional[Iterable[int]] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Run the k-selection sweep of ``select_n_clusters`` for every team and action type in parallel.
+
+    Results are added to the sweep cache, so ``transform_to_box_entry_clusters(df, "auto")``
+    doesn't refit the groups afterwards.
+
+    Parameters:
+    ----------
+    box_entries_df: pd.DataFrame
+        The box entry events data of all teams.
+    k_range: Optional[Iterable[int]]
+        The numbers of clusters to try, by default the range from the config.
+    seeds: Optional[Iterable[int]]
+        The random states to fit every k with, by default the seeds from the config.
+    max_workers: Optional[int]
+        The number of worker processes, by default the value from the config.
+
+    Returns:
+    --------
+    diagnostics_df: pd.DataFrame
+        The diagnostics of every team, action type and k.
+    """
+    k_range = tuple(k_range or config.clustering.k_range)
+    seeds = tuple(seeds or config.clustering.seeds)
+    max_workers = max_workers or config.parallel.max_workers
+
+    # Points and cache key of every team and action type
+    groups = {
+        (team, action_type): group_df[["x", "y"]].to_numpy(dtype=float)
+        for (team, action_type), group_df in box_entries_df.groupby(["team", "type"])
+    }
+    keys = {group: _cache_key(points, k_range, seeds) for group, points in groups.items()}
+    missing = [group for group, key in keys.items() if key not in _sweep_cache]
+
+    logger.info("Sweeping box entry clusters for %d groups (%d not cached).", len(groups), len(missing))
+
+    if missing:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                group: executor.submit(_sweep_points, groups[group], k_range, seeds)
+                for group in missing
+            }
+            for group, future in futures.items():
+                _sweep_cache[keys[group]] = future.result()
+
+    diagnostics = [
+        _sweep_cache[key].assign(team=team, type=action_type)
+        for (team, action_type), key in keys.items()
+    ]
+
+    if not diagnostics:
+        return pd.DataFrame()
+
+    diagnostics_df = pd.concat(diagnostics, ignore_index=True)
+    cols = ["team", "type"] + [col for col in diagnostics_df.columns if col not in ("team", "type")]
+
+    return diagnostics_df[cols]
+
+def _sweep_points(
+    points: np.ndarray,
+    k_range: Tuple[int, ...],
+    seeds: Tuple[int, ...],
+) -> pd.DataFrame:
+    """Fit every k with every seed and score silhouette, inertia and stability."""
+    # Silhouette needs 2 <= k <= n_samples - 1
+    k_range = [k for k in k_range if 2 <= k < len(points)]
+    rows = []
+
+    for k in k_range:
+        labels, silhouettes, inertias = [], [], []
+
+        for seed in seeds:
+            kmeans = KMeans(n_clusters=k, random_state=seed).fit(points)
+            labels.append(kmeans.labels_)
+            inertias.append(kmeans.inertia_)
+            silhouettes.append(
+                silhouette_score(points, kmeans.labels_) if len(np.unique(kmeans.labels_)) > 1 else -1.0
+            )
+
+        # Agreement between the labelings of all seed pairs
+        stability = np.mean([adjusted_rand_score(a, b) for a, b in combinations(labels, 2)]) if len(labels) > 1 else 1.0
+
+        rows.append({
+            "n_clusters": k,
+            "n_samples": len(points),
+            "silhouette": float(np.mean(silhouettes)),
+            "silhouette_std": float(np.std(silhouettes)),
+            "inertia": float(np.mean(inertias)),
+            "stability": float(stability),
+        })
+
+    diagnostics_df = pd.DataFrame(rows, columns=[
+        "n_clusters", "n_samples", "silhouette", "silhouette_std", "inertia", "stability",
+    ])
+
+    if len(diagnostics_df) == 0:
+        return diagnostics_df.assign(elbow=pd.Series(dtype=bool), selected=pd.Series(dtype=bool))
+
+    # Select the best silhouette among the stable k's
+    stable = diagnostics_df["stability"] >= config.clustering.min_stability
+    candidates = diagnostics_df[stable] if stable.any() else diagnostics_df
+    selected = candidates["silhouette"].idxmax()
+
+    diagnostics_df["elbow"] = diagnostics_df.index == _elbow_index(diagnostics_df["n_clusters"], diagnostics_df["inertia"])
+    diagnostics_df["selected"] = diagnostics_df.index == selected
+
+    return diagnostics_df
+
+def _elbow_index(k: pd.Series, inertia: pd.Series) -> int:
+    """Index of the elbow: the point of the inertia curve furthest below the line between its end points."""
+    if len(k) < 3:
+        return int(k.index[0])
+
+    x = (k - k.iloc[0]) / (k.iloc[-1] - k.iloc[0])
+    y = (inertia - inertia.iloc[-1]) / max(inertia.iloc[0] - inertia.iloc[-1], 1e-12)
+
+    return int(((1 - x) - y).idxmax())
+
+def _cache_key(points: np.ndarray, k_range: Tuple[int, ...], seeds: Tuple[int, ...]) -> Tuple:
+    """Cache key of a sweep: hash of the points and the sweep parameters."""
+    digest = hashlib.sha1(np.ascontiguousarray(points).tobytes()).hexdigest()
+    return digest, points.shape, k_range, seeds
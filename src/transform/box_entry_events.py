@@ -1,11 +1,15 @@
 import pandas as pd
 import numpy as np
 import logging
-from src.config import config
+from src.config import LazyMetric
+from src.extract.normalized_events import as_events_frame
+from src.transform.kernels import classify_set_piece_origin
+from src.transform.streaming import streamable
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
+@streamable
 def transform_to_box_entry_events(df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform events data to box entry events.
@@ -21,12 +25,18 @@ def transform_to_box_entry_events(df: pd.DataFrame) -> pd.DataFrame:
         The transformed box entry events.
     """
 
-    logger.info(f"Transforming {len(df)} records from events data to box entry events.")
+    # Classification needs every event of the possession
+    df = as_events_frame(df, tables=["pass", "carry"])
+
+    logger.info("Transforming %d records from events data to box entry events.", len(df))
+
+    # Classify event origin (on all events, the possession start and action counts need the whole possession)
+    from_set_piece = classify_set_piece_origin(df)
 
     # Filter for passes and carries
     df = df[df["type"].isin(["Pass", "Carry"])].copy()
 
-    logger.info(f"Found {len(df)} passes and carries.")
+    logger.info("Found %d passes and carries.", len(df))
 
     # Set end location
     df["end_location"] = np.where(
@@ -58,15 +68,15 @@ def transform_to_box_entry_events(df: pd.DataFrame) -> pd.DataFrame:
         (df["end_y"] <= 62)
     ]
 
-    logger.info(f"Found {len(df)} box entry events.")
+    logger.info("Found %d box entry events.", len(df))
 
-    # Classify box entry origin
-    df["box_entry_from_set_piece"] = df.apply(
-        lambda x: classify_box_entry_from_set_piece(df, x), axis=1
-    )
+    # Box entry origin
+    df["box_entry_from_set_piece"] = from_set_piece[df.index]
 
-    logger.info(f"Box entry events from set piece: {len(df[df['box_entry_from_set_piece']])}")
-    logger.info(f"Box entry events from open play: {len(df[~df['box_entry_from_set_piece']])}")
+    entries_from_set_piece = LazyMetric(lambda: int(df["box_entry_from_set_piece"].sum()))
+    entries_from_open_play = LazyMetric(lambda: int((~df["box_entry_from_set_piece"]).sum()))
+    logger.info("Box entry events from set piece: %s", entries_from_set_piece, extra={"metrics": {"box_entries_from_set_piece": entries_from_set_piece}})
+    logger.info("Box entry events from open play: %s", entries_from_open_play, extra={"metrics": {"box_entries_from_open_play": entries_from_open_play}})
 
     # Select relevant columns
     box_entry_cols = [
@@ -74,58 +84,3 @@ def transform_to_box_entry_events(df: pd.DataFrame) -> pd.DataFrame:
     ]
 
     return df[~df["box_entry_from_set_piece"]][box_entry_cols]
-
-def classify_box_entry_from_set_piece(
-    events_df: pd.DataFrame, 
-    entry_event: pd.Series
-) -> bool:
-    """
-    Classify if a box entry comes from a set piece based on time OR action count
-
-    Parameters:
-    ----------
-    events_df: pd.DataFrame
-        The events data to classify.
-    entry_event: pd.Series
-        The box entry event to classify.
-
-    Returns:
-    --------
-    bool:
-        True if the box entry comes from a set piece, False otherwise.
-    """
-    match_id = entry_event['match_id']
-    possession = entry_event['possession']
-    
-    # Get all events in the same possession
-    possession_events = events_df[
-        (events_df['match_id'] == match_id) & 
-        (events_df['possession'] == possession)
-    ].sort_values('timestamp')
-    
-    # Find the first event (set piece origin)
-    first_event = possession_events.iloc[0]
-    
-    # Get events up to and including this specific shot
-    events_up_to_entry = possession_events[
-        possession_events['timestamp'] <= entry_event['timestamp']
-    ]
-    
-    # Calculate time elapsed (in seconds)
-    first_time = pd.to_timedelta(first_event['timestamp']).total_seconds()
-    entry_time = pd.to_timedelta(entry_event['timestamp']).total_seconds()
-    time_elapsed = entry_time - first_time
-    
-    # Count possessing actions (passes, carries, dribbles) up to this shot
-    possessing_actions = events_up_to_entry[
-        events_up_to_entry['type'].isin(['Pass', 'Carry', 'Dribble'])
-    ]
-    actions_between = len(possessing_actions)
-    
-    # Apply hybrid cutoffs based on play_pattern
-    play_pattern = first_event['play_pattern']
-    
-    if play_pattern in ["From Corner", "From Free Kick", "From Throw In"]:
-        return (time_elapsed <= config.classification.set_piece_allowed_time) or (actions_between <= config.classification.set_piece_allowed_actions)
-    else:
-        return False
\ No newline at end of file
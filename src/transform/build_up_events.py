@@ -1,10 +1,14 @@
 import pandas as pd
 import numpy as np
 import logging
+from src.extract.normalized_events import as_events_frame
+from src.transform.kernels import possession_rank, possession_start_values, possession_starts
+from src.transform.streaming import streamable
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
+@streamable
 def transform_to_build_up_events(df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform events data in two dataframes:
@@ -24,7 +28,9 @@ def transform_to_build_up_events(df: pd.DataFrame) -> pd.DataFrame:
         The transformed chain events dataframe.
     """
 
-    logger.info(f"Transforming {len(df)} records from events data to two phase events.")
+    df = as_events_frame(df, types=["Pass"], tables=["pass"])
+
+    logger.info("Transforming %d records from events data to two phase events.", len(df))
 
     # Filter for goal kick chains and keep passes
     df = df[
@@ -32,73 +38,11 @@ def transform_to_build_up_events(df: pd.DataFrame) -> pd.DataFrame:
         (df["type"] == "Pass")
     ].copy()
 
-    # Sort by match_id and timestamp to ensure proper ordering
+    # Sort by match_id and timestamp to ensure proper ordering, then group passes by possession chain
     df = df.sort_values(['match_id', 'timestamp']).reset_index(drop=True)
+    df = df.sort_values(['match_id', 'possession'], kind="stable").reset_index(drop=True)
 
-    logger.info(f"Filtered {len(df)} records from events data to goal kick chains.")
-
-    # Initialize list of first events and chain events
-    first_events = []
-    chain_events = []
-
-    # Loop through each match_id
-    for match_id in df["match_id"].unique():
-        # Filter for current match_id
-        match_df = df[df["match_id"] == match_id]
-        
-        # Loop through possession chain
-        for possession in match_df["possession"].unique():
-            chain_df = match_df[match_df["possession"] == possession].copy()
-
-            # Skip if chain is empty
-            if len(chain_df) == 0:
-                continue
-
-            # Skip if chain does not start with a Goal Kick
-            if chain_df["pass_type"].iloc[0] != "Goal Kick":
-                continue
-
-            # Split locations
-            chain_df[["x", "y"]] = pd.DataFrame(chain_df["location"].tolist(), index=chain_df.index)
-            chain_df[["end_x", "end_y"]] = pd.DataFrame(chain_df["pass_end_location"].tolist(), index=chain_df.index)
-
-            # Categorize pass length (30 metres = 32.8084 yards)
-            chain_df["pass_category"] = pd.cut(
-                chain_df["pass_length"], 
-                bins=[0, 32.8084, float("inf")], 
-                labels=["short", "long"]
-            )
-
-            # Add phase column to chain
-            chain_df["phase"] = 1
-
-            # Add first event to list
-            first_events.append(chain_df.iloc[0:1])
-
-            # Skip chain if it doesn't match the pattern we want
-            if (
-                len(chain_df) < 2 or                                # Skip if there are less than two events in the chain
-                chain_df.iloc[0]["position"] == "Goalkeeper" or     # Skip if the first pass is from the goalkeeper
-                pd.notna(chain_df.iloc[0]["pass_outcome"])            # Skip if the first pass is incomplete
-            ):
-                continue
-
-            # Set phase column to 2 for second event
-            chain_df.at[chain_df.index[1], "phase"] = 2
-
-            # Add first two events of chain to list
-            chain_events.append(chain_df[0:2])
-    
-    # Combine lists into dataframes
-    first_events_df = pd.concat(first_events, ignore_index=True)
-    chain_events_df = pd.concat(chain_events, ignore_index=True)
-
-    # Sort by match_id and timestamp
-    first_events_df = first_events_df.sort_values(['match_id', 'timestamp']).reset_index(drop=True)
-    chain_events_df = chain_events_df.sort_values(['match_id', 'timestamp']).reset_index(drop=True)
-
-    logger.info(f"Transformed {len(first_events_df)} records from events data to first events dataframe.")
-    logger.info(f"Transformed {len(chain_events_df)} records from events data to chain events dataframe.")
+    logger.info("Filtered %d records from events data to goal kick chains.", len(df))
 
     # Select relevant columns
     cols = [
@@ -106,5 +50,48 @@ def transform_to_build_up_events(df: pd.DataFrame) -> pd.DataFrame:
         "x", "y", "end_x", "end_y", "pass_type", "pass_outcome", "pass_category"
     ]
 
+    match = df["match_id"].to_numpy()
+    possession = df["possession"].to_numpy()
+
+    # Phase of every pass in its chain and the number of passes in the chain
+    df["phase"] = possession_rank(match, possession, np.ones(len(df), dtype=bool))
+    chain_index = np.cumsum(possession_starts(match, possession)) - 1
+    chain_length = np.bincount(chain_index, minlength=1)[chain_index]
+
+    # Skip chains that don't start with a Goal Kick
+    starts_with_goal_kick = possession_start_values(match, possession, (df["pass_type"] == "Goal Kick").to_numpy())
+
+    # Keep the first two events of chains with at least two events, where the first pass
+    # is completed and not from the goalkeeper
+    first_pass_valid = possession_start_values(
+        match, possession,
+        (df["position"] != "Goalkeeper").to_numpy() & df["pass_outcome"].isna().to_numpy(),
+    )
+    in_chain = (chain_length >= 2) & first_pass_valid & (df["phase"] <= 2).to_numpy()
+
+    first_events = starts_with_goal_kick & (df["phase"] == 1).to_numpy()
+    chain_events = starts_with_goal_kick & in_chain
+
+    # Split locations
+    df[["x", "y"]] = pd.DataFrame(df["location"].tolist(), index=df.index, columns=["x", "y"])
+    df[["end_x", "end_y"]] = pd.DataFrame(df["pass_end_location"].tolist(), index=df.index, columns=["end_x", "end_y"])
+
+    # Categorize pass length (30 metres = 32.8084 yards)
+    df["pass_category"] = pd.cut(
+        df["pass_length"],
+        bins=[0, 32.8084, float("inf")],
+        labels=["short", "long"]
+    )
+
+    first_events_df = df[first_events]
+    chain_events_df = df[chain_events]
+
+    # Sort by match_id and timestamp
+    first_events_df = first_events_df.sort_values(['match_id', 'timestamp']).reset_index(drop=True)
+    chain_events_df = chain_events_df.sort_values(['match_id', 'timestamp']).reset_index(drop=True)
+
+    logger.info("Transformed %d records from events data to first events dataframe.", len(first_events_df))
+    logger.info("Transformed %d records from events data to chain events dataframe.", len(chain_events_df))
+
     # Return dataframes
     return first_events_df[cols], chain_events_df[cols]
\ No newline at end of file
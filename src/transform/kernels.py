@@ -0,0 +1,304 @@
+"""
+Kernels for possession sequence features.
+
+All kernels take arrays sorted by match, possession and time, and compute their feature in a
+single linear scan. They are compiled with numba when it is installed; otherwise equivalent
+pure-NumPy implementations are used.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import config
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+HAS_NUMBA = njit is not None
+
+def timestamp_to_ms(timestamps: pd.Series) -> np.ndarray:
+    """
+    Convert StatsBomb timestamps ("00:12:34.567", time within the period) to milliseconds.
+
+    Parameters:
+    ----------
+    timestamps: pd.Series
+        The timestamps.
+
+    Returns:
+    --------
+    np.ndarray
+        The time within the period in milliseconds.
+    """
+    return (pd.to_timedelta(timestamps).to_numpy().astype("timedelta64[ms]")).astype(np.int64)
+
+def possession_starts(match: np.ndarray, possession: np.ndarray) -> np.ndarray:
+    """
+    Flag the first event of every possession.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+
+    Returns:
+    --------
+    np.ndarray
+        True for the first event of a possession.
+    """
+    starts = np.ones(len(match), dtype=bool)
+    starts[1:] = (match[1:] != match[:-1]) | (possession[1:] != possession[:-1])
+    return starts
+
+def time_since_possession_start(
+    match: np.ndarray,
+    possession: np.ndarray,
+    t_ms: np.ndarray,
+) -> np.ndarray:
+    """
+    Time since the first event of the possession.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+    t_ms: np.ndarray
+        The time of every event in milliseconds (sorted within possession).
+
+    Returns:
+    --------
+    np.ndarray
+        The time since the start of the possession in milliseconds.
+    """
+    match, possession, t_ms = _as_int64(match, possession, t_ms)
+
+    if HAS_NUMBA:
+        return _time_since_start_numba(match, possession, t_ms)
+
+    start = _start_index(possession_starts(match, possession))
+    return t_ms - t_ms[start]
+
+def cumulative_count(
+    match: np.ndarray,
+    possession: np.ndarray,
+    flags: np.ndarray,
+    t_ms: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Number of flagged events in the possession up to and including every event.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+    flags: np.ndarray
+        The events to count (e.g. passes, carries and dribbles).
+    t_ms: Optional[np.ndarray]
+        If given, events at the same time as an event are counted as well (up to and
+        including the event's timestamp instead of its position).
+
+    Returns:
+    --------
+    np.ndarray
+        The cumulative count of flagged events per possession.
+    """
+    match, possession = _as_int64(match, possession)
+    flags = np.ascontiguousarray(flags, dtype=np.bool_)
+    t_ms = np.ascontiguousarray(t_ms, dtype=np.int64) if t_ms is not None else None
+
+    if HAS_NUMBA:
+        if t_ms is None:
+            return _cumulative_count_numba(match, possession, flags)
+        return _cumulative_count_ties_numba(match, possession, flags, t_ms)
+
+    starts = possession_starts(match, possession)
+    counts = np.cumsum(flags, dtype=np.int64)
+    start = _start_index(starts)
+    counts = counts - counts[start] + flags[start]
+
+    if t_ms is None:
+        return counts
+
+    # Take the count at the last event of every run of equal timestamps
+    run_starts = starts.copy()
+    run_starts[1:] |= t_ms[1:] != t_ms[:-1]
+    run_ends = np.append(np.flatnonzero(run_starts)[1:] - 1, len(flags) - 1)
+    return counts[run_ends[np.cumsum(run_starts) - 1]]
+
+def possession_rank(
+    match: np.ndarray,
+    possession: np.ndarray,
+    eligible: np.ndarray,
+) -> np.ndarray:
+    """
+    Rank of every eligible event in its possession (1 for the first), e.g. the phase of a pass in a chain.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+    eligible: np.ndarray
+        The events to rank.
+
+    Returns:
+    --------
+    np.ndarray
+        The rank of eligible events and 0 for other events.
+    """
+    eligible = np.ascontiguousarray(eligible, dtype=np.bool_)
+    return cumulative_count(match, possession, eligible) * eligible
+
+def first_n_mask(
+    match: np.ndarray,
+    possession: np.ndarray,
+    eligible: np.ndarray,
+    n: int,
+) -> np.ndarray:
+    """
+    Flag the first n eligible events of every possession.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+    eligible: np.ndarray
+        The events that can be selected.
+    n: int
+        The number of events to select per possession.
+
+    Returns:
+    --------
+    np.ndarray
+        True for the first n eligible events of a possession.
+    """
+    rank = possession_rank(match, possession, eligible)
+    return (rank >= 1) & (rank <= n)
+
+def possession_start_values(
+    match: np.ndarray,
+    possession: np.ndarray,
+    values: np.ndarray,
+) -> np.ndarray:
+    """
+    Broadcast the value of the first event of every possession to all its events.
+
+    Parameters:
+    ----------
+    match: np.ndarray
+        The match id of every event (sorted).
+    possession: np.ndarray
+        The possession number of every event (sorted within match).
+    values: np.ndarray
+        The values (e.g. play pattern codes).
+
+    Returns:
+    --------
+    np.ndarray
+        The value of the first event of the possession for every event.
+    """
+    start = _start_index(possession_starts(match, possession))
+    return np.asarray(values)[start]
+
+def classify_set_piece_origin(events_df: pd.DataFrame) -> pd.Series:
+    """
+    Classify if events come from a set piece based on time OR action count since the start of their possession.
+
+    An event comes from a set piece if its possession starts with a set piece play pattern and it
+    happens within the allowed time or the allowed number of possessing actions (passes, carries,
+    dribbles up to and including the event's timestamp) from the config.
+
+    Parameters:
+    ----------
+    events_df: pd.DataFrame
+        The events data to classify, with every event of the possessions (not only the events to classify).
+
+    Returns:
+    --------
+    pd.Series
+        True if the event comes from a set piece, False otherwise (aligned with the events).
+    """
+    classification = config.classification
+
+    # Sort by match, possession and time
+    t_ms = timestamp_to_ms(events_df["timestamp"])
+    order = np.lexsort((t_ms, events_df["possession"].to_numpy(), events_df["match_id"].to_numpy()))
+    match = events_df["match_id"].to_numpy()[order]
+    possession = events_df["possession"].to_numpy()[order]
+    t_ms = t_ms[order]
+
+    time_elapsed = time_since_possession_start(match, possession, t_ms)
+    actions_between = cumulative_count(
+        match, possession,
+        events_df["type"].isin(classification.set_piece_action_types).to_numpy()[order],
+        t_ms=t_ms,
+    )
+    from_set_piece = possession_start_values(
+        match, possession,
+        events_df["play_pattern"].isin(classification.set_piece_play_patterns).to_numpy()[order],
+    )
+
+    from_set_piece &= (
+        (time_elapsed <= classification.set_piece_allowed_time * 1000) |
+        (actions_between <= classification.set_piece_allowed_actions)
+    )
+
+    result = np.empty(len(order), dtype=bool)
+    result[order] = from_set_piece
+    return pd.Series(result, index=events_df.index)
+
+def _start_index(starts: np.ndarray) -> np.ndarray:
+    """Index of the possession start of every event."""
+    return np.maximum.accumulate(np.where(starts, np.arange(len(starts)), 0))
+
+def _as_int64(*arrays):
+    """Convert arrays to contiguous int64 arrays for the kernels."""
+    return tuple(np.ascontiguousarray(array, dtype=np.int64) for array in arrays)
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _time_since_start_numba(match, possession, t_ms):
+        result = np.empty(len(t_ms), dtype=np.int64)
+        start_t = 0
+        for i in range(len(t_ms)):
+            if i == 0 or match[i] != match[i - 1] or possession[i] != possession[i - 1]:
+                start_t = t_ms[i]
+            result[i] = t_ms[i] - start_t
+        return result
+
+    @njit(cache=True)
+    def _cumulative_count_numba(match, possession, flags):
+        result = np.empty(len(flags), dtype=np.int64)
+        count = 0
+        for i in range(len(flags)):
+            if i == 0 or match[i] != match[i - 1] or possession[i] != possession[i - 1]:
+                count = 0
+            count += flags[i]
+            result[i] = count
+        return result
+
+    @njit(cache=True)
+    def _cumulative_count_ties_numba(match, possession, flags, t_ms):
+        result = _cumulative_count_numba(match, possession, flags)
+        # Backward pass: events at the same time in the same possession get the count of the last one
+        for i in range(len(flags) - 2, -1, -1):
+            if match[i] == match[i + 1] and possession[i] == possession[i + 1] and t_ms[i] == t_ms[i + 1]:
+                result[i] = result[i + 1]
+        return result
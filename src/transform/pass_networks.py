@@ -0,0 +1,330 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.config import LazyMetric
+from src.extract.normalized_events import as_events_frame
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PassNetworks:
+    """
+    Pass networks of every team in every match.
+
+    Every network has its own player index: the players of the i-th network (row i of
+    ``groups``) are ``players[player_offsets[i]:player_offsets[i + 1]]``. Its completed passes
+    are stored in the same rows of the stacked sparse matrix, with the passer as row and the
+    position of the recipient in the network's player index as column, so every network takes
+    n_group_players x n_group_players.
+
+    Attributes:
+    ----------
+    players: np.ndarray
+        The players of all networks, sorted by name within every network.
+    player_offsets: np.ndarray
+        Offsets of the players of every network in ``players`` (length n_groups + 1).
+    groups: pd.DataFrame
+        The match_id and team of every network.
+    matrix: sparse.csr_matrix
+        The stacked pass count matrices (n_players, largest number of players in a network).
+    positions: pd.DataFrame
+        The average position and number of passes made and received of every player per network.
+    """
+
+    players: np.ndarray
+    player_offsets: np.ndarray
+    groups: pd.DataFrame
+    matrix: sparse.csr_matrix
+    positions: pd.DataFrame
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    @property
+    def n_players(self) -> int:
+        """Number of players over all networks."""
+        return len(self.players)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the sparse matrix and the player index."""
+        return int(
+            self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes +
+            self.players.nbytes + self.player_offsets.nbytes
+        )
+
+    def players_for(self, match_id: int, team: str) -> np.ndarray:
+        """
+        Get the players of a team in a match, in the order of the rows and columns of ``matrix_for``.
+
+        Parameters:
+        ----------
+        match_id: int
+            The match.
+        team: str
+            The team.
+
+        Returns:
+        --------
+        np.ndarray
+            The players.
+        """
+        group = self._group(match_id, team)
+        return self.players[self.player_offsets[group]:self.player_offsets[group + 1]]
+
+    def matrix_for(self, match_id: int, team: str) -> sparse.csr_matrix:
+        """
+        Get the pass count matrix of a team in a match.
+
+        Parameters:
+        ----------
+        match_id: int
+            The match.
+        team: str
+            The team.
+
+        Returns:
+        --------
+        sparse.csr_matrix
+            The (n_group_players, n_group_players) pass counts, passer as row and recipient as
+            column (players as in ``players_for``).
+        """
+        group = self._group(match_id, team)
+        start, end = self.player_offsets[group], self.player_offsets[group + 1]
+        return self.matrix[start:end, :end - start]
+
+    def team_players(self, team: str) -> np.ndarray:
+        """
+        Get the players of a team over all its matches, in the order of the rows and columns of ``team_matrix``.
+
+        Parameters:
+        ----------
+        team: str
+            The team.
+
+        Returns:
+        --------
+        np.ndarray
+            The players, sorted by name.
+        """
+        group_of_player = np.repeat(np.arange(len(self)), np.diff(self.player_offsets))
+        return np.unique(self.players[self.groups["team"].to_numpy()[group_of_player] == team])
+
+    def team_matrix(self, team: str) -> sparse.csr_matrix:
+        """
+        Get the pass count matrix of a team summed over all its matches.
+
+        Parameters:
+        ----------
+        team: str
+            The team.
+
+        Returns:
+        --------
+        sparse.csr_matrix
+            The (n_team_players, n_team_players) pass counts, passer as row and recipient as
+            column (players as in ``team_players``).
+        """
+        players = self.team_players(team)
+        coo = self.matrix.tocoo()
+        group = self._row_groups(coo.row)
+        selected = self.groups["team"].to_numpy()[group] == team
+
+        # Map the passers and recipients of the team's networks to the team's player index (duplicates are summed)
+        passer = np.searchsorted(players, self.players[coo.row[selected]])
+        recipient = np.searchsorted(players, self.players[self.player_offsets[group[selected]] + coo.col[selected]])
+
+        return sparse.csr_matrix((coo.data[selected], (passer, recipient)), shape=(len(players), len(players)))
+
+    def edges(
+        self,
+        match_id: Optional[int] = None,
+        team: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Get the networks as an edge list.
+
+        Parameters:
+        ----------
+        match_id: Optional[int]
+            Only return the edges of this match, by default all matches.
+        team: Optional[str]
+            Only return the edges of this team, by default all teams.
+
+        Returns:
+        --------
+        pd.DataFrame
+            The match_id, team, passer, recipient and number of passes of every edge.
+        """
+        coo = self.matrix.tocoo()
+        group = self._row_groups(coo.row)
+
+        edges_df = pd.DataFrame({
+            "match_id": self.groups["match_id"].to_numpy()[group],
+            "team": self.groups["team"].to_numpy()[group],
+            "passer": self.players[coo.row],
+            "recipient": self.players[self.player_offsets[group] + coo.col],
+            "passes": coo.data,
+        })
+
+        if match_id is not None:
+            edges_df = edges_df[edges_df["match_id"] == match_id]
+        if team is not None:
+            edges_df = edges_df[edges_df["team"] == team]
+
+        return edges_df.sort_values(["match_id", "team", "passes"], ascending=[True, True, False]).reset_index(drop=True)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the pass networks to a directory.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The directory to save the pass networks to.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.save(path / "players.npy", self.players)
+        np.save(path / "player_offsets.npy", self.player_offsets)
+        sparse.save_npz(path / "matrix.npz", self.matrix)
+        self.groups.to_pickle(path / "groups.pkl")
+        self.positions.to_pickle(path / "positions.pkl")
+
+        logger.info("Saved %d pass networks to %s.", len(self), path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PassNetworks":
+        """
+        Load pass networks saved with ``PassNetworks.save``.
+
+        Parameters:
+        ----------
+        path: Union[str, Path]
+            The directory the pass networks were saved to.
+
+        Returns:
+        --------
+        PassNetworks
+            The loaded pass networks.
+        """
+        path = Path(path)
+
+        return cls(
+            players=np.load(path / "players.npy", allow_pickle=False),
+            player_offsets=np.load(path / "player_offsets.npy", allow_pickle=False),
+            groups=pd.read_pickle(path / "groups.pkl"),
+            matrix=sparse.load_npz(path / "matrix.npz").tocsr(),
+            positions=pd.read_pickle(path / "positions.pkl"),
+        )
+
+    def _group(self, match_id: int, team: str) -> int:
+        """Position of the network of a team in a match."""
+        mask = (self.groups["match_id"].to_numpy() == match_id) & (self.groups["team"].to_numpy() == team)
+
+        if not mask.any():
+            raise KeyError(f"No pass network for {team} in match {match_id}")
+
+        return int(np.flatnonzero(mask)[0])
+
+    def _row_groups(self, rows: np.ndarray) -> np.ndarray:
+        """Network of every row of the stacked matrix."""
+        return np.searchsorted(self.player_offsets, rows, side="right") - 1
+
+def build_pass_networks(df: pd.DataFrame) -> PassNetworks:
+    """
+    Build the pass networks of every team in every match from events data.
+
+    Completed passes link the passer to the pass recipient. All passes are accumulated into
+    one sparse matrix at once and average positions are grouped means of the locations
+    where players made (pass location) and received (pass end location) passes.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events data.
+
+    Returns:
+    --------
+    PassNetworks
+        The pass networks.
+    """
+
+    df = as_events_frame(df, types=["Pass"], tables=["pass"])
+
+    logger.info("Building pass networks from %d records of events data.", len(df))
+
+    # Completed passes with a recipient
+    df = df[
+        (df["type"] == "Pass") &
+        (df["pass_outcome"].isna()) &
+        (df["pass_recipient"].notna())
+    ]
+
+    # Network and player index of every pass
+    grouping = df.groupby(["match_id", "team"], sort=True)
+    group = grouping.ngroup().to_numpy()
+    groups = grouping.size().rename("passes").reset_index()
+
+    # Player index of every network: the players sorted by network and name
+    touches = pd.MultiIndex.from_arrays([
+        np.concatenate([group, group]),
+        np.concatenate([df["player"].to_numpy(dtype=str), df["pass_recipient"].to_numpy(dtype=str)]),
+    ])
+    player_index = touches.unique().sort_values()
+    players = player_index.get_level_values(1).to_numpy(dtype=str)
+    player_offsets = np.concatenate([[0], np.cumsum(np.bincount(player_index.get_level_values(0).to_numpy(), minlength=len(groups)))]).astype(np.int64)
+
+    position = player_index.get_indexer(touches)
+    passer, recipient = position[:len(df)], position[len(df):]
+    group_size = np.diff(player_offsets)
+
+    # Stacked pass count matrices, recipients as position in their network (duplicate entries are summed)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(df), dtype=np.int32), (passer, recipient - player_offsets[group])),
+        shape=(len(players), int(group_size.max()) if len(group_size) else 0),
+    )
+    matrix.sum_duplicates()
+
+    # Average positions of passes made and received
+    locations = np.array(df["location"].tolist(), dtype=float).reshape(-1, 2)
+    end_locations = np.array(df["pass_end_location"].tolist(), dtype=float).reshape(-1, 2)[:, :2]
+
+    touches_df = pd.DataFrame({
+        "group": np.concatenate([group, group]),
+        "player": np.concatenate([passer, recipient]),
+        "x": np.concatenate([locations[:, 0], end_locations[:, 0]]),
+        "y": np.concatenate([locations[:, 1], end_locations[:, 1]]),
+        "passes_made": np.repeat([1, 0], len(df)),
+        "passes_received": np.repeat([0, 1], len(df)),
+    })
+
+    positions_df = touches_df.groupby(["group", "player"], sort=True).agg(
+        x=("x", "mean"),
+        y=("y", "mean"),
+        passes_made=("passes_made", "sum"),
+        passes_received=("passes_received", "sum"),
+    ).reset_index()
+
+    group_index = positions_df["group"].to_numpy()
+    positions_df.insert(0, "match_id", groups["match_id"].to_numpy()[group_index])
+    positions_df.insert(1, "team", groups["team"].to_numpy()[group_index])
+    positions_df["player"] = players[positions_df["player"].to_numpy()]
+    positions_df = positions_df.drop(columns="group")
+
+    networks = PassNetworks(players=players, player_offsets=player_offsets, groups=groups, matrix=matrix, positions=positions_df)
+
+    logger.info(
+        "Built %d pass networks with %d edges (%s KB).",
+        len(networks), matrix.nnz, LazyMetric(lambda: f"{networks.nbytes / 1e3:.1f}"),
+    )
+
+    return networks
@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+import logging
+from src.config import config
+from src.extract.normalized_events import as_events_frame
+from src.transform.streaming import streamable
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@streamable
+def transform_to_possession_sequences(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform events data to possession sequences of action/zone tokens.
+
+    Every action of the team in possession (passes, carries, dribbles and shots by default)
+    becomes one token: the action type combined with the custom zone it starts in. Tokens are
+    ordered by event index within their possession. Shots and box entries (actions that start
+    outside and end inside the box) are flagged, so patterns leading to them can be counted.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events data to transform.
+
+    Returns:
+    --------
+    df: pd.DataFrame
+        One row per action with its step in the possession, token and labels.
+    """
+
+    action_types = config.sequences.action_types
+    df = as_events_frame(df, types=action_types, tables=["pass", "carry"])
+
+    logger.info("Transforming %d records from events data to possession sequences.", len(df))
+
+    # Actions of the team in possession, in event order
+    df = df[
+        (df["type"].isin(action_types)) &
+        (df["team"] == df["possession_team"]) &
+        (df["location"].notna())
+    ].copy()
+    df = df.sort_values(["match_id", "possession", "index"], kind="stable").reset_index(drop=True)
+
+    # Split locations
+    df[["x", "y"]] = pd.DataFrame([location[:2] for location in df["location"]], index=df.index, columns=["x", "y"])
+    end_location = df["carry_end_location"].where(df["type"] == "Carry", df["pass_end_location"])
+    end_xy = np.full((len(df), 2), np.nan)
+    has_end = end_location.map(lambda location: isinstance(location, (list, tuple, np.ndarray))).to_numpy(dtype=bool)
+    if has_end.any():
+        end_xy[has_end] = [location[:2] for location in end_location[has_end]]
+
+    # Token: action type and start zone
+    x_bins = np.asarray(config.zones.x_bins, dtype=float)
+    y_bins = np.asarray(config.zones.y_bins, dtype=float)
+    df["x_zone"] = np.clip(np.searchsorted(x_bins, df["x"].to_numpy(), side="right") - 1, 0, len(x_bins) - 2)
+    df["y_zone"] = np.clip(np.searchsorted(y_bins, df["y"].to_numpy(), side="right") - 1, 0, len(y_bins) - 2)
+    n_zones = (len(x_bins) - 1) * (len(y_bins) - 1)
+
+    action = pd.Categorical(df["type"], categories=action_types).codes.astype(np.int64)
+    df["token"] = action * n_zones + df["x_zone"].to_numpy() * (len(y_bins) - 1) + df["y_zone"].to_numpy()
+    df["label"] = df["type"] + " " + df["x_zone"].astype(str) + "-" + df["y_zone"].astype(str)
+
+    # Step of every action in its possession
+    df["step"] = df.groupby(["match_id", "possession"], sort=False).cumcount() + 1
+
+    # Outcomes the sequences can lead to
+    in_box = lambda x, y: (x >= 102) & (y >= 18) & (y <= 62)
+    df["is_shot"] = df["type"] == "Shot"
+    df["is_box_entry"] = ~in_box(df["x"].to_numpy(), df["y"].to_numpy()) & in_box(end_xy[:, 0], end_xy[:, 1])
+
+    logger.info("Transformed %d records from events data to possession sequences.", len(df))
+
+    # Select relevant columns
+    cols = [
+        "match_id", "team", "player", "position", "possession", "step", "type",
+        "x", "y", "x_zone", "y_zone", "token", "label", "is_shot", "is_box_entry",
+    ]
+
+    return df[cols]
@@ -0,0 +1,186 @@
+import logging
+import operator
+import weakref
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+# Masks and column codes computed per frame, by id of the frame (dropped when the frame is garbage collected),
+# with the shape and columns of the frame they were computed on
+_masks: Dict[int, Tuple[tuple, Dict[str, np.ndarray]]] = {}
+_codes: Dict[int, Tuple[tuple, Dict[str, Tuple[np.ndarray, pd.Index]]]] = {}
+
+_COMPARISONS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+class Predicate:
+    """
+    A named, composable event filter.
+
+    Predicates are combined with ``&``, ``|`` and ``~`` and evaluated to a boolean numpy mask
+    with ``mask(df)``. String columns are compared on their category codes (factorized once
+    per frame and column), so a predicate compares a handful of categories instead of every
+    row. The mask of every predicate (and of every sub-predicate) is cached per frame, so
+    predicates shared by several transforms on the same events frame are evaluated once.
+    The cache of a frame is dropped when rows or columns are added or removed; values changed
+    in place are not detected (call ``clear_cache`` after such changes).
+
+    Parameters:
+    ----------
+    name: str
+        The name of the predicate, also the cache key of its mask.
+    evaluate: Callable[[pd.DataFrame], np.ndarray]
+        The function that evaluates the mask of a frame.
+    """
+
+    def __init__(self, name: str, evaluate: Callable[[pd.DataFrame], np.ndarray]):
+        self.name = name
+        self._evaluate = evaluate
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.name})"
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return Predicate(f"({self.name} & {other.name})", lambda df: self.mask(df) & other.mask(df))
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Predicate(f"({self.name} | {other.name})", lambda df: self.mask(df) | other.mask(df))
+
+    def __invert__(self) -> "Predicate":
+        return Predicate(f"~{self.name}", lambda df: ~self.mask(df))
+
+    def named(self, name: str) -> "Predicate":
+        """Get the same predicate under another name."""
+        return Predicate(name, self.mask)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the predicate on a frame.
+
+        Parameters:
+        ----------
+        df: pd.DataFrame
+            The events frame.
+
+        Returns:
+        --------
+        np.ndarray
+            The boolean mask of the rows that match.
+        """
+        masks = _frame_cache(_masks, df)
+
+        if self.name not in masks:
+            masks[self.name] = np.asarray(self._evaluate(df), dtype=bool)
+
+        return masks[self.name]
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Get the rows of a frame that match the predicate."""
+        return df[self.mask(df)]
+
+    @classmethod
+    def isin(cls, column: str, values: Iterable[Any], name: str = None) -> "Predicate":
+        """Rows where the column is one of the values."""
+        values = list(values)
+
+        def evaluate(df: pd.DataFrame) -> np.ndarray:
+            codes, categories = _column_codes(df, column)
+            lookup = np.append(categories.isin(values), False)  # code -1 (missing) maps to False
+            return lookup[codes]
+
+        return cls(name or f"{column} in {values}", evaluate)
+
+    @classmethod
+    def equals(cls, column: str, value: Any, name: str = None) -> "Predicate":
+        """Rows where the column equals the value."""
+        return cls.isin(column, [value], name=name or f"{column} == {value!r}")
+
+    @classmethod
+    def isna(cls, column: str, name: str = None) -> "Predicate":
+        """Rows where the column is missing (or the frame doesn't have the column)."""
+        return cls(
+            name or f"{column} is na",
+            lambda df: df[column].isna().to_numpy() if column in df else np.ones(len(df), dtype=bool),
+        )
+
+    @classmethod
+    def compare(cls, column: str, op: str, value: float, name: str = None) -> "Predicate":
+        """Rows where a numeric column compares to the value (op is one of <, <=, >, >=)."""
+        compare = _COMPARISONS[op]
+        return cls(name or f"{column} {op} {value}", lambda df: compare(df[column].to_numpy(dtype=float), value))
+
+    @classmethod
+    def same(cls, column: str, other: str, name: str = None) -> "Predicate":
+        """Rows where two columns have the same (non-missing) value."""
+        return cls(
+            name or f"{column} == {other}",
+            lambda df: pd.notna(df[column]).to_numpy() & (df[column].to_numpy(dtype=object) == df[other].to_numpy(dtype=object)),
+        )
+
+def clear_cache() -> None:
+    """Drop all cached masks and column codes."""
+    _masks.clear()
+    _codes.clear()
+
+def _column_codes(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, pd.Index]:
+    """Get the category codes (-1 for missing) and categories of a column, factorized once per frame."""
+    codes = _frame_cache(_codes, df)
+
+    if column not in codes:
+        if column not in df:
+            codes[column] = (np.full(len(df), -1, dtype=np.int64), pd.Index([]))
+        elif isinstance(df[column].dtype, pd.CategoricalDtype):
+            codes[column] = (df[column].cat.codes.to_numpy(dtype=np.int64), df[column].cat.categories)
+        else:
+            values, categories = pd.factorize(df[column], use_na_sentinel=True)
+            codes[column] = (values.astype(np.int64), pd.Index(categories))
+
+    return codes[column]
+
+def _frame_cache(cache: Dict[int, Tuple[tuple, dict]], df: pd.DataFrame) -> dict:
+    """Get the cache entry of a frame, creating it (and its cleanup) on first use or when the frame's shape or columns changed."""
+    key = id(df)
+    signature = (df.shape, tuple(df.columns))
+
+    if key not in cache:
+        weakref.finalize(df, cache.pop, key, None)
+    elif cache[key][0] == signature:
+        return cache[key][1]
+
+    cache[key] = (signature, {})
+    return cache[key][1]
+
+# Event types
+IS_PASS = Predicate.equals("type", "Pass", name="IS_PASS")
+IS_CARRY = Predicate.equals("type", "Carry", name="IS_CARRY")
+IS_DUEL = Predicate.equals("type", "Duel", name="IS_DUEL")
+IS_FIFTY_FIFTY = Predicate.equals("type", "50/50", name="IS_FIFTY_FIFTY")
+IS_LOSS_OF_CONTROL = Predicate.isin("type", ["Dispossessed", "Miscontrol"], name="IS_LOSS_OF_CONTROL")
+
+# Passes
+COMPLETED = Predicate.isna("pass_outcome", name="COMPLETED")
+SET_PIECE_PASS = Predicate.isin("pass_type", ["Goal Kick", "Corner", "Free Kick", "Throw-in"], name="SET_PIECE_PASS")
+OPEN_PLAY_PASS = (IS_PASS & ~SET_PIECE_PASS).named("OPEN_PLAY_PASS")
+INJURY_CLEARANCE = Predicate.equals("pass_outcome", "Injury Clearance", name="INJURY_CLEARANCE")
+
+# Possession
+IN_POSSESSION = Predicate.same("team", "possession_team", name="IN_POSSESSION")
+HAS_LOCATION = (~Predicate.isna("location")).named("HAS_LOCATION")
+
+# Outcomes
+FAILED_PASS = (OPEN_PLAY_PASS & ~COMPLETED & ~INJURY_CLEARANCE).named("FAILED_PASS")
+FAILED_DRIBBLE = Predicate.equals("dribble_outcome", "Incomplete", name="FAILED_DRIBBLE")
+FAILED_RECEIPT = Predicate.equals("ball_receipt_outcome", "Incomplete", name="FAILED_RECEIPT")
+LOST_DUEL = (
+    IS_DUEL & IN_POSSESSION &
+    (Predicate.isna("duel_outcome") | Predicate.isin("duel_outcome", ["Lost", "Lost In Play", "Lost Out"]))
+).named("LOST_DUEL")
+TURNOVER = (
+    IS_LOSS_OF_CONTROL | IS_FIFTY_FIFTY | FAILED_PASS | FAILED_DRIBBLE | FAILED_RECEIPT | LOST_DUEL
+).named("TURNOVER")
+
+# Pitch zones (on the x column)
+BEFORE_FINAL_THIRD = Predicate.compare("x", "<", 80, name="BEFORE_FINAL_THIRD")
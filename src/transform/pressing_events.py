@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+import logging
+from src.config import config
+from src.extract.normalized_events import as_events_frame
+from src.transform.streaming import streamable
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@streamable
+def transform_to_pressing_events(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform events data to the narrow events table used by the pressing metrics.
+
+    Keeps passes of the team in possession, defensive actions and pressures of the team out of
+    possession and ball regains, with their location, match window and opponent. The zone
+    thresholds are applied later by ``calculate_pressing_stats``, so they can be tuned without
+    transforming the events again.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events data to transform.
+
+    Returns:
+    --------
+    df: pd.DataFrame
+        The pressing events with is_pass, is_defensive_action, is_regain and is_pressure flags.
+    """
+
+    pressing = config.pressing
+    df = as_events_frame(df, tables=["ball_recovery", "interception", "duel"])
+
+    logger.info("Transforming %d records from events data to pressing events.", len(df))
+
+    out_of_possession = (df["team"] != df["possession_team"]).to_numpy()
+
+    # Event flags
+    is_pass = (df["type"] == "Pass").to_numpy() & ~out_of_possession
+    is_defensive_action = df["type"].isin(pressing.defensive_action_types).to_numpy() & out_of_possession
+    is_pressure = (df["type"] == "Pressure").to_numpy()
+
+    recovery_failed = _column(df, "ball_recovery_recovery_failure").fillna(False).astype(bool).to_numpy()
+    interception_lost = _column(df, "interception_outcome").isin(["Lost", "Lost In Play", "Lost Out"]).to_numpy()
+    tackle_won = (
+        (_column(df, "duel_type") == "Tackle") &
+        (_column(df, "duel_outcome").isin(["Won", "Success", "Success In Play", "Success Out"]))
+    ).to_numpy()
+    is_regain = (
+        ((df["type"] == "Ball Recovery").to_numpy() & ~recovery_failed) |
+        ((df["type"] == "Interception").to_numpy() & ~interception_lost) |
+        ((df["type"] == "Duel").to_numpy() & tackle_won)
+    )
+
+    df = df.assign(
+        is_pass=is_pass,
+        is_defensive_action=is_defensive_action,
+        is_regain=is_regain,
+        is_pressure=is_pressure,
+    )
+    df = df[(is_pass | is_defensive_action | is_regain | is_pressure) & df["location"].notna().to_numpy()].copy()
+
+    # Opponent of every team in its match
+    teams_df = df[["match_id", "team"]].drop_duplicates()
+    opponents_df = teams_df.merge(teams_df, on="match_id", suffixes=("", "_opponent"))
+    opponents_df = opponents_df[opponents_df["team"] != opponents_df["team_opponent"]]
+    df = df.merge(
+        opponents_df.rename(columns={"team_opponent": "opponent"}),
+        on=["match_id", "team"],
+        how="left",
+    )
+
+    # Location and match window
+    df[["x", "y"]] = pd.DataFrame([location[:2] for location in df["location"]], index=df.index, columns=["x", "y"])
+    df["window"] = (df["minute"] // pressing.window_minutes).astype(int)
+    df["under_pressure"] = df["under_pressure"].fillna(False).astype(bool)
+    df["counterpress"] = df["counterpress"].fillna(False).astype(bool)
+
+    logger.info("Transformed %d records from events data to pressing events.", len(df))
+
+    # Select relevant columns
+    cols = [
+        "match_id", "team", "opponent", "period", "minute", "window", "type", "x", "y",
+        "under_pressure", "counterpress", "is_pass", "is_defensive_action", "is_regain", "is_pressure",
+    ]
+
+    return df[cols]
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Get a column, or an empty column if the data doesn't have it."""
+    return df[col] if col in df else pd.Series(np.nan, index=df.index, dtype=object)
@@ -1,10 +1,14 @@
 import pandas as pd
 import numpy as np
 import logging
+from src.extract.normalized_events import as_events_frame
+from src.transform.predicates import BEFORE_FINAL_THIRD, COMPLETED, HAS_LOCATION, IS_CARRY, OPEN_PLAY_PASS, TURNOVER
+from src.transform.streaming import streamable
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
+@streamable
 def transform_to_progressive_actions(events_df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform events data to progressive actions.
@@ -20,21 +24,14 @@ def transform_to_progressive_actions(events_df: pd.DataFrame) -> pd.DataFrame:
         The transformed progressive actions (passes and carries).
     """
 
-    logger.info(f"Transforming {len(events_df)} records from events data to progressive actions...")
+    events_df = as_events_frame(events_df, types=["Pass", "Carry"], tables=["pass", "carry"])
 
-    # Collect passes and carries
-    df = events_df[
-        (
-            (events_df["type"] == "Pass") & (events_df["pass_outcome"].isna()) &
-            (events_df["pass_type"] != "Goal Kick") &
-            (events_df["pass_type"] != "Corner") &
-            (events_df["pass_type"] != "Free Kick") &
-            (events_df["pass_type"] != "Throw In")
-        ) |
-        (events_df["type"] == "Carry")
-    ].copy()
+    logger.info("Transforming %d records from events data to progressive actions...", len(events_df))
 
-    logger.info(f"Found {len(df)} actions (passes and carries).")
+    # Collect completed open play passes and carries
+    df = events_df[((OPEN_PLAY_PASS & COMPLETED) | IS_CARRY).mask(events_df)].copy()
+
+    logger.info("Found %d actions (passes and carries).", len(df))
 
     # Combine end locations into one column
     df["end_location"] = np.where(
@@ -53,12 +50,12 @@ def transform_to_progressive_actions(events_df: pd.DataFrame) -> pd.DataFrame:
     # Filter out actions with progression distance less than 10 yards
     df = df[df["progression"] > 10]
 
-    logger.info(f"Found {len(df)} progressive actions (passes and carries).")
+    logger.info("Found %d progressive actions (passes and carries).", len(df))
 
     # Only keep actions before final third
-    df = df[df["x"] < 80]
+    df = df[BEFORE_FINAL_THIRD.mask(df)]
 
-    logger.info(f"Done! Found {len(df)} progressive actions in own half (x < 60).")
+    logger.info("Done! Found %d progressive actions in own half (x < 60).", len(df))
 
     # Select relevant columns
     cols = [
@@ -69,6 +66,7 @@ def transform_to_progressive_actions(events_df: pd.DataFrame) -> pd.DataFrame:
 
     return df[cols]
 
+@streamable
 def transform_to_turnovers(events_df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform events data to turnovers data.
@@ -84,49 +82,19 @@ def transform_to_turnovers(events_df: pd.DataFrame) -> pd.DataFrame:
         The transformed turnovers data.
     """
 
-    logger.info(f"Transforming {len(events_df)} records from events data to turnovers data...")
+    events_df = as_events_frame(events_df, tables=["pass", "dribble", "ball_receipt", "duel", "50_50"])
+
+    logger.info("Transforming %d records from events data to turnovers data...", len(events_df))
+
+    # Turnover events (masks are evaluated on the whole frame, so they're shared with other transforms)
+    df = events_df[HAS_LOCATION.mask(events_df) & TURNOVER.mask(events_df)].copy()
 
-    # Filter to own half once
-    df = events_df[events_df["location"].notna()].copy()
+    # Filter to own half
     df[["x", "y"]] = pd.DataFrame(df["location"].tolist(), index=df.index)
-    df = df[df["x"] < 80]
+    df = df[BEFORE_FINAL_THIRD.mask(df)].copy()
 
-    # Create boolean masks for different turnover types
-    type_mask = (df["type"] == "Dispossessed") | (df["type"] == "Miscontrol")
-    
     fifty_fifty_mask = (df["type"] == "50/50")
-    
-    pass_mask = (
-        (df["type"] == "Pass") &
-        (df["pass_outcome"].notna()) &
-        (df["pass_type"] != "Goal Kick") &
-        (df["pass_type"] != "Corner") &
-        (df["pass_type"] != "Free Kick") &
-        (df["pass_type"] != "Throw In") &
-        (df["pass_outcome"] != "Injury Clearance")
-    )
-    
-    dribble_mask = (df["dribble_outcome"] == "Incomplete")
-    
-    ball_receipt_mask = (df["ball_receipt_outcome"] == "Incomplete")
-    
-    duel_mask = (
-        (df["type"] == "Duel") &
-        (df["team"] == df["possession_team"]) &
-        (
-            (df["duel_outcome"].isna()) | 
-            (df["duel_outcome"] == "Lost") |
-            (df["duel_outcome"] == "Lost In Play") |
-            (df["duel_outcome"] == "Lost Out")
-        )
-    )
 
-    # Combine all masks
-    turnover_mask = type_mask | fifty_fifty_mask | pass_mask | dribble_mask | ball_receipt_mask | duel_mask
-    
-    # Filter turnovers
-    df = df[turnover_mask].copy()
-    
     # Handle 50/50 events
     df.loc[fifty_fifty_mask, "50_50"] = df.loc[fifty_fifty_mask, "50_50"].apply(
         lambda x: x["outcome"]["name"] if isinstance(x, dict) and "outcome" in x and "name" in x["outcome"] else x
@@ -135,12 +103,12 @@ def transform_to_turnovers(events_df: pd.DataFrame) -> pd.DataFrame:
     # Filter 50/50s to only lost ones
     df = df[~fifty_fifty_mask | ((df["type"] == "50/50") & ((df["50_50"] == "Lost") | (df["50_50"] == "Success To Opposition")))]
 
-    logger.info(f"Found {len(df)} turnovers.")
+    logger.info("Found %d turnovers.", len(df))
 
     # Remove duplicates
     df = df.drop_duplicates(subset=["id"])
 
-    logger.info(f"Filtered out duplicates. {len(df)} turnovers left.")
+    logger.info("Filtered out duplicates. %d turnovers left.", len(df))
 
     # Select relevant columns
     turnover_cols = [
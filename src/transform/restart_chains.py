@@ -0,0 +1,120 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Iterable, Optional, Sequence
+
+from src.config import config, LazyMetric
+from src.extract.normalized_events import as_events_frame
+from src.transform.kernels import cumulative_count, possession_rank, possession_start_values
+from src.transform.streaming import streamable
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@streamable
+def transform_to_restart_chains(
+    df: pd.DataFrame,
+    restart_types: Optional[Iterable[str]] = None,
+    chain_depth: Optional[int] = None,
+    pass_length_bins: Optional[Sequence[float]] = None,
+    pass_length_labels: Optional[Sequence[str]] = None,
+    skip_goalkeeper_restarts: bool = True,
+) -> pd.DataFrame:
+    """
+    Transform events data to restart chains: the first passes of possessions that start with a
+    goal kick, throw-in, free kick or corner.
+
+    All restart types are extracted in one pass. Phase 1 is the restart pass itself; a later
+    phase is only kept if all earlier passes of the chain were completed and (optionally) the
+    restart wasn't taken by the goalkeeper, like the second phase of ``transform_to_build_up_events``.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events data to transform.
+    restart_types: Optional[Iterable[str]]
+        The restart pass types to keep (e.g. "Goal Kick", "Throw-in"), by default all restart types from the config.
+    chain_depth: Optional[int]
+        The number of passes to keep per chain, by default the value from the config.
+    pass_length_bins: Optional[Sequence[float]]
+        The bin edges (in yards) used to categorize pass length, by default the bins from the config.
+    pass_length_labels: Optional[Sequence[str]]
+        The labels of the pass length bins, by default the labels from the config.
+    skip_goalkeeper_restarts: bool
+        Only keep the first phase of chains where the restart is taken by the goalkeeper.
+
+    Returns:
+    --------
+    df: pd.DataFrame
+        The restart chain passes with their restart type and phase.
+    """
+
+    chain_depth = chain_depth or config.restarts.chain_depth
+    pass_length_bins = pass_length_bins or config.restarts.pass_length_bins
+    pass_length_labels = pass_length_labels or config.restarts.pass_length_labels
+
+    selected = None if restart_types is None else set(restart_types)
+    play_patterns = {
+        play_pattern: restart_type
+        for play_pattern, restart_type in config.restarts.play_patterns.items()
+        if selected is None or restart_type in selected
+    }
+
+    df = as_events_frame(df, types=["Pass"], tables=["pass"])
+
+    logger.info("Transforming %d records from events data to restart chains.", len(df))
+
+    # Filter for passes in possessions that start from a restart
+    df = df[
+        (df["play_pattern"].isin(list(play_patterns))) &
+        (df["type"] == "Pass")
+    ].copy()
+
+    # Sort passes in every possession chain
+    df = df.sort_values(["match_id", "possession", "timestamp"], kind="stable").reset_index(drop=True)
+    match = df["match_id"].to_numpy()
+    possession = df["possession"].to_numpy()
+
+    # Phase of every pass in its chain
+    df["restart_type"] = df["play_pattern"].map(play_patterns)
+    df["phase"] = possession_rank(match, possession, np.ones(len(df), dtype=bool))
+
+    # Keep chains that start with the restart pass
+    keep = possession_start_values(match, possession, (df["pass_type"] == df["restart_type"]).to_numpy())
+
+    # A later phase needs all earlier passes of the chain to be completed
+    incomplete = df["pass_outcome"].notna().to_numpy()
+    earlier_incomplete = cumulative_count(match, possession, incomplete) - incomplete
+    phase = df["phase"].to_numpy()
+    later_phase_valid = (phase <= chain_depth) & (earlier_incomplete == 0)
+
+    if skip_goalkeeper_restarts:
+        later_phase_valid &= possession_start_values(match, possession, (df["position"] != "Goalkeeper").to_numpy())
+
+    keep &= (phase == 1) | later_phase_valid
+
+    df = df[keep].copy()
+
+    logger.info(
+        "Found %s restarts and %d restart chain passes.",
+        LazyMetric(lambda: int((df["phase"] == 1).sum())), len(df),
+    )
+
+    # Split locations
+    df[["x", "y"]] = pd.DataFrame(df["location"].tolist(), index=df.index)
+    df[["end_x", "end_y"]] = pd.DataFrame(df["pass_end_location"].tolist(), index=df.index)
+
+    # Categorize pass length
+    df["pass_category"] = pd.cut(
+        df["pass_length"],
+        bins=pass_length_bins,
+        labels=pass_length_labels,
+    )
+
+    # Select relevant columns
+    cols = [
+        "match_id", "team", "player", "position", "timestamp", "possession", "type", "restart_type", "phase",
+        "x", "y", "end_x", "end_y", "pass_type", "pass_outcome", "pass_length", "pass_category"
+    ]
+
+    return df[cols].reset_index(drop=True)
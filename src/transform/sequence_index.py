@@ -0,0 +1,198 @@
+import logging
+from dataclasses import dataclass, fields
+from typing import Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.extract.normalized_events import NormalizedEvents, as_events_frame
+from src.transform.kernels import possession_starts, timestamp_to_ms
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SequenceIndex:
+    """
+    Links between the events of a frame in match order.
+
+    The events are sorted once by match, period, time and event index. All links are row
+    positions in the original frame (``-1`` if there is no such event), so "the next event in
+    the possession" or "the next action of the same player" of every event is one array lookup
+    instead of a filter on the whole frame, e.g. ``index.take(df["type"], index.next_in_possession)``.
+
+    Attributes:
+    ----------
+    order: np.ndarray
+        The positions of the events in match order.
+    possession_offsets: np.ndarray
+        Offsets of every possession in ``order`` (length n_possessions + 1), the events of the
+        i-th possession are ``order[possession_offsets[i]:possession_offsets[i + 1]]``.
+    possession_number: np.ndarray
+        The possession (position in ``possession_offsets``) of every event.
+    prev_in_possession: np.ndarray
+        The position of the previous event in the same possession.
+    next_in_possession: np.ndarray
+        The position of the next event in the same possession.
+    prev_by_player: np.ndarray
+        The position of the previous event of the same player in the same match.
+    next_by_player: np.ndarray
+        The position of the next event of the same player in the same match.
+    period: np.ndarray
+        The period of every event.
+    t_ms: np.ndarray
+        The time of every event within its period in milliseconds.
+    """
+
+    order: np.ndarray
+    possession_offsets: np.ndarray
+    possession_number: np.ndarray
+    prev_in_possession: np.ndarray
+    next_in_possession: np.ndarray
+    prev_by_player: np.ndarray
+    next_by_player: np.ndarray
+    period: np.ndarray
+    t_ms: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def build(cls, df: Union[pd.DataFrame, NormalizedEvents]) -> "SequenceIndex":
+        """
+        Build the index of an events frame.
+
+        Parameters:
+        ----------
+        df: Union[pd.DataFrame, NormalizedEvents]
+            The events with match_id, period, timestamp, index, possession and player columns.
+
+        Returns:
+        --------
+        SequenceIndex
+            The index, aligned with the rows of the (wide) events frame.
+        """
+        df = as_events_frame(df)
+        n_events = len(df)
+        match = pd.factorize(df["match_id"])[0].astype(np.int64)
+        period = df["period"].to_numpy(dtype=np.int64)
+        t_ms = timestamp_to_ms(df["timestamp"])
+        event_index = df["index"].to_numpy(dtype=np.int64) if "index" in df else np.arange(n_events, dtype=np.int64)
+        possession = df["possession"].to_numpy(dtype=np.int64)
+
+        # Match order
+        order = np.lexsort((event_index, t_ms, period, match))
+
+        # Possessions are the runs of equal match and possession number in match order
+        starts = possession_starts(match[order], possession[order])
+        possession_offsets = np.append(np.flatnonzero(starts), n_events).astype(np.int64)
+        possession_number = np.empty(n_events, dtype=np.int64)
+        possession_number[order] = np.cumsum(starts) - 1
+
+        prev_in_possession, next_in_possession = _link(order, ~starts[1:])
+
+        # Same player (and match) links: group the events by player, keeping match order within a player
+        player = pd.factorize(df["player_id"] if "player_id" in df else df["player"])[0].astype(np.int64)
+        rank = np.empty(n_events, dtype=np.int64)
+        rank[order] = np.arange(n_events)
+        by_player = np.lexsort((rank, player, match))
+        same_player = (
+            (match[by_player][1:] == match[by_player][:-1]) &
+            (player[by_player][1:] == player[by_player][:-1]) &
+            (player[by_player][1:] >= 0)
+        )
+        prev_by_player, next_by_player = _link(by_player, same_player)
+
+        logger.info("Indexed %d events in %d possessions.", n_events, len(possession_offsets) - 1)
+
+        return cls(
+            order=order.astype(np.int64),
+            possession_offsets=possession_offsets,
+            possession_number=possession_number,
+            prev_in_possession=prev_in_possession,
+            next_in_possession=next_in_possession,
+            prev_by_player=prev_by_player,
+            next_by_player=next_by_player,
+            period=period,
+            t_ms=t_ms,
+        )
+
+    @property
+    def n_possessions(self) -> int:
+        """Number of possessions."""
+        return len(self.possession_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays."""
+        return sum(getattr(self, field.name).nbytes for field in fields(self))
+
+    @property
+    def possession_start(self) -> np.ndarray:
+        """The position of the first event of the possession of every event."""
+        return self.order[self.possession_offsets[:-1]][self.possession_number]
+
+    @property
+    def possession_end(self) -> np.ndarray:
+        """The position of the last event of the possession of every event."""
+        return self.order[self.possession_offsets[1:] - 1][self.possession_number]
+
+    def take(self, values: Any, positions: np.ndarray, fill_value: Any = np.nan) -> np.ndarray:
+        """
+        Look up values of the linked events.
+
+        Parameters:
+        ----------
+        values: Any
+            The values of every event (a column or array aligned with the frame).
+        positions: np.ndarray
+            The linked positions (e.g. ``next_in_possession``), -1 for no event.
+        fill_value: Any
+            The value for events without a link.
+
+        Returns:
+        --------
+        np.ndarray
+            The values of the linked events.
+        """
+        values = np.asarray(values)
+        missing = positions < 0
+        taken = values[np.where(missing, 0, positions)] if len(values) else values[:0]
+
+        if not missing.any():
+            return taken
+
+        if not np.can_cast(np.asarray(fill_value).dtype, taken.dtype, casting="same_kind"):
+            taken = taken.astype(object if taken.dtype.kind in "OUS" else float)
+        taken[missing] = fill_value
+        return taken
+
+    def time_to(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Seconds from every event to the linked event (e.g. from a reception to the next action of the player).
+
+        Parameters:
+        ----------
+        positions: np.ndarray
+            The linked positions, -1 for no event.
+
+        Returns:
+        --------
+        np.ndarray
+            The time to the linked event in seconds, NaN without a link or if the events are in different periods.
+        """
+        missing = positions < 0
+        linked = np.where(missing, np.arange(len(positions)), positions)
+        seconds = (self.t_ms[linked] - self.t_ms) / 1000
+
+        return np.where(missing | (self.period[linked] != self.period), np.nan, seconds)
+
+def _link(order: np.ndarray, linked: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Previous and next positions of consecutive events in ``order`` (``linked[i]`` links ``order[i]`` and ``order[i + 1]``)."""
+    prev_positions = np.full(len(order), -1, dtype=np.int64)
+    next_positions = np.full(len(order), -1, dtype=np.int64)
+
+    next_positions[order[:-1][linked]] = order[1:][linked]
+    prev_positions[order[1:][linked]] = order[:-1][linked]
+
+    return prev_positions, next_positions
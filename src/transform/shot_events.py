@@ -1,10 +1,15 @@
 import pandas as pd
 import numpy as np
 import logging
+from src.config import LazyMetric
+from src.extract.normalized_events import as_events_frame
+from src.transform.kernels import classify_set_piece_origin
+from src.transform.streaming import streamable
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
 
+@streamable
 def transform_to_shot_events(df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform events data to shot events.
@@ -20,82 +25,31 @@ def transform_to_shot_events(df: pd.DataFrame) -> pd.DataFrame:
         The transformed shot events.
     """
 
-    logger.info(f"Transforming {len(df)} records from events data to shot events.")
+    # Classification needs every event of the possession
+    df = as_events_frame(df, tables=["shot"])
+
+    logger.info("Transforming %d records from events data to shot events.", len(df))
+
+    # Classify shot origin (on all events, the possession start and action counts need the whole possession)
+    from_set_piece = classify_set_piece_origin(df)
 
     # Filter for shot events
     df = df[df["type"] == "Shot"].copy()
+    df["shot_from_set_piece"] = from_set_piece[df.index]
 
     # Filter out penalty events
     df = df[df["shot_type"] != "Penalty"]
 
-    # Classify shot origin
-    df["shot_from_set_piece"] = df.apply(
-        lambda x: classify_shot_from_set_piece(df, x), axis=1
-    )
-
-    logger.info(f"Transformed {len(df)} records from events data to shot events.")
-    logger.info(f"Shots from set piece: {len(df[df['shot_from_set_piece']])}")
-    logger.info(f"Shots from open play: {len(df[~df['shot_from_set_piece']])}")
+    logger.info("Transformed %d records from events data to shot events.", len(df))
+    shots_from_set_piece = LazyMetric(lambda: int(df["shot_from_set_piece"].sum()))
+    shots_from_open_play = LazyMetric(lambda: int((~df["shot_from_set_piece"]).sum()))
+    logger.info("Shots from set piece: %s", shots_from_set_piece, extra={"metrics": {"shots_from_set_piece": shots_from_set_piece}})
+    logger.info("Shots from open play: %s", shots_from_open_play, extra={"metrics": {"shots_from_open_play": shots_from_open_play}})
 
     # Select relevant columns
     shot_cols = [
-        "match_id", "team", "player", "location", "timestamp", "possession", "type", "play_pattern", "shot_from_set_piece", "shot_type", "shot_aerial_won", "shot_body_part", "shot_end_location", "shot_first_time", "shot_follows_dribble", 
-        "shot_one_on_one", "shot_outcome", "shot_redirect", "shot_saved_off_target", "shot_saved_to_post", "shot_statsbomb_xg", "shot_technique"
+        "id", "match_id", "team", "player", "location", "timestamp", "possession", "type", "play_pattern", "shot_from_set_piece", "shot_type", "shot_aerial_won", "shot_body_part", "shot_end_location", "shot_first_time", "shot_follows_dribble", 
+        "shot_one_on_one", "shot_outcome", "shot_redirect", "shot_saved_off_target", "shot_saved_to_post", "shot_statsbomb_xg", "shot_technique", "shot_freeze_frame"
     ]
 
     return df[shot_cols]
-
-def classify_shot_from_set_piece(
-    events_df: pd.DataFrame, 
-    shot_event: pd.Series
-) -> bool:
-    """
-    Classify if a shot comes from a set piece based on time OR action count
-
-    Parameters:
-    ----------
-    events_df: pd.DataFrame
-        The events data to classify.
-    shot_event: pd.Series
-        The shot event to classify.
-
-    Returns:
-    --------
-    bool:
-        True if the shot comes from a set piece, False otherwise.
-    """
-    match_id = shot_event['match_id']
-    possession = shot_event['possession']
-    
-    # Get all events in the same possession
-    possession_events = events_df[
-        (events_df['match_id'] == match_id) & 
-        (events_df['possession'] == possession)
-    ].sort_values('timestamp')
-    
-    # Find the first event (set piece origin)
-    first_event = possession_events.iloc[0]
-    
-    # Get events up to and including this specific shot
-    events_up_to_shot = possession_events[
-        possession_events['timestamp'] <= shot_event['timestamp']
-    ]
-    
-    # Calculate time elapsed (in seconds)
-    first_time = pd.to_timedelta(first_event['timestamp']).total_seconds()
-    shot_time = pd.to_timedelta(shot_event['timestamp']).total_seconds()
-    time_elapsed = shot_time - first_time
-    
-    # Count possessing actions (passes, carries, dribbles) up to this shot
-    possessing_actions = events_up_to_shot[
-        events_up_to_shot['type'].isin(['Pass', 'Carry', 'Dribble'])
-    ]
-    actions_between = len(possessing_actions)
-    
-    # Apply hybrid cutoffs based on play_pattern
-    play_pattern = first_event['play_pattern']
-    
-    if play_pattern in ["From Corner", "From Free Kick", "From Throw In"]:
-        return (time_elapsed <= 10) or (actions_between <= 5)
-    else:
-        return False
\ No newline at end of file
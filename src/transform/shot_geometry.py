@@ -0,0 +1,197 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Optional
+
+from src.config import config, LazyMetric
+from src.extract.three_sixty import FreezeFrames
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def freeze_frames_from_shots(shots_df: pd.DataFrame) -> FreezeFrames:
+    """
+    Flatten the StatsBomb shot freeze frames into columnar freeze frames.
+
+    Shots without a freeze frame get an empty frame, so frame i belongs to row i of the shots.
+
+    Parameters:
+    ----------
+    shots_df: pd.DataFrame
+        The shots with id, match_id and shot_freeze_frame columns (from ``transform_to_shot_events``).
+
+    Returns:
+    --------
+    FreezeFrames
+        The freeze frames of the shots (without visible areas).
+    """
+    frames = [frame if isinstance(frame, (list, tuple, np.ndarray)) else [] for frame in shots_df["shot_freeze_frame"]]
+    players = [player for frame in frames for player in frame]
+    locations = np.array([player["location"][:2] for player in players], dtype=np.float32).reshape(-1, 2)
+
+    return FreezeFrames(
+        event_ids=shots_df["id"].to_numpy(dtype="U36"),
+        match_ids=shots_df["match_id"].to_numpy(dtype=np.int64),
+        offsets=np.concatenate([[0], np.cumsum([len(frame) for frame in frames])]).astype(np.int64),
+        x=locations[:, 0],
+        y=locations[:, 1],
+        teammate=np.array([bool(player.get("teammate")) for player in players], dtype=bool),
+        actor=np.array([bool(player.get("actor")) for player in players], dtype=bool),
+        keeper=np.array([_position_name(player) == "Goalkeeper" for player in players], dtype=bool),
+        visible_offsets=np.zeros(len(frames) + 1, dtype=np.int64),
+        visible_area=np.array([], dtype=np.float32),
+    )
+
+def transform_to_shot_geometry(
+    shots_df: pd.DataFrame,
+    frames: Optional[FreezeFrames] = None,
+) -> pd.DataFrame:
+    """
+    Transform shots to shot context features from their freeze frames.
+
+    - Goal angle: the angle between the posts seen from the shot location.
+    - Defenders and teammates in the shooting triangle (shot location and both posts).
+    - Nearest defender distance (outfield opponents).
+    - Keeper position and distance to the shot.
+    - Open goal angle: the part of the goal angle not covered by opponents in front of the
+      shooter, every opponent covering the angle of a body of ``config.shot_geometry.player_radius``.
+
+    All shots are computed at once on the flat player arrays: every player is mapped to its
+    shot with ``frame_index``, per-shot minima and counts use ``np.minimum.at`` and ``np.bincount``
+    and the covered angles are merged with one sort and one running maximum.
+
+    Parameters:
+    ----------
+    shots_df: pd.DataFrame
+        The shots (from ``transform_to_shot_events``).
+    frames: Optional[FreezeFrames]
+        The freeze frames of the shots in the same order (e.g. StatsBomb 360 frames), by default
+        flattened from ``shot_freeze_frame``. The shooter (``actor``) is left out of all features.
+
+    Returns:
+    --------
+    df: pd.DataFrame
+        The shot geometry features, one row per shot.
+    """
+
+    geometry = config.shot_geometry
+    frames = frames if frames is not None else freeze_frames_from_shots(shots_df)
+
+    logger.info("Transforming %d shots with %d freeze frame players to shot geometry.", len(shots_df), frames.n_players)
+
+    n_shots = len(shots_df)
+    shot_xy = np.array(
+        [location[:2] if isinstance(location, (list, tuple, np.ndarray)) else [np.nan, np.nan] for location in shots_df["location"]],
+        dtype=float,
+    ).reshape(-1, 2)
+    sx, sy = shot_xy[:, 0], shot_xy[:, 1]
+
+    # Angles of the posts seen from the shot (0 is straight at the goal line)
+    left_post, right_post = geometry.goal_y
+    left_angle = np.arctan2(left_post - sy, geometry.goal_x - sx)
+    right_angle = np.arctan2(right_post - sy, geometry.goal_x - sx)
+    goal_angle = right_angle - left_angle
+
+    # Players relative to their shot
+    shot = frames.frame_index
+    px, py = frames.x.astype(float), frames.y.astype(float)
+    dx, dy = px - sx[shot], py - sy[shot]
+    distance = np.hypot(dx, dy)
+    # The shooter (actor in 360 freeze frames) sits on the vertex of the triangle and isn't counted
+    others = ~frames.actor
+    opponent = frames.opponent & others
+    teammate = frames.teammate & others
+    keeper = frames.keeper & opponent
+    in_triangle = _in_triangle(
+        px, py, sx[shot], sy[shot],
+        np.full_like(px, geometry.goal_x), np.full_like(px, left_post),
+        np.full_like(px, geometry.goal_x), np.full_like(px, right_post),
+    )
+
+    # Counts and nearest defender
+    defenders_in_triangle = np.bincount(shot[opponent & in_triangle], minlength=n_shots)
+    teammates_in_triangle = np.bincount(shot[teammate & in_triangle], minlength=n_shots)
+
+    nearest_defender = np.full(n_shots, np.inf)
+    outfield = opponent & ~keeper
+    np.minimum.at(nearest_defender, shot[outfield], distance[outfield])
+    nearest_defender[np.isinf(nearest_defender)] = np.nan
+
+    # Keeper
+    keeper_x, keeper_y, keeper_distance = (np.full(n_shots, np.nan) for _ in range(3))
+    keeper_x[shot[keeper]] = px[keeper]
+    keeper_y[shot[keeper]] = py[keeper]
+    keeper_distance[shot[keeper]] = distance[keeper]
+
+    # Open goal angle: merge the angles covered by opponents in front of the shooter
+    blocking = opponent & (dx > 0) & (distance > 0)
+    angle = np.arctan2(dy[blocking], dx[blocking])
+    half_width = np.arctan2(geometry.player_radius, distance[blocking])
+    start = np.maximum(angle - half_width, left_angle[shot[blocking]])
+    end = np.minimum(angle + half_width, right_angle[shot[blocking]])
+    covers = end > start
+    covered = _covered_length(shot[blocking][covers], start[covers], end[covers], n_shots)
+    open_goal_angle = np.where(np.isnan(goal_angle), np.nan, np.maximum(goal_angle - covered, 0))
+
+    has_frame = frames.lengths > 0
+
+    # Shots from the goal line outside the posts see no goal
+    open_goal_share = np.full(n_shots, np.nan)
+    sees_goal = has_frame & (goal_angle > 0)
+    open_goal_share[sees_goal] = open_goal_angle[sees_goal] / goal_angle[sees_goal]
+
+    shot_geometry_df = pd.DataFrame({
+        "id": shots_df["id"].to_numpy(),
+        "match_id": shots_df["match_id"].to_numpy(),
+        "team": shots_df["team"].to_numpy(),
+        "player": shots_df["player"].to_numpy(),
+        "x": sx,
+        "y": sy,
+        "distance": np.hypot(geometry.goal_x - sx, (left_post + right_post) / 2 - sy),
+        "goal_angle": np.degrees(goal_angle),
+        "defenders_in_triangle": np.where(has_frame, defenders_in_triangle, np.nan),
+        "teammates_in_triangle": np.where(has_frame, teammates_in_triangle, np.nan),
+        "nearest_defender_distance": nearest_defender,
+        "keeper_x": keeper_x,
+        "keeper_y": keeper_y,
+        "keeper_distance": keeper_distance,
+        "open_goal_angle": np.where(has_frame, np.degrees(open_goal_angle), np.nan),
+        "open_goal_pct": (open_goal_share * 100).round(0),
+    })
+
+    logger.info(
+        "Transformed %d shots to shot geometry (%s with a freeze frame).",
+        len(shot_geometry_df), LazyMetric(lambda: int(has_frame.sum())),
+    )
+
+    return shot_geometry_df
+
+def _in_triangle(px, py, ax, ay, bx, by, cx, cy) -> np.ndarray:
+    """Whether the points are inside (or on the edge of) the triangles (a, b, c), from the signs of the cross products."""
+    d1 = (px - bx) * (ay - by) - (ax - bx) * (py - by)
+    d2 = (px - cx) * (by - cy) - (bx - cx) * (py - cy)
+    d3 = (px - ax) * (cy - ay) - (cx - ax) * (py - ay)
+    has_negative = (d1 < 0) | (d2 < 0) | (d3 < 0)
+    has_positive = (d1 > 0) | (d2 > 0) | (d3 > 0)
+    return ~(has_negative & has_positive)
+
+def _covered_length(group: np.ndarray, start: np.ndarray, end: np.ndarray, n_groups: int) -> np.ndarray:
+    """Total length of the union of the intervals [start, end) of every group."""
+    covered = np.zeros(n_groups)
+    if len(group) == 0:
+        return covered
+
+    # Shift every group to its own range, so one running maximum merges the intervals of all groups
+    offset = group * 10.0  # angles are within (-pi, pi)
+    order = np.lexsort((start, group))
+    start, end, group = start[order] + offset[order], end[order] + offset[order], group[order]
+
+    reach = np.maximum.accumulate(end)
+    previous_reach = np.concatenate([[-np.inf], reach[:-1]])
+    np.add.at(covered, group, np.maximum(end - np.maximum(start, previous_reach), 0))
+
+    return covered
+
+def _position_name(player: dict) -> Optional[str]:
+    position = player.get("position")
+    return position.get("name") if isinstance(position, dict) else position
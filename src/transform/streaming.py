@@ -0,0 +1,63 @@
+import functools
+import pandas as pd
+import logging
+from typing import Callable, Iterable, Tuple, Union
+
+from src.extract.normalized_events import NormalizedEvents
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def streamable(transform: Callable) -> Callable:
+    """
+    Let a transform function accept an iterator of per-match event frames.
+
+    If the first argument is a DataFrame (or normalized events), the transform is applied as usual. Otherwise the
+    argument is treated as an iterator of per-match frames (e.g. ``iter_event_store()``) and a
+    generator with the transformed result of every match is returned. Results are produced
+    lazily, so peak memory is bounded by the largest match.
+
+    Parameters:
+    ----------
+    transform: Callable
+        The transform function. Its first argument must be the events dataframe.
+
+    Returns:
+    --------
+    Callable
+        The wrapped transform function.
+    """
+
+    @functools.wraps(transform)
+    def wrapper(df, *args, **kwargs):
+        if isinstance(df, (pd.DataFrame, NormalizedEvents)):
+            return transform(df, *args, **kwargs)
+
+        return (transform(match_df, *args, **kwargs) for match_df in df)
+
+    return wrapper
+
+def concat_results(
+    results: Iterable[Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]],
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]:
+    """
+    Concatenate streamed per-match results into one result.
+
+    Parameters:
+    ----------
+    results: Iterable[Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]]
+        The per-match results of a streamed transform. Tuples (e.g. from the build up transform)
+        are concatenated element-wise.
+
+    Returns:
+    --------
+    Union[pd.DataFrame, Tuple[pd.DataFrame, ...]]
+        The concatenated result.
+    """
+
+    results = list(results)
+
+    if len(results) > 0 and isinstance(results[0], tuple):
+        return tuple(pd.concat(parts) for parts in zip(*results))
+
+    return pd.concat(results)
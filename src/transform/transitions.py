@@ -0,0 +1,182 @@
+import pandas as pd
+import numpy as np
+import logging
+from typing import Optional
+from src.config import config
+from src.extract.normalized_events import as_events_frame
+from src.transform.kernels import timestamp_to_ms
+from src.transform.progression_events import transform_to_turnovers
+from src.transform.streaming import streamable
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+# Offset between groups in the sorted (group, time) keys, larger than any period in ms
+_GROUP_OFFSET = 10 ** 9
+
+@streamable
+def transform_to_transitions(
+    df: pd.DataFrame,
+    window_seconds: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Transform events data to transitions: every change of the team in possession within a period.
+
+    Every transition is a regain for the team that wins the ball and a turnover for the team that
+    loses it (the opponent). Transitions where the new possession starts in open play (not from a
+    goal kick, throw-in, kick off or other restart) are flagged as ``open_play``. For both teams, the shots (with xG) and box entries in the window
+    after the transition are counted, and it is checked if the team that won the ball still has
+    it at the end of the window. Windows are looked up with searchsorted on sorted
+    (match, period, team, time) keys and ``merge_asof``, not by filtering the events per transition.
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events data to transform.
+    window_seconds: Optional[float]
+        The length of the window after the transition, by default the value from the config.
+
+    Returns:
+    --------
+    df: pd.DataFrame
+        One row per transition with the outcomes for the team and the opponent.
+    """
+
+    window_ms = int((window_seconds or config.transitions.window_seconds) * 1000)
+    events_df = as_events_frame(df, tables=["pass", "carry", "shot", "dribble", "ball_receipt", "duel", "50_50"])
+
+    logger.info("Transforming %d records from events data to transitions.", len(events_df))
+
+    events_df = events_df.assign(t_ms=timestamp_to_ms(events_df["timestamp"]))
+
+    # First event of every possession
+    starts_df = events_df.sort_values(["match_id", "index"], kind="stable").drop_duplicates(["match_id", "possession"])
+    starts_df = starts_df.sort_values(["match_id", "possession"]).reset_index(drop=True)
+
+    # Possession changes within a period
+    previous = starts_df.groupby("match_id")[["possession", "possession_team", "period"]].shift()
+    changes = (
+        previous["possession_team"].notna() &
+        (starts_df["possession_team"] != previous["possession_team"]) &
+        (starts_df["period"] == previous["period"])
+    )
+
+    transitions_df = pd.DataFrame({
+        "match_id": starts_df["match_id"],
+        "period": starts_df["period"],
+        "possession": starts_df["possession"],
+        "previous_possession": previous["possession"],
+        "timestamp": starts_df["timestamp"],
+        "t_ms": starts_df["t_ms"],
+        "team": starts_df["possession_team"],
+        "opponent": previous["possession_team"],
+        "play_pattern": starts_df["play_pattern"],
+        "location": starts_df["location"],
+    })[changes.to_numpy()].reset_index(drop=True)
+
+    logger.info("Found %d transitions.", len(transitions_df))
+
+    # Shots and box entries that can follow a transition
+    shots_df = events_df[(events_df["type"] == "Shot") & (events_df["shot_type"] != "Penalty")]
+    entries_df = _box_entries(events_df)
+
+    t0 = transitions_df["t_ms"].to_numpy()
+    t1 = t0 + window_ms
+
+    for side in ("team", "opponent"):
+        shot_count, xg, first_shot = _window_counts(
+            shots_df, transitions_df, side, t0, t1, weights=shots_df["shot_statsbomb_xg"].fillna(0).to_numpy(dtype=float)
+        )
+        entry_count, _, _ = _window_counts(entries_df, transitions_df, side, t0, t1)
+
+        transitions_df[f"{side}_shots"] = shot_count
+        transitions_df[f"{side}_xg"] = xg
+        transitions_df[f"{side}_box_entries"] = entry_count
+
+        if side == "team":
+            transitions_df["time_to_shot"] = (first_shot - t0) / 1000
+
+    # Team in possession at the end of the window
+    possession_at_end = pd.merge_asof(
+        transitions_df[["match_id", "period"]].assign(t_ms=t1).reset_index().sort_values("t_ms"),
+        starts_df[["match_id", "period", "t_ms", "possession_team"]].sort_values("t_ms"),
+        on="t_ms",
+        by=["match_id", "period"],
+    ).set_index("index").sort_index()
+    transitions_df["kept_possession"] = (possession_at_end["possession_team"] == transitions_df["team"]).to_numpy()
+
+    # Ball won in open play, not given back by a restart
+    transitions_df["open_play"] = transitions_df["play_pattern"].isin(config.transitions.open_play_patterns).to_numpy()
+
+    # Turnover (from transform_to_turnovers) that ended the previous possession, if any
+    turnovers_df = transform_to_turnovers(events_df.drop(columns="t_ms"))
+    last_turnovers = turnovers_df.drop_duplicates(["match_id", "possession"], keep="last")
+    transitions_df = transitions_df.merge(
+        last_turnovers[["match_id", "possession", "id"]].rename(columns={"possession": "previous_possession", "id": "turnover_id"}),
+        on=["match_id", "previous_possession"],
+        how="left",
+    )
+
+    # Split locations
+    transitions_df[["x", "y"]] = pd.DataFrame(
+        [location[:2] if isinstance(location, (list, tuple, np.ndarray)) else [np.nan, np.nan] for location in transitions_df["location"]],
+        index=transitions_df.index,
+        columns=["x", "y"],
+    )
+
+    logger.info("Transformed %d records from events data to transitions.", len(transitions_df))
+
+    # Select relevant columns
+    cols = [
+        "match_id", "period", "possession", "timestamp", "team", "opponent", "play_pattern", "open_play", "x", "y", "turnover_id",
+        "team_shots", "team_xg", "team_box_entries", "time_to_shot",
+        "opponent_shots", "opponent_xg", "opponent_box_entries", "kept_possession",
+    ]
+
+    return transitions_df[cols]
+
+def _box_entries(events_df: pd.DataFrame) -> pd.DataFrame:
+    """Passes and carries that start outside and end inside the box (as in ``transform_to_box_entry_events``)."""
+    df = events_df[events_df["type"].isin(["Pass", "Carry"]) & events_df["location"].notna()]
+    end_location = df["carry_end_location"].where(df["type"] == "Carry", df["pass_end_location"])
+    has_end = end_location.map(lambda location: isinstance(location, (list, tuple, np.ndarray))).to_numpy(dtype=bool)
+    df, end_location = df[has_end], end_location[has_end]
+
+    xy = np.array([location[:2] for location in df["location"]], dtype=float).reshape(-1, 2)
+    end_xy = np.array([location[:2] for location in end_location], dtype=float).reshape(-1, 2)
+    in_box = lambda xy: (xy[:, 0] >= 102) & (xy[:, 1] >= 18) & (xy[:, 1] <= 62)
+
+    return df[~in_box(xy) & in_box(end_xy)]
+
+def _window_counts(
+    events_df: pd.DataFrame,
+    transitions_df: pd.DataFrame,
+    side: str,
+    t0: np.ndarray,
+    t1: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+):
+    """Count (and sum the weights of) the events of a side in [t0, t1] after every transition, and the time of the first one."""
+    # Shared group codes of (match, period, team) for the events and the transitions
+    keys = pd.concat([
+        events_df[["match_id", "period", "team"]],
+        transitions_df[["match_id", "period", side]].rename(columns={side: "team"}),
+    ], ignore_index=True)
+    codes = keys.groupby(["match_id", "period", "team"], sort=False).ngroup().to_numpy(dtype=np.int64)
+    event_codes, transition_codes = codes[:len(events_df)], codes[len(events_df):]
+
+    # Sorted (group, time) keys of the events and cumulative weights
+    event_keys = event_codes * _GROUP_OFFSET + events_df["t_ms"].to_numpy(dtype=np.int64)
+    order = np.argsort(event_keys, kind="stable")
+    event_keys = event_keys[order]
+    weights = np.ones(len(events_df)) if weights is None else weights
+    cumulative = np.concatenate([[0.0], np.cumsum(weights[order])])
+
+    start = np.searchsorted(event_keys, transition_codes * _GROUP_OFFSET + t0, side="left")
+    end = np.searchsorted(event_keys, transition_codes * _GROUP_OFFSET + t1, side="right")
+
+    first_time = np.full(len(t0), np.nan)
+    found = end > start
+    first_time[found] = event_keys[start[found]] - transition_codes[found] * _GROUP_OFFSET
+
+    return end - start, cumulative[end] - cumulative[start], first_time
@@ -0,0 +1,146 @@
+import logging
+import matplotlib.pyplot as plt
+from mplsoccer import Pitch, VerticalPitch
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple, Union
+
+from src.config import styling
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def plot_arrows(
+    pitch: Union[Pitch, VerticalPitch],
+    df: pd.DataFrame,
+    ax: plt.Axes,
+    max_arrows: Optional[int] = None,
+    mode: Optional[str] = None,
+    bins: Optional[Tuple[int, int]] = None,
+    **kwargs,
+) -> None:
+    """
+    Plot actions as arrows with a level of detail that depends on the number of actions.
+
+    Up to ``max_arrows`` actions every action is drawn as an arrow. Above that the actions
+    are aggregated, so the number of artists (and the rendering time) stays constant:
+    - 'flow': one arrow per start zone with the mean start location and mean direction.
+    - 'lines': all actions as a single line collection without arrow heads.
+
+    Parameters:
+    ----------
+    pitch: Union[Pitch, VerticalPitch]
+        The pitch to plot on.
+    df: pd.DataFrame
+        The dataframe of actions (x, y, end_x, end_y) to plot.
+    ax: plt.Axes
+        The axis to plot on.
+    max_arrows: Optional[int]
+        The maximum number of individual arrows, by default the value from the styling.
+    mode: Optional[str]
+        The aggregation mode above ``max_arrows``, by default the value from the styling.
+    bins: Optional[Tuple[int, int]]
+        The number of start zones along the pitch length and width for 'flow' mode, by default the value from the styling.
+    **kwargs:
+        Extra styling arguments (e.g. color, alpha) passed to the pitch.
+
+    Returns:
+    --------
+    None
+    """
+
+    max_arrows = max_arrows if max_arrows is not None else styling.arrows_lod['max_arrows']
+    mode = mode or styling.arrows_lod['mode']
+    bins = bins or styling.arrows_lod['bins']
+
+    arrow_kwargs = {
+        'width': styling.arrows['width'],
+        'headwidth': styling.arrows['headwidth'],
+        'headlength': styling.arrows['headlength'],
+    }
+
+    if len(df) <= max_arrows:
+        pitch.arrows(
+            df["x"],
+            df["y"],
+            df["end_x"],
+            df["end_y"],
+            ax=ax,
+            **arrow_kwargs,
+            **kwargs,
+        )
+        return
+
+    logger.info(f"Plotting {len(df)} actions in '{mode}' mode.")
+
+    if mode == 'lines':
+        pitch.lines(
+            df["x"],
+            df["y"],
+            df["end_x"],
+            df["end_y"],
+            ax=ax,
+            lw=styling.arrows_lod['linewidth'],
+            **kwargs,
+        )
+    elif mode == 'flow':
+        x, y, end_x, end_y = calculate_flow_arrows(pitch, df, bins)
+        pitch.arrows(
+            x,
+            y,
+            end_x,
+            end_y,
+            ax=ax,
+            **arrow_kwargs,
+            **{**kwargs, 'alpha': max(kwargs.get('alpha', 1.0), styling.arrows_lod['flow_min_alpha'])},
+        )
+    else:
+        raise ValueError(f"Unknown arrow mode: {mode}")
+
+def calculate_flow_arrows(
+    pitch: Union[Pitch, VerticalPitch],
+    df: pd.DataFrame,
+    bins: Tuple[int, int],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the mean start location and mean direction of actions per start zone.
+
+    Parameters:
+    ----------
+    pitch: Union[Pitch, VerticalPitch]
+        The pitch the zones are laid out on.
+    df: pd.DataFrame
+        The dataframe of actions (x, y, end_x, end_y).
+    bins: Tuple[int, int]
+        The number of zones along the pitch length and width.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        The start and end coordinates of one arrow per non-empty zone.
+    """
+
+    x = df["x"].to_numpy(dtype=float)
+    y = df["y"].to_numpy(dtype=float)
+    dx = df["end_x"].to_numpy(dtype=float) - x
+    dy = df["end_y"].to_numpy(dtype=float) - y
+
+    # Zone of every start location
+    x_min, x_max = sorted([pitch.dim.left, pitch.dim.right])
+    y_min, y_max = sorted([pitch.dim.bottom, pitch.dim.top])
+    x_bin = np.clip(((x - x_min) / (x_max - x_min) * bins[0]).astype(int), 0, bins[0] - 1)
+    y_bin = np.clip(((y - y_min) / (y_max - y_min) * bins[1]).astype(int), 0, bins[1] - 1)
+    zone = x_bin * bins[1] + y_bin
+
+    # Mean start and direction per zone
+    n_zones = bins[0] * bins[1]
+    counts = np.bincount(zone, minlength=n_zones)
+    occupied = counts > 0
+    counts = counts[occupied]
+
+    mean_x = np.bincount(zone, weights=x, minlength=n_zones)[occupied] / counts
+    mean_y = np.bincount(zone, weights=y, minlength=n_zones)[occupied] / counts
+    mean_dx = np.bincount(zone, weights=dx, minlength=n_zones)[occupied] / counts
+    mean_dy = np.bincount(zone, weights=dy, minlength=n_zones)[occupied] / counts
+
+    return mean_x, mean_y, mean_x + mean_dx, mean_y + mean_dy
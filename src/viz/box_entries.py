@@ -11,6 +11,8 @@ from typing import Optional
 
 from src.config import styling
 from src.transform import transform_to_box_entry_clusters
+from src.viz.arrows import plot_arrows
+from src.viz.density import calculate_density, plot_density
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
@@ -18,6 +20,7 @@ logger = logging.getLogger(__name__)
 def create_box_entry_plots(
     team: str,
     box_entries_df: pd.DataFrame,
+    heatmap: str = "zones",
 ) -> Optional[plt.Figure]:
     """
     Create box entry heatmaps with custom zones for a given team.
@@ -28,6 +31,8 @@ def create_box_entry_plots(
         The team to plot.
     box_entries_df: pd.DataFrame
         The box entry data to plot.
+    heatmap: str
+        "zones" for counts per custom zone or "density" for a smooth density surface.
 
     Returns:
     --------
@@ -150,8 +155,8 @@ def create_box_entry_plots(
     passes_pitch.draw(ax=passes_ax)
 
     # Plot heatmaps
-    create_heatmap(team_carries_df, carries_pitch, carries_ax, "Blues")
-    create_heatmap(team_passes_df, passes_pitch, passes_ax, "Blues")
+    create_heatmap(team_carries_df, carries_pitch, carries_ax, "Blues", mode=heatmap)
+    create_heatmap(team_passes_df, passes_pitch, passes_ax, "Blues", mode=heatmap)
 
     # Plot actions
     plot_actions(team_carries_df, carries_pitch, carries_ax)
@@ -162,7 +167,7 @@ def create_box_entry_plots(
     plot_cluster_arrows(team_passes_clusters, passes_pitch, passes_ax)
 
     legend_ax.text(0.02, 0.5, 
-        f"*Solid arrows indicate the top 5 most common clusters per action.", 
+        f"*Solid arrows indicate the {len(team_carries_clusters)} carry and {len(team_passes_clusters)} pass clusters.", 
         fontsize=styling.typo['sizes']['p'], 
         ha='left', 
         va='center'
@@ -204,6 +209,7 @@ def create_heatmap(
     pitch: VerticalPitch,
     ax: plt.Axes,
     cmap: str = 'Reds',
+    mode: str = "zones",
 ) -> None:
     """
     Create a heatmap for a given dataframe.
@@ -218,6 +224,8 @@ def create_heatmap(
         The axis to plot on.
     cmap: str
         The colormap to use.
+    mode: str
+        "zones" for counts per custom zone or "density" for a smooth density surface.
 
     Returns:
     --------
@@ -236,21 +244,26 @@ def create_heatmap(
     x_bins = np.array([0, 18, 40, 60, 80, 102, 120])
     y_bins = np.array([0, 18, 30, 50, 62, 80])
 
-    # Use mplsoccer's bin_statistic with custom bins
-    stats = pitch.bin_statistic(
-        x_data, y_data, 
-        bins=[x_bins, y_bins],
-        statistic='count'
-    )
-
-    # Create heatmap using mplsoccer's heatmap function
-    pitch.heatmap(
-        stats=stats,
-        ax=ax,
-        cmap=cmap,
-        alpha=0.5,
-        zorder=0,
-    )
+    if mode == "density":
+        # Smooth density surface
+        density, density_x_edges, density_y_edges = calculate_density(x_data, y_data)
+        plot_density(pitch, density, density_x_edges, density_y_edges, ax, cmap=cmap, alpha=0.5, zorder=0)
+    else:
+        # Use mplsoccer's bin_statistic with custom bins
+        stats = pitch.bin_statistic(
+            x_data, y_data, 
+            bins=[x_bins, y_bins],
+            statistic='count'
+        )
+
+        # Create heatmap using mplsoccer's heatmap function
+        pitch.heatmap(
+            stats=stats,
+            ax=ax,
+            cmap=cmap,
+            alpha=0.5,
+            zorder=0,
+        )
 
     # Zone lines (horizontal lines for x coordinates, vertical lines for y coordinates because of pitch orientation)
     for x in x_coords:
@@ -279,18 +292,8 @@ def plot_actions(
         The axis to plot on.
     """
 
-    # Plot actions
-    pitch.arrows(
-        df["x"],
-        df["y"],
-        df["end_x"],
-        df["end_y"],
-        width=styling.arrows['width'],
-        headwidth=styling.arrows['headwidth'],
-        headlength=styling.arrows['headlength'],
-        ax=ax,
-        alpha=0.1,
-    )
+    # Plot actions (aggregated when there are too many to draw individually)
+    plot_arrows(pitch, df, ax, alpha=0.1)
 
 
 def plot_cluster_arrows(
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Optional
 
 from src.config import styling
+from src.viz.arrows import plot_arrows
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
@@ -329,15 +330,4 @@ def plot_passes(
     for mask, color, alpha in pass_combinations:
         # Check if mask has any True values
         if mask.any():
-            pitch.arrows(
-                df[mask]["x"],
-                df[mask]["y"],
-                df[mask]["end_x"],
-                df[mask]["end_y"],
-                width=styling.arrows['width'],
-                headwidth=styling.arrows['headwidth'],
-                headlength=styling.arrows['headlength'],
-                ax=ax,
-                color=color,
-                alpha=alpha
-            )
\ No newline at end of file
+            plot_arrows(pitch, df[mask], ax, color=color, alpha=alpha)
\ No newline at end of file
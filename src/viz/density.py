@@ -0,0 +1,218 @@
+import logging
+import matplotlib.pyplot as plt
+from mplsoccer import Pitch, VerticalPitch
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Tuple, Union
+
+from src.config import styling
+
+# Get logger (initialized in source file)
+logger = logging.getLogger(__name__)
+
+def calculate_density(
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    resolution: Optional[float] = None,
+    bandwidth: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate a smooth density surface of event locations.
+
+    Events are binned onto a fine grid and the grid is convolved with a Gaussian kernel via
+    FFT, so the cost depends on the grid size and not on the number of events.
+
+    Parameters:
+    ----------
+    x: np.ndarray
+        The x coordinates of the events (0-120).
+    y: np.ndarray
+        The y coordinates of the events (0-80).
+    weights: Optional[np.ndarray]
+        The weight of every event (e.g. xT added), by default every event counts once.
+    resolution: Optional[float]
+        The grid cell size in yards, by default the value from the styling.
+    bandwidth: Optional[float]
+        The standard deviation of the Gaussian kernel in yards, by default the value from the styling.
+
+    Returns:
+    --------
+    density: np.ndarray
+        The smoothed (weighted) event count per grid cell (n_x, n_y).
+    x_edges: np.ndarray
+        The grid edges along the pitch length.
+    y_edges: np.ndarray
+        The grid edges along the pitch width.
+    """
+    densities, x_edges, y_edges = calculate_densities(
+        np.zeros(len(x), dtype=np.int64), x, y, weights=weights, resolution=resolution, bandwidth=bandwidth,
+    )
+    return densities[0], x_edges, y_edges
+
+def calculate_densities(
+    group: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    n_groups: Optional[int] = None,
+    resolution: Optional[float] = None,
+    bandwidth: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the density surfaces of many groups (e.g. every team in every match) at once.
+
+    All groups are binned with one bincount and convolved with one batched FFT, the kernel
+    transform is shared by all groups.
+
+    Parameters:
+    ----------
+    group: np.ndarray
+        The group (0 to n_groups - 1) of every event.
+    x: np.ndarray
+        The x coordinates of the events (0-120).
+    y: np.ndarray
+        The y coordinates of the events (0-80).
+    weights: Optional[np.ndarray]
+        The weight of every event (can be negative, e.g. xT added), by default every event counts once.
+    n_groups: Optional[int]
+        The number of groups, by default the largest group + 1.
+    resolution: Optional[float]
+        The grid cell size in yards, by default the value from the styling.
+    bandwidth: Optional[float]
+        The standard deviation of the Gaussian kernel in yards, by default the value from the styling.
+
+    Returns:
+    --------
+    densities: np.ndarray
+        The density surface of every group (n_groups, n_x, n_y).
+    x_edges: np.ndarray
+        The grid edges along the pitch length.
+    y_edges: np.ndarray
+        The grid edges along the pitch width.
+    """
+    resolution = resolution or styling.density['resolution']
+    bandwidth = bandwidth or styling.density['bandwidth']
+
+    group = np.asarray(group, dtype=np.int64)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    weights = np.ones(len(x)) if weights is None else np.asarray(weights, dtype=float)
+    n_groups = n_groups if n_groups is not None else (int(group.max()) + 1 if len(group) else 1)
+
+    # Fine grid
+    n_x, n_y = int(np.ceil(120 / resolution)), int(np.ceil(80 / resolution))
+    x_edges = np.linspace(0, n_x * resolution, n_x + 1)
+    y_edges = np.linspace(0, n_y * resolution, n_y + 1)
+
+    # Bin all groups at once (events outside the pitch or without location are dropped)
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(weights) & (x >= 0) & (x <= 120) & (y >= 0) & (y <= 80)
+    x_cell = np.minimum((x[valid] / resolution).astype(np.int64), n_x - 1)
+    y_cell = np.minimum((y[valid] / resolution).astype(np.int64), n_y - 1)
+    cells = (group[valid] * n_x + x_cell) * n_y + y_cell
+    counts = np.bincount(cells, weights=weights[valid], minlength=n_groups * n_x * n_y).reshape(n_groups, n_x, n_y)
+
+    # Gaussian kernel, zero padded so the convolution doesn't wrap around the pitch edges
+    radius = int(np.ceil(3 * bandwidth / resolution))
+    offsets = np.arange(-radius, radius + 1) * resolution
+    kernel_1d = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel_1d /= kernel_1d.sum()
+
+    shape = (n_x + 2 * radius, n_y + 2 * radius)
+    kernel = np.zeros(shape)
+    kernel[:2 * radius + 1, :2 * radius + 1] = np.outer(kernel_1d, kernel_1d)
+
+    # Convolve every group with one batched FFT
+    spectrum = np.fft.rfft2(counts, s=shape, axes=(1, 2)) * np.fft.rfft2(kernel)
+    densities = np.fft.irfft2(spectrum, s=shape, axes=(1, 2))[:, radius:radius + n_x, radius:radius + n_y]
+
+    # Remove FFT round-off: clamp at 0 for non-negative weights, only zero out tiny values for signed weights
+    if (weights[valid] >= 0).all():
+        densities = np.maximum(densities, 0)
+    else:
+        densities[np.abs(densities) < 1e-9 * np.abs(counts).max()] = 0
+
+    return densities, x_edges, y_edges
+
+def calculate_group_densities(
+    df: pd.DataFrame,
+    by: Iterable[str] = ("team", "match_id"),
+    weights: Optional[str] = None,
+    resolution: Optional[float] = None,
+    bandwidth: Optional[float] = None,
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the density surface of every group of events in a dataframe (e.g. per team and match).
+
+    Parameters:
+    ----------
+    df: pd.DataFrame
+        The events with x and y columns.
+    by: Iterable[str]
+        The columns to group by.
+    weights: Optional[str]
+        The column with the weight of every event, by default every event counts once.
+    resolution: Optional[float]
+        The grid cell size in yards, by default the value from the styling.
+    bandwidth: Optional[float]
+        The standard deviation of the Gaussian kernel in yards, by default the value from the styling.
+
+    Returns:
+    --------
+    groups_df: pd.DataFrame
+        The group keys, row i belongs to ``densities[i]``.
+    densities: np.ndarray
+        The density surface of every group (n_groups, n_x, n_y).
+    x_edges: np.ndarray
+        The grid edges along the pitch length.
+    y_edges: np.ndarray
+        The grid edges along the pitch width.
+    """
+    by = list(by)
+    grouping = df.groupby(by, sort=True)
+    groups_df = grouping.size().rename("events").reset_index()
+
+    logger.info(f"Calculating {len(groups_df)} density surfaces for {len(df)} events.")
+
+    densities, x_edges, y_edges = calculate_densities(
+        grouping.ngroup().to_numpy(),
+        df["x"].to_numpy(),
+        df["y"].to_numpy(),
+        weights=df[weights].to_numpy() if weights is not None else None,
+        n_groups=len(groups_df),
+        resolution=resolution,
+        bandwidth=bandwidth,
+    )
+
+    return groups_df, densities, x_edges, y_edges
+
+def plot_density(
+    pitch: Union[Pitch, VerticalPitch],
+    density: np.ndarray,
+    x_edges: np.ndarray,
+    y_edges: np.ndarray,
+    ax: plt.Axes,
+    **kwargs,
+) -> None:
+    """
+    Plot a density surface on a pitch with mplsoccer's heatmap (handles the pitch orientation).
+
+    Parameters:
+    ----------
+    pitch: Union[Pitch, VerticalPitch]
+        The pitch to plot on.
+    density: np.ndarray
+        The density surface (n_x, n_y).
+    x_edges: np.ndarray
+        The grid edges along the pitch length.
+    y_edges: np.ndarray
+        The grid edges along the pitch width.
+    ax: plt.Axes
+        The axis to plot on.
+    **kwargs:
+        Passed to ``pitch.heatmap`` (e.g. cmap, alpha, zorder).
+    """
+    stats = pitch.bin_statistic(np.array([]), np.array([]), bins=[x_edges, y_edges], statistic='count')
+    stats['statistic'] = density.T
+
+    pitch.heatmap(stats=stats, ax=ax, **kwargs)
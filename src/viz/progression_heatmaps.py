@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Optional
 
 from src.config import styling
+from src.stats.xt import XTGrid, calculate_xt_added
+from src.viz.density import calculate_density, plot_density
 
 # Get logger (initialized in source file)
 logger = logging.getLogger(__name__)
@@ -18,6 +20,8 @@ def create_progression_heatmaps(
     team: str,
     prog_actions_df: pd.DataFrame,
     turnovers_df: pd.DataFrame,
+    xt_grid: Optional[XTGrid] = None,
+    heatmap: str = "zones",
 ) -> Optional[plt.Figure]:
     """
     Create progression and turnovers heatmaps with custom zones for a given team.
@@ -30,6 +34,10 @@ def create_progression_heatmaps(
         The progressive actions data to plot.
     turnovers_df: pd.DataFrame
         The turnovers data to plot.
+    xt_grid: Optional[XTGrid]
+        If given, weight the progressive actions heatmap by the xT added of every action.
+    heatmap: str
+        "zones" for counts per custom zone or "density" for a smooth density surface.
 
     Returns:
     --------
@@ -135,8 +143,9 @@ def create_progression_heatmaps(
     turnover_pitch.draw(ax=turnover_ax)
 
     # Create heatmaps
-    create_heatmap(prog_pitch, prog_actions_df, prog_ax, "Reds")
-    create_heatmap(turnover_pitch, turnovers_df, turnover_ax, "Greens")
+    prog_values = calculate_xt_added(prog_actions_df, xt_grid)["xt_added"].values if xt_grid is not None else None
+    create_heatmap(prog_pitch, prog_actions_df, prog_ax, "Reds", values=prog_values, mode=heatmap)
+    create_heatmap(turnover_pitch, turnovers_df, turnover_ax, "Greens", mode=heatmap)
 
     # Progressive actions legend
     legend_ax.text(0.225, 3, 
@@ -148,7 +157,7 @@ def create_progression_heatmaps(
     )
     
     legend_ax.text(0.225, 2.5, 
-        "Passes and carries that progress the ball\nby at least 10 metres", 
+        "Passes and carries that progress the ball\nby at least 10 metres" + (", weighted by xT added" if xt_grid is not None else ""), 
         fontsize=styling.typo['sizes']['p'], 
         ha='center', 
         va='top'
@@ -190,6 +199,8 @@ def create_heatmap(
     df: pd.DataFrame,
     ax: plt.Axes,
     cmap: str = 'Reds',
+    values: Optional[np.ndarray] = None,
+    mode: str = "zones",
 ) -> None:
     """
     Create a heatmap for a given dataframe.
@@ -204,6 +215,10 @@ def create_heatmap(
         The axis to plot on.
     cmap: str
         The colormap to use.
+    values: Optional[np.ndarray]
+        The value of every event (e.g. xT added), the heatmap shows their sum per zone instead of the count.
+    mode: str
+        "zones" for counts per custom zone or "density" for a smooth density surface.
 
     Returns:
     --------
@@ -222,21 +237,27 @@ def create_heatmap(
     x_bins = np.array([0, 18, 40, 60, 80, 102, 120])
     y_bins = np.array([0, 18, 30, 50, 62, 80])
 
-    # Use mplsoccer's bin_statistic with custom bins
-    stats = pitch.bin_statistic(
-        x_data, y_data, 
-        bins=[x_bins, y_bins],
-        statistic='count'
-    )
-
-    # Create heatmap using mplsoccer's heatmap function
-    pitch.heatmap(
-        stats=stats,
-        ax=ax,
-        cmap=cmap,
-        alpha=0.7,
-        zorder=0,
-    )
+    if mode == "density":
+        # Smooth density surface
+        density, density_x_edges, density_y_edges = calculate_density(x_data, y_data, weights=values)
+        plot_density(pitch, density, density_x_edges, density_y_edges, ax, cmap=cmap, alpha=0.7, zorder=0)
+    else:
+        # Use mplsoccer's bin_statistic with custom bins
+        stats = pitch.bin_statistic(
+            x_data, y_data, 
+            values=values,
+            bins=[x_bins, y_bins],
+            statistic='count' if values is None else 'sum'
+        )
+
+        # Create heatmap using mplsoccer's heatmap function
+        pitch.heatmap(
+            stats=stats,
+            ax=ax,
+            cmap=cmap,
+            alpha=0.7,
+            zorder=0,
+        )
 
     # Zone lines (horizontal lines for x coordinates, vertical lines for y coordinates because of pitch orientation)
     for x in x_coords: